@@ -0,0 +1,109 @@
+import json
+import os
+import random
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Dict, Iterator, List, NamedTuple, Sequence, Tuple
+
+from maze import Maze
+
+
+class BatchTask(NamedTuple):
+    """
+    Задание на один лабиринт пакета.
+
+    index: номер лабиринта в пакете
+    seed: зерно генерации (от него зависят и размеры лабиринта)
+    """
+    index: int
+    seed: int
+    size_range: Tuple[int, int]
+    algorithm: str
+    solve_method: str
+    output_dir: str
+    formats: Tuple[str, ...]
+
+
+def make_tasks(count: int, size_range: Tuple[int, int], base_seed: int = 0, algorithm: str = 'binary_tree',
+               solve_method: str = 'bfs', output_dir: str = None,
+               formats: Sequence[str] = ()) -> List[BatchTask]:
+    """
+    Создает задания пакета. Зерно i-го лабиринта равно base_seed + i, поэтому результат
+    каждого лабиринта не зависит от количества процессов и порядка выполнения.
+    """
+    return [BatchTask(index, base_seed + index, tuple(size_range), algorithm, solve_method,
+                      output_dir, tuple(formats)) for index in range(count)]
+
+
+def run_task(task: BatchTask) -> Dict:
+    """
+    Генерирует, решает и экспортирует один лабиринт.
+
+    Returns:
+        dict: Запись манифеста (зерно, размер, длина пути, время этапов, файлы).
+    """
+    rng = random.Random(task.seed)
+    height = rng.randint(*task.size_range)
+    width = rng.randint(*task.size_range)
+    maze = Maze(height, width)
+
+    started = time.perf_counter()
+    maze.generate_maze(seed=task.seed, algorithm=task.algorithm)
+    generated = time.perf_counter()
+    path = maze.solve_maze(method=task.solve_method)
+    solved = time.perf_counter()
+
+    files = []
+    for fmt in task.formats:
+        file_path = os.path.join(task.output_dir, f'maze_{task.index:06d}.{fmt}')
+        if fmt == 'txt':
+            maze.save_maze_to_file(file_path)
+        else:
+            maze.save_maze_as_image(file_path)
+        files.append(file_path)
+    exported = time.perf_counter()
+
+    return {
+        'index': task.index,
+        'seed': task.seed,
+        'height': height,
+        'width': width,
+        'algorithm': task.algorithm,
+        'solve_method': task.solve_method,
+        'path_length': len(path),
+        'generate_s': generated - started,
+        'solve_s': solved - generated,
+        'export_s': exported - solved,
+        'files': files,
+    }
+
+
+def run_batch(tasks: Sequence[BatchTask], workers: int = None, chunk_size: int = 8) -> Iterator[Dict]:
+    """
+    Выполняет задания в пуле процессов и выдает запись каждого лабиринта сразу по готовности.
+
+    Задания отправляются в пул группами по chunk_size, и в работе одновременно не больше
+    двух групп на процесс, поэтому очередь не растет при тысячах лабиринтов.
+    """
+    workers = workers or os.cpu_count() or 1
+    limit = 2 * workers * chunk_size
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = set()
+        next_task = 0
+        while next_task < len(tasks) or pending:
+            while next_task < len(tasks) and len(pending) + chunk_size <= limit:
+                chunk = tasks[next_task:next_task + chunk_size]
+                pending.update(executor.submit(run_task, task) for task in chunk)
+                next_task += len(chunk)
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+
+
+def write_manifest(records: Iterator[Dict], manifest_path: str) -> Iterator[Dict]:
+    """Дописывает каждую запись в манифест JSONL сразу по готовности и передает ее дальше."""
+    with open(manifest_path, 'w') as manifest:
+        for record in records:
+            manifest.write(json.dumps(record) + '\n')
+            manifest.flush()
+            yield record
@@ -0,0 +1,525 @@
+import argparse
+import json
+import mmap
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+from generators import GENERATORS, generate_rows, stream_maze_to_file
+from grid import Grid, PASSAGE
+from maze import Maze, maze_check
+from mzb import CODECS
+from parallel import STRIP_ROWS, generate_parallel
+from solver import SOLVERS, solve
+from tiles import TiledMaze, save_tiled_png, solve_tiled, write_tiled
+
+
+def measure(func: Callable[[], object]) -> Tuple[object, float, int]:
+    """
+    Выполняет func и измеряет время и пиковое потребление памяти.
+
+    tracemalloc сильно замедляет код с большим числом мелких объектов, поэтому
+    время измеряется отдельным запуском без трассировки, а память - вторым запуском.
+
+    Returns:
+        tuple: (результат, время в секундах, пиковая память в байтах)
+    """
+    started = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - started
+    del result
+    tracemalloc.start()
+    try:
+        result = func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def bench_storage(height: int, width: int, reads: int = 1_000_000, seed: int = 0) -> Dict:
+    """
+    Сравнивает хранение сетки списком списков строк и компактной сеткой Grid.
+
+    Измеряется память под сетку и скорость случайного чтения клеток.
+    """
+    rows, cols = 2 * height + 1, 2 * width + 1
+    rng = random.Random(seed)
+    cells = [(rng.randrange(rows), rng.randrange(cols)) for _ in range(reads)]
+
+    lists, lists_time, lists_memory = measure(lambda: [['0'] * cols for _ in range(rows)])
+    grid, grid_time, grid_memory = measure(lambda: Grid(rows, cols))
+
+    started = time.perf_counter()
+    sum(1 for r, c in cells if lists[r][c] == '1')
+    lists_reads = time.perf_counter() - started
+
+    data = grid.data
+    started = time.perf_counter()
+    sum(1 for r, c in cells if data[r * cols + c] == PASSAGE)
+    grid_reads = time.perf_counter() - started
+
+    return {
+        'benchmark': 'storage',
+        'size': [height, width],
+        'list_of_lists': {'build_s': lists_time, 'peak_bytes': lists_memory, 'reads_s': lists_reads},
+        'grid': {'build_s': grid_time, 'peak_bytes': grid_memory, 'reads_s': grid_reads},
+    }
+
+
+def bench_maze(height: int, width: int) -> Dict:
+    """Измеряет генерацию и решение лабиринта заданного размера."""
+    maze = Maze(height, width)
+    _, generate_time, generate_memory = measure(maze.generate_maze)
+    _, solve_time, solve_memory = measure(maze.solve_maze)
+    return {
+        'benchmark': 'maze',
+        'size': [height, width],
+        'generate': {'time_s': generate_time, 'peak_bytes': generate_memory},
+        'solve': {'time_s': solve_time, 'peak_bytes': solve_memory},
+    }
+
+
+def bench_solvers(height: int, width: int) -> Dict:
+    """Сравнивает методы решения на одном лабиринте."""
+    maze = Maze(height, width)
+    maze.generate_maze()
+    results = {}
+    for method in SOLVERS:
+        maze.solve_maze(method=method)
+        stats = maze.solve_stats
+        results[method] = {'time_s': stats.elapsed, 'nodes_expanded': stats.nodes_expanded,
+                           'path_length': len(stats.path)}
+    return {'benchmark': 'solvers', 'size': [height, width], 'methods': results}
+
+
+def bench_generators(height: int, width: int, seed: int = 0) -> Dict:
+    """Измеряет пропускную способность каждого алгоритма генерации (клеток в секунду)."""
+    results = {}
+    for algorithm in GENERATORS:
+        maze = Maze(height, width)
+        _, elapsed, peak = measure(lambda: maze.generate_maze(seed=seed, algorithm=algorithm))
+        results[algorithm] = {'time_s': elapsed, 'peak_bytes': peak,
+                              'cells_per_s': height * width / elapsed if elapsed else None}
+    return {'benchmark': 'generators', 'size': [height, width], 'algorithms': results}
+
+
+def _legacy_load_rows(file_path: str) -> List[List[str]]:
+    """Прежний построчный загрузчик (список символов на строку) для сравнения."""
+    maze = []
+    with open(file_path, 'r') as file:
+        for line in file:
+            stripped_line = line.strip()
+            if stripped_line and all(char in '01' for char in stripped_line):
+                maze.append(list(stripped_line))
+    return maze
+
+
+def bench_load_text(height: int, width: int, seed: int = 0) -> Dict:
+    """Сравнивает загрузку текстового лабиринта через mmap и прежний построчный разбор."""
+    with tempfile.TemporaryDirectory() as directory:
+        file_path = os.path.join(directory, 'maze.txt')
+        file_size = stream_maze_to_file(file_path, height, width, seed=seed)
+        with open(file_path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            _, parse_time, parse_memory = measure(lambda: Grid.from_text(buffer))
+        _, legacy_time, legacy_memory = measure(lambda: _legacy_load_rows(file_path))
+        maze = Maze(1, 1)
+        _, load_time, load_memory = measure(lambda: maze.load_maze_from_file(file_path))
+    return {
+        'benchmark': 'load_text',
+        'size': [height, width],
+        'file_bytes': file_size,
+        'bulk_parse': {'time_s': parse_time, 'peak_bytes': parse_memory},
+        'legacy_parse': {'time_s': legacy_time, 'peak_bytes': legacy_memory},
+        'load_with_check': {'time_s': load_time, 'peak_bytes': load_memory},
+    }
+
+
+def bench_save_image(height: int, width: int, cell_size: int = 4, seed: int = 0) -> Dict:
+    """Измеряет экспорт решенного лабиринта в PNG при разных уровнях сжатия."""
+    maze = Maze(height, width)
+    maze.generate_maze(seed=seed)
+    maze.solve_maze()
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        file_path = os.path.join(directory, 'maze.png')
+        for level in (1, 6, 9):
+            _, elapsed, peak = measure(lambda: maze.save_maze_as_image(file_path, cell_size, compress_level=level))
+            results[f'compress_level_{level}'] = {'time_s': elapsed, 'peak_bytes': peak,
+                                                  'file_bytes': os.path.getsize(file_path)}
+    return {'benchmark': 'save_image', 'size': [height, width], 'cell_size': cell_size, 'levels': results}
+
+
+def bench_load_image(height: int, width: int, cell_size: int = 4, seed: int = 0) -> Dict:
+    """Измеряет импорт лабиринта из PNG с автоматическим определением размера клетки."""
+    maze = Maze(height, width)
+    maze.generate_maze(seed=seed)
+    with tempfile.TemporaryDirectory() as directory:
+        file_path = os.path.join(directory, 'maze.png')
+        maze.save_maze_as_image(file_path, cell_size, compress_level=1)
+        loaded = Maze(1, 1)
+        _, elapsed, peak = measure(lambda: loaded.load_maze_from_image(file_path))
+    return {'benchmark': 'load_image', 'size': [height, width], 'cell_size': cell_size,
+            'time_s': elapsed, 'peak_bytes': peak}
+
+
+def bench_binary(height: int, width: int, seed: int = 0) -> Dict:
+    """Сравнивает размер файла и скорость загрузки .mzb (с разным сжатием) и текста."""
+    maze = Maze(height, width)
+    maze.generate_maze(seed=seed)
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        text_path = os.path.join(directory, 'maze.txt')
+        maze.save_maze_to_file(text_path)
+        loaded = Maze(1, 1)
+        _, elapsed, peak = measure(lambda: loaded.load_maze_from_file(text_path))
+        results['txt'] = {'file_bytes': os.path.getsize(text_path), 'load_s': elapsed, 'peak_bytes': peak}
+        for compression in CODECS:
+            file_path = os.path.join(directory, f'maze_{compression}.mzb')
+            _, save_time, _ = measure(lambda: maze.save_maze_to_binary(file_path, compression=compression))
+            _, elapsed, peak = measure(lambda: loaded.load_maze_from_binary(file_path))
+            results[f'mzb_{compression}'] = {'file_bytes': os.path.getsize(file_path), 'save_s': save_time,
+                                             'load_s': elapsed, 'peak_bytes': peak}
+    return {'benchmark': 'binary', 'size': [height, width], 'formats': results}
+
+
+def bench_path_index(height: int, width: int, queries: int = 1000, seed: int = 0) -> Dict:
+    """Сравнивает запросы длины пути через индекс LCA и поиск в ширину на каждый запрос."""
+    maze = Maze(height, width)
+    maze.generate_maze(seed=seed, algorithm='backtracker')
+    rng = random.Random(seed)
+    starts = [(rng.randrange(height), rng.randrange(width)) for _ in range(queries)]
+    ends = [(rng.randrange(height), rng.randrange(width)) for _ in range(queries)]
+    index, build_time, build_memory = measure(maze.build_path_index)
+    _, index_time, _ = measure(lambda: index.query_lengths(starts, ends))
+    # Поиск на каждый запрос дорогой, поэтому измеряется на части запросов
+    sample = max(1, queries // 100)
+    started = time.perf_counter()
+    for start, end in zip(starts[:sample], ends[:sample]):
+        maze.solve_maze(start, end)
+    search_time = (time.perf_counter() - started) * queries / sample
+    return {
+        'benchmark': 'path_index',
+        'size': [height, width],
+        'queries': queries,
+        'build': {'time_s': build_time, 'peak_bytes': build_memory},
+        'index_queries_s': index_time,
+        'search_queries_s_estimated': search_time,
+    }
+
+
+def bench_junction_graph(height: int, width: int, queries: int = 100, seed: int = 0) -> Dict:
+    """
+    Сравнивает повторные поиски пути по сетке (A*) и по сжатому графу развилок,
+    в том числе по графу после заполнения тупиков вокруг точек запросов.
+    """
+    maze = Maze(height, width)
+    maze.generate_maze(seed=seed, algorithm='backtracker')
+    rng = random.Random(seed)
+    starts = [(rng.randrange(height), rng.randrange(width)) for _ in range(queries)]
+    ends = [(rng.randrange(height), rng.randrange(width)) for _ in range(queries)]
+    grid = maze.grid
+    results = {}
+    # Поиск по сетке дорогой, поэтому измеряется на части запросов
+    sample = max(1, queries // 10)
+    started = time.perf_counter()
+    expanded = sum(solve(grid, (2 * s[0] + 1, 2 * s[1] + 1), (2 * e[0] + 1, 2 * e[1] + 1), 'astar').nodes_expanded
+                   for s, e in zip(starts[:sample], ends[:sample]))
+    results['grid_astar'] = {'queries_s_estimated': (time.perf_counter() - started) * queries / sample,
+                             'nodes_expanded_per_query': expanded / sample}
+    for name, keep in (('graph', None), ('graph_pruned', starts + ends)):
+        graph, build_time, build_memory = measure(lambda: maze.build_junction_graph(keep))
+        started = time.perf_counter()
+        expanded = sum(graph.solve(start, end).nodes_expanded for start, end in zip(starts, ends))
+        results[name] = {'build': {'time_s': build_time, 'peak_bytes': build_memory},
+                         'nodes': graph.node_count, 'edges': graph.edge_count,
+                         'queries_s': time.perf_counter() - started,
+                         'nodes_expanded_per_query': expanded / queries}
+    return {'benchmark': 'junction_graph', 'size': [height, width], 'queries': queries, 'results': results}
+
+
+def bench_tiles(height: int, width: int, tile_size: int = 256, cache_tiles: int = 64, seed: int = 0) -> Dict:
+    """
+    Сравнивает решение лабиринта в памяти и через тайловое хранилище
+    (время, пиковая память, доля попаданий кэша тайлов) и экспорт в PNG по тайлам.
+    """
+    rows, cols = 2 * height + 1, 2 * width + 1
+    start, end = (1, 1), (rows - 2, cols - 2)
+    with tempfile.TemporaryDirectory() as directory:
+        tiled_path = os.path.join(directory, 'maze.mzt')
+        _, write_time, write_memory = measure(
+            lambda: write_tiled(tiled_path, generate_rows('binary_tree', height, width, seed), tile_size))
+        maze = Maze(height, width)
+        maze.generate_maze(seed=seed)
+        _, memory_time, memory_peak = measure(lambda: solve(maze.grid, start, end))
+        del maze
+        with TiledMaze(tiled_path, cache_tiles) as store:
+            result, tiled_time, tiled_peak = measure(lambda: solve_tiled(store, start, end))
+            solve_stats = store.stats()
+            _, png_time, png_peak = measure(lambda: save_tiled_png(store, os.path.join(directory, 'maze.png')))
+        return {
+            'benchmark': 'tiles',
+            'size': [height, width],
+            'tile_size': tile_size,
+            'cache_tiles': cache_tiles,
+            'file_bytes': os.path.getsize(tiled_path),
+            'write': {'time_s': write_time, 'peak_bytes': write_memory},
+            'solve_in_memory': {'time_s': memory_time, 'peak_bytes': memory_peak},
+            'solve_tiled': {'time_s': tiled_time, 'peak_bytes': tiled_peak, 'path_length': len(result.path),
+                            'tile_hit_rate': solve_stats['hit_rate']},
+            'png_tiled': {'time_s': png_time, 'peak_bytes': png_peak},
+        }
+
+
+def bench_parallel(height: int, width: int, seed: int = 0, worker_counts: Sequence[int] = (1, 2, 4, 8)) -> Dict:
+    """
+    Сравнивает последовательную генерацию с параллельной генерацией полосами
+    при разном количестве процессов и проверяет, что результат от него не зависит.
+    """
+    results = {}
+    for algorithm in ('binary_tree', 'sidewinder'):
+        maze = Maze(height, width)
+        _, serial_time, _ = measure(lambda: maze.generate_maze(seed=seed, algorithm=algorithm))
+        runs, digests = {}, set()
+        for workers in worker_counts:
+            started = time.perf_counter()
+            grid = generate_parallel(height, width, algorithm, seed, workers)
+            elapsed = time.perf_counter() - started
+            digests.add(grid.digest())
+            del grid
+            runs[workers] = {'time_s': elapsed, 'speedup': serial_time / elapsed if elapsed else None}
+        results[algorithm] = {'serial_s': serial_time, 'workers': runs, 'identical': len(digests) == 1}
+    return {'benchmark': 'parallel', 'size': [height, width], 'cpu_count': os.cpu_count(),
+            'strip_rows': STRIP_ROWS, 'algorithms': results}
+
+
+def import_times(module: str = 'main') -> Dict[str, int]:
+    """
+    Время импорта модулей при импорте module в новом интерпретаторе (python -X importtime).
+
+    Returns:
+        dict: {имя модуля: суммарное время импорта вместе с зависимостями в микросекундах}
+    """
+    completed = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                               cwd=os.path.dirname(os.path.abspath(__file__)), capture_output=True,
+                               text=True, check=True)
+    times = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def bench_startup(height: int, width: int, runs: int = 5) -> Dict:
+    """
+    Измеряет запуск CLI для текстового сценария: время импорта main (медиана по runs
+    запускам), загруженные тяжелые модули и полное время генерации с экспортом в .txt.
+    """
+    root = os.path.dirname(os.path.abspath(__file__))
+    imports = [import_times('main') for _ in range(runs)]
+    cli_times = []
+    with tempfile.TemporaryDirectory() as directory:
+        command = [sys.executable, os.path.join(root, 'main.py'), '-gm', str(height), str(width),
+                   '-em', os.path.join(directory, 'maze.txt')]
+        for _ in range(runs):
+            started = time.perf_counter()
+            subprocess.run(command, check=True, capture_output=True)
+            cli_times.append(time.perf_counter() - started)
+    heavy = ('PIL', 'multiprocessing', 'concurrent.futures', 'asyncio', 'cProfile')
+    return {
+        'benchmark': 'startup',
+        'size': [height, width],
+        'import_main_us': statistics.median(times['main'] for times in imports),
+        'heavy_modules': sorted(name for name in heavy if name in imports[0]),
+        'cli_text_s': statistics.median(cli_times),
+    }
+
+
+SUITE_SIZES = (10, 100, 1000, 10_000)
+SUITE_OPERATIONS = ('generate', 'solve', 'maze_check', 'load_text', 'save_image', 'load_image')
+# Операции быстрее этого порога не сравниваются по времени: разброс больше самого замера
+_MIN_COMPARED_TIME = 0.005
+
+
+def measure_operation(func: Callable[[], object], repeat: int = 3) -> Dict:
+    """
+    Замер одной операции набора: лучшее время из repeat запусков без трассировки,
+    пиковая память по tracemalloc и чистое число выделенных блоков памяти
+    (прирост sys.getallocatedblocks за запуск - объекты, которые операция оставила после себя).
+
+    Returns:
+        dict: {'time_s', 'peak_bytes', 'net_blocks'}
+    """
+    best = float('inf')
+    for _ in range(max(1, repeat)):
+        started = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - started)
+        del result
+    blocks = sys.getallocatedblocks()
+    tracemalloc.start()
+    try:
+        result = func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    net_blocks = sys.getallocatedblocks() - blocks
+    del result
+    return {'time_s': best, 'peak_bytes': peak, 'net_blocks': net_blocks}
+
+
+def _suite_operations(size: int, directory: str, operations: Iterable[str],
+                      seed: int = 0) -> Dict[str, Callable[[], object]]:
+    """
+    Готовит операции набора для квадратного лабиринта size x size.
+
+    Подготовка (генерация исходного лабиринта, запись файлов) не входит в замер.
+    Решение выполняется без кэша решений, иначе повторные запуски измеряли бы кэш.
+    """
+    maze = Maze(size, size)
+    maze.generate_maze(seed=seed)
+    maze.solution_cache = None
+    text_path = os.path.join(directory, 'maze.txt')
+    image_path = os.path.join(directory, 'maze.png')
+    if 'load_text' in operations:
+        maze.save_maze_to_file(text_path)
+    if 'load_image' in operations:
+        maze.save_maze_as_image(image_path, 1, compress_level=1)
+    return {
+        'generate': lambda: Maze(size, size).generate_maze(seed=seed),
+        'solve': maze.solve_maze,
+        'maze_check': lambda: maze_check(maze.grid),
+        'load_text': lambda: Maze(1, 1).load_maze_from_file(text_path),
+        'save_image': lambda: maze.save_maze_as_image(os.path.join(directory, 'out.png'), 1, compress_level=1),
+        'load_image': lambda: Maze(1, 1).load_maze_from_image(image_path),
+    }
+
+
+def run_suite(sizes: Sequence[int] = SUITE_SIZES, operations: Sequence[str] = SUITE_OPERATIONS,
+              repeat: int = 3, seed: int = 0) -> Dict:
+    """
+    Набор замеров масштабирования: каждая операция на квадратных лабиринтах размеров sizes.
+
+    Изображения сохраняются и загружаются с клеткой в 1 пиксель, чтобы замер
+    показывал стоимость самой операции, а не масштабирования картинки.
+
+    Returns:
+        dict: Результаты в виде {'benchmark': 'suite', 'python': ..., 'results': [...]},
+        где каждая запись содержит operation, size, time_s, peak_bytes и net_blocks.
+
+    Raises:
+        ValueError: Если операция неизвестна.
+    """
+    unknown = [name for name in operations if name not in SUITE_OPERATIONS]
+    if unknown:
+        raise ValueError(f"Неизвестные операции: {', '.join(unknown)}. Доступны: {', '.join(SUITE_OPERATIONS)}.")
+    results = []
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as directory:
+            prepared = _suite_operations(size, directory, operations, seed)
+            for name in operations:
+                record = {'operation': name, 'size': size}
+                record.update(measure_operation(prepared[name], repeat))
+                results.append(record)
+    return {'benchmark': 'suite', 'python': platform.python_version(), 'results': results}
+
+
+def compare_results(current: Dict, baseline: Dict, threshold: float = 1.5) -> List[Dict]:
+    """
+    Сравнивает результаты набора с сохраненной базовой линией.
+
+    Регрессией считается рост времени или пиковой памяти больше чем в threshold раз.
+    Время операций быстрее 5 мс не сравнивается, записи без пары в базовой линии пропускаются.
+
+    Returns:
+        list: Записи {'operation', 'size', 'metric', 'baseline', 'current', 'ratio'}.
+    """
+    previous = {(record['operation'], record['size']): record for record in baseline.get('results', ())}
+    regressions = []
+    for record in current['results']:
+        old = previous.get((record['operation'], record['size']))
+        if old is None:
+            continue
+        for metric in ('time_s', 'peak_bytes'):
+            if metric == 'time_s' and old[metric] < _MIN_COMPARED_TIME:
+                continue
+            if old[metric] and record[metric] > old[metric] * threshold:
+                regressions.append({'operation': record['operation'], 'size': record['size'], 'metric': metric,
+                                    'baseline': old[metric], 'current': record[metric],
+                                    'ratio': record[metric] / old[metric]})
+    return regressions
+
+
+BENCHMARKS = {
+    'storage': bench_storage,
+    'maze': bench_maze,
+    'solvers': bench_solvers,
+    'generators': bench_generators,
+    'load_text': bench_load_text,
+    'save_image': bench_save_image,
+    'load_image': bench_load_image,
+    'binary': bench_binary,
+    'path_index': bench_path_index,
+    'junction_graph': bench_junction_graph,
+    'startup': bench_startup,
+    'tiles': bench_tiles,
+    'parallel': bench_parallel,
+}
+
+
+def main() -> int:
+    """
+    Запуск замеров производительности из командной строки.
+
+    Набор suite печатает (или сохраняет в --output) результаты JSON и, если задана
+    базовая линия --baseline, возвращает код 1 при найденных регрессиях.
+    """
+    parser = argparse.ArgumentParser(description="Maze benchmarks")
+    parser.add_argument('benchmark', choices=sorted(BENCHMARKS) + ['suite'], help="Название замера.")
+    parser.add_argument('-s', '--size', nargs=2, type=int, default=(500, 500), metavar=('HEIGHT', 'WIDTH'),
+                        help="Размер лабиринта в клетках.")
+    parser.add_argument('--sizes', nargs='+', type=int, default=SUITE_SIZES,
+                        help="Размеры стороны лабиринта для набора suite.")
+    parser.add_argument('--operations', nargs='+', choices=SUITE_OPERATIONS, default=SUITE_OPERATIONS,
+                        help="Операции набора suite.")
+    parser.add_argument('--repeat', type=int, default=3, help="Число запусков для замера времени (лучший результат).")
+    parser.add_argument('-o', '--output', help="Файл для результатов JSON.")
+    parser.add_argument('--baseline', help="Файл JSON с базовыми результатами набора suite для сравнения.")
+    parser.add_argument('--threshold', type=float, default=1.5,
+                        help="Во сколько раз должна вырасти метрика, чтобы считаться регрессией.")
+    args = parser.parse_args()
+    if args.baseline and args.benchmark != 'suite':
+        parser.error("--baseline сравнивает только результаты набора suite.")
+
+    if args.benchmark != 'suite':
+        report = BENCHMARKS[args.benchmark](*args.size)
+    else:
+        report = run_suite(args.sizes, args.operations, args.repeat)
+    if args.baseline:
+        with open(args.baseline) as file:
+            report['regressions'] = compare_results(report, json.load(file), args.threshold)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as file:
+            file.write(text + '\n')
+    else:
+        print(text)
+
+    for regression in report.get('regressions', ()):
+        print(f"Регрессия: {regression['operation']} {regression['size']}x{regression['size']} "
+              f"{regression['metric']} {regression['baseline']:.6g} -> {regression['current']:.6g} "
+              f"(x{regression['ratio']:.2f})", file=sys.stderr)
+    return 1 if report.get('regressions') else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,280 @@
+import random
+import sys
+from typing import Callable, Dict, Iterable, Iterator, NamedTuple, Optional
+
+from grid import PASSAGE
+
+RowIterator = Iterator[bytes]
+
+
+class GeneratorEngine(NamedTuple):
+    """
+    Зарегистрированный алгоритм генерации.
+
+    rows: функция (height, width, rng), выдающая строки сетки сверху вниз
+    streaming: True, если алгоритму нужна только текущая строка (память O(width))
+    strip: функция (height, width, first, last, rng), выдающая строки сетки для строк
+        лабиринта first..last-1 независимо от остальных (None, если строки зависят друг от друга)
+    """
+    rows: Callable[[int, int, random.Random], RowIterator]
+    streaming: bool
+    strip: Optional[Callable[[int, int, int, int, random.Random], RowIterator]] = None
+
+
+GENERATORS: Dict[str, GeneratorEngine] = {}
+
+
+def register_generator(name: str, streaming: bool = True, strip: Callable = None) -> Callable:
+    """
+    Декоратор для регистрации алгоритма генерации под именем name.
+
+    Функция алгоритма принимает (height, width, rng) и выдает 2 * height + 1 строк
+    сетки шириной 2 * width + 1 в виде bytes из '0' и '1'. Если строки лабиринта
+    генерируются независимо, strip генерирует полосу строк (для параллельной генерации).
+    """
+    def decorator(func: Callable[[int, int, random.Random], RowIterator]) -> Callable:
+        GENERATORS[name] = GeneratorEngine(func, streaming, strip)
+        return func
+    return decorator
+
+
+def generate_rows(algorithm: str, height: int, width: int, seed: int = None) -> RowIterator:
+    """
+    Возвращает итератор по строкам сетки лабиринта, созданного алгоритмом algorithm.
+
+    Raises:
+        ValueError: Если алгоритм неизвестен.
+    """
+    if algorithm not in GENERATORS:
+        raise ValueError(f"Неизвестный алгоритм генерации: {algorithm}. Доступны: {', '.join(GENERATORS)}.")
+    return GENERATORS[algorithm].rows(height, width, random.Random(seed))
+
+
+def write_rows(rows: Iterable[bytes], file_path: str, buffer_size: int = 1 << 20) -> int:
+    """
+    Записывает строки сетки в текстовый файл (или в stdout, если file_path == '-').
+
+    Строки накапливаются и пишутся блоками примерно по buffer_size байт,
+    поэтому в памяти одновременно находится только один блок.
+
+    Returns:
+        int: Количество записанных байт.
+    """
+    file = sys.stdout.buffer if file_path == '-' else open(file_path, 'wb')
+    written = 0
+    chunk, chunk_size = [], 0
+    try:
+        for row in rows:
+            chunk.append(row)
+            chunk.append(b'\n')
+            chunk_size += len(row) + 1
+            if chunk_size >= buffer_size:
+                written += file.write(b''.join(chunk))
+                chunk, chunk_size = [], 0
+        if chunk:
+            written += file.write(b''.join(chunk))
+    finally:
+        if file_path == '-':
+            file.flush()
+        else:
+            file.close()
+    return written
+
+
+def stream_maze_to_file(file_path: str, height: int, width: int, algorithm: str = 'binary_tree',
+                        seed: int = None, buffer_size: int = 1 << 20) -> int:
+    """
+    Генерирует лабиринт построчно и сразу записывает его в файл, не храня всю сетку.
+
+    Для потоковых алгоритмов (binary_tree, sidewinder, eller) память O(width)
+    не зависит от высоты лабиринта. Результат совпадает с Maze.generate_maze
+    с тем же зерном и последующим save_maze_to_file.
+
+    Returns:
+        int: Количество записанных байт.
+    """
+    return write_rows(generate_rows(algorithm, height, width, seed), file_path, buffer_size)
+
+
+def _random_bits(rng: random.Random, count: int) -> str:
+    """Строка из count случайных символов '0'/'1'."""
+    if count <= 0:
+        return ''
+    return format(rng.getrandbits(count), 'b').zfill(count)
+
+
+def _templates(width: int):
+    """Пустая строка стен и строка клеток, разделенных стенами."""
+    cols = 2 * width + 1
+    border = b'0' * cols
+    cells = bytearray(border)
+    cells[1:cols - 1:2] = b'1' * width
+    return border, bytes(cells)
+
+
+def _binary_tree_strip(height: int, width: int, first: int, last: int, rng: random.Random) -> RowIterator:
+    """Строки сетки алгоритма бинарного дерева для строк лабиринта first..last-1."""
+    border, cells = _templates(width)
+    cols = len(border)
+    # Бит 1 - удаляем стену вправо, бит 0 - вниз; '0' и '1' меняются местами для стен вниз
+    swap = bytes.maketrans(b'01', b'10')
+    for y in range(first, last):
+        row = bytearray(cells)
+        below = bytearray(border)
+        if y == height - 1:
+            # В последней строке удаляем стены вправо (кроме правого нижнего угла)
+            row[2:cols - 1:2] = b'1' * (width - 1)
+        else:
+            if width > 1:
+                right = _random_bits(rng, width - 1).encode()
+                row[2:cols - 1:2] = right
+                below[1:cols - 2:2] = right.translate(swap)
+            # В последнем столбце удаляем стену вниз
+            below[cols - 2] = PASSAGE
+        yield bytes(row)
+        yield bytes(below)
+
+
+@register_generator('binary_tree', strip=_binary_tree_strip)
+def binary_tree(height: int, width: int, rng: random.Random) -> RowIterator:
+    """
+    Алгоритм бинарного дерева: каждая клетка удаляет стену вправо или вниз.
+
+    Случайные направления строки берутся одним вызовом getrandbits,
+    стены удаляются срезами строки без цикла по клеткам.
+    """
+    yield _templates(width)[0]
+    yield from _binary_tree_strip(height, width, 0, height, rng)
+
+
+def _sidewinder_strip(height: int, width: int, first: int, last: int, rng: random.Random) -> RowIterator:
+    """Строки сетки алгоритма Sidewinder для строк лабиринта first..last-1."""
+    border, cells = _templates(width)
+    cols = len(border)
+    for y in range(first, last):
+        row = bytearray(cells)
+        below = bytearray(border)
+        if y == height - 1:
+            row[2:cols - 1:2] = b'1' * (width - 1)
+        else:
+            right = _random_bits(rng, width - 1)
+            if right:
+                row[2:cols - 1:2] = right.encode()
+            # Серия заканчивается на клетке, которая не удаляет стену вправо, или на последней клетке
+            start = 0
+            while start < width:
+                end = right.find('0', start)
+                if end < 0:
+                    end = width - 1
+                x = start + rng.randrange(end - start + 1)
+                below[2 * x + 1] = PASSAGE
+                start = end + 1
+        yield bytes(row)
+        yield bytes(below)
+
+
+@register_generator('sidewinder', strip=_sidewinder_strip)
+def sidewinder(height: int, width: int, rng: random.Random) -> RowIterator:
+    """
+    Алгоритм Sidewinder: клетки строки объединяются в серии вправо,
+    из каждой серии вниз ведет один проход из случайной клетки; последняя строка открыта целиком.
+    """
+    yield _templates(width)[0]
+    yield from _sidewinder_strip(height, width, 0, height, rng)
+
+
+@register_generator('eller')
+def eller(height: int, width: int, rng: random.Random) -> RowIterator:
+    """
+    Алгоритм Эллера: клетки строки хранят номер множества, соседние множества
+    случайно объединяются, каждое множество продолжается вниз хотя бы одной клеткой.
+    Номера множеств каждой строки лежат в диапазоне [0, width), память O(width).
+    """
+    border, cells = _templates(width)
+    labels = list(range(width))
+    yield border
+    for y in range(height):
+        last = y == height - 1
+        row = bytearray(cells)
+        below = bytearray(border)
+        parents = list(range(width))
+
+        def find(label: int) -> int:
+            while parents[label] != label:
+                parents[label] = parents[parents[label]]
+                label = parents[label]
+            return label
+
+        # Удаляем стены вправо между разными множествами (в последней строке - всегда)
+        right = _random_bits(rng, width - 1) if not last else '1' * (width - 1)
+        for x in range(width - 1):
+            if right[x] == '1':
+                a, b = find(labels[x]), find(labels[x + 1])
+                if a != b:
+                    parents[b] = a
+                    row[2 * x + 2] = PASSAGE
+        roots = [find(label) for label in labels]
+        if last:
+            yield bytes(row)
+            yield bytes(below)
+            break
+
+        # Каждое множество продолжается вниз случайными клетками, но хотя бы одной
+        down = _random_bits(rng, width)
+        carried = bytearray(width)
+        counts = [0] * width
+        chosen = [0] * width
+        for x, root in enumerate(roots):
+            if down[x] == '1':
+                carried[root] = 1
+                below[2 * x + 1] = PASSAGE
+            counts[root] += 1
+            if rng.randrange(counts[root]) == 0:
+                chosen[root] = x
+        for root in set(roots):
+            if not carried[root]:
+                carried[root] = 1
+                below[2 * chosen[root] + 1] = PASSAGE
+
+        # Клетки без прохода сверху получают новые, свободные номера множеств
+        free = (label for label in range(width) if not carried[label])
+        labels = [root if below[2 * x + 1] == PASSAGE else next(free) for x, root in enumerate(roots)]
+        yield bytes(row)
+        yield bytes(below)
+
+
+@register_generator('backtracker', streaming=False)
+def backtracker(height: int, width: int, rng: random.Random) -> RowIterator:
+    """
+    Рекурсивный поиск с возвратом на явном стеке (без ограничения глубины рекурсии).
+    Алгоритму нужна вся сетка, поэтому строки выдаются после завершения генерации.
+    """
+    border, cells = _templates(width)
+    cols = len(border)
+    data = bytearray(border) + (bytearray(cells) + bytearray(border)) * height
+    visited = bytearray(height * width)
+    visited[0] = 1
+    stack = [0]
+    while stack:
+        cell = stack[-1]
+        y, x = divmod(cell, width)
+        options = []
+        if y > 0 and not visited[cell - width]:
+            options.append(cell - width)
+        if y < height - 1 and not visited[cell + width]:
+            options.append(cell + width)
+        if x > 0 and not visited[cell - 1]:
+            options.append(cell - 1)
+        if x < width - 1 and not visited[cell + 1]:
+            options.append(cell + 1)
+        if not options:
+            stack.pop()
+            continue
+        neighbor = options[rng.randrange(len(options))]
+        visited[neighbor] = 1
+        ny, nx = divmod(neighbor, width)
+        # Стена между клетками лежит посередине между их координатами в сетке
+        data[(y + ny + 1) * cols + x + nx + 1] = PASSAGE
+        stack.append(neighbor)
+    for start in range(0, len(data), cols):
+        yield bytes(data[start:start + cols])
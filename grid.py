@@ -0,0 +1,249 @@
+import hashlib
+import struct
+from collections.abc import Sequence
+from typing import Iterable, Iterator, List, Tuple, Union
+
+WALL = ord('0')
+PASSAGE = ord('1')
+PATH = ord('.')
+
+
+class Grid:
+    """
+    Компактное хранилище клеток лабиринта: один байт на клетку в плоском bytearray.
+
+    Клетки хранятся в виде ASCII-кодов '0' (стена) и '1' (проход), поэтому строки
+    сетки можно напрямую писать в текстовый файл и читать из него без преобразований.
+    """
+    __slots__ = ('rows', 'cols', 'data', '_digest')
+
+    def __init__(self, rows: int, cols: int, data: Union[bytes, bytearray, None] = None) -> None:
+        """
+        :param rows: количество строк сетки
+        :param cols: количество столбцов сетки
+        :param data: содержимое сетки построчно (по умолчанию - одни стены)
+        """
+        if data is None:
+            data = bytearray(b'0') * (rows * cols)
+        elif len(data) != rows * cols:
+            raise ValueError("Размер данных не совпадает с размерами сетки.")
+        else:
+            data = bytearray(data)
+        self.rows = rows
+        self.cols = cols
+        self.data = data
+        self._digest = None
+
+    @classmethod
+    def from_rows(cls, rows: Iterable) -> 'Grid':
+        """
+        Создает сетку из последовательности строк (str, bytes или списков символов).
+
+        Raises:
+            ValueError: Если строки имеют разную длину.
+        """
+        encoded = [row.encode() if isinstance(row, str) else
+                   bytes(row) if isinstance(row, (bytes, bytearray)) else
+                   ''.join(row).encode() for row in rows]
+        if not encoded:
+            return cls(0, 0)
+        cols = len(encoded[0])
+        if any(len(row) != cols for row in encoded):
+            raise ValueError("Строки в лабиринте имеют разное количество символов.")
+        return cls(len(encoded), cols, b''.join(encoded))
+
+    @classmethod
+    def from_text(cls, buffer) -> 'Grid':
+        """
+        Создает сетку из текста лабиринта ('0'/'1', строки разделены переводом строки).
+
+        buffer может быть bytes или mmap. Для ровного файла (все строки одной длины,
+        окончания строк LF) прямоугольность проверяется по позициям переводов строки,
+        алфавит - подсчетом '0' и '1' без промежуточных копий, а строки копируются в сетку срезами.
+        Остальные файлы (пустые строки, окончания CRLF, пробелы по краям) разбираются построчно.
+
+        Raises:
+            ValueError: Если строки содержат символы, отличные от '0' и '1', или имеют разную длину.
+        """
+        with memoryview(buffer) as view:
+            size = len(view)
+            first_newline = buffer.find(b'\n')
+            cols = first_newline if first_newline >= 0 else size
+            # Последняя строка может быть без перевода строки
+            total = size if size and view[size - 1:size] == b'\n' else size + 1
+            if cols and total % (cols + 1) == 0:
+                rows = total // (cols + 1)
+                if view[cols:size:cols + 1] == b'\n' * (size // (cols + 1)):
+                    grid = cls(rows, cols)
+                    data = grid.data
+                    for row in range(rows):
+                        start = row * (cols + 1)
+                        data[row * cols:(row + 1) * cols] = view[start:start + cols]
+                    if data.count(b'0') + data.count(b'1') == len(data):
+                        return grid
+            text = bytes(view)
+        return cls._from_text_lines(text)
+
+    @classmethod
+    def _from_text_lines(cls, text: bytes) -> 'Grid':
+        """Построчный разбор текста с пропуском пустых строк и пробелов по краям."""
+        lines = []
+        for line in text.split(b'\n'):
+            stripped_line = line.strip()
+            if not stripped_line:  # Пропускаем пустые строки
+                continue
+            # Проверка на допустимые символы
+            if stripped_line.translate(None, b'01'):
+                raise ValueError("Строка содержит недопустимые символы: "
+                                 f"{stripped_line.decode(errors='replace')}")
+            lines.append(stripped_line)
+        return cls.from_rows(lines)
+
+    def index(self, row: int, col: int) -> int:
+        """Плоский индекс клетки (row, col)."""
+        return row * self.cols + col
+
+    def cell_index(self, position: Tuple[int, int], name: str) -> int:
+        """
+        Плоский индекс клетки лабиринта position (строка, столбец) с проверкой корректности.
+
+        Клетке лабиринта (r, c) соответствует клетка сетки (2r + 1, 2c + 1); name - название
+        позиции в сообщении об ошибке ('стартовая' или 'конечная').
+
+        Raises:
+            ValueError: Если позиция вне сетки или находится в стене.
+        """
+        row, col = 2 * position[0] + 1, 2 * position[1] + 1
+        if not (0 <= row < self.rows and 0 <= col < self.cols):
+            raise ValueError(f"Недопустимая {name} позиция.")
+        index = row * self.cols + col
+        if self.data[index] != PASSAGE:
+            raise ValueError("Стартовая или конечная позиция находится в стене.")
+        return index
+
+    def get(self, row: int, col: int) -> int:
+        """ASCII-код клетки (row, col)."""
+        return self.data[row * self.cols + col]
+
+    def set(self, row: int, col: int, value: int) -> None:
+        """Записывает ASCII-код value в клетку (row, col)."""
+        self.data[row * self.cols + col] = value
+        self._digest = None
+
+    def digest(self) -> bytes:
+        """
+        Хэш содержимого сетки (размеры и клетки).
+
+        Хэш вычисляется по байтам сетки один раз и хранится до следующего изменения через
+        set() или list_maze. После записи напрямую в data нужно вызвать invalidate().
+        """
+        if self._digest is None:
+            hasher = hashlib.blake2b(struct.pack('<QQ', self.rows, self.cols), digest_size=16)
+            hasher.update(self.data)
+            self._digest = hasher.digest()
+        return self._digest
+
+    def invalidate(self) -> None:
+        """Сбрасывает сохраненный хэш после прямого изменения data."""
+        self._digest = None
+
+    def row(self, row: int) -> bytes:
+        """Копия строки сетки в виде bytes."""
+        start = row * self.cols
+        return bytes(self.data[start:start + self.cols])
+
+    def iter_rows(self) -> Iterator[bytes]:
+        """Построчный обход сетки."""
+        for start in range(0, len(self.data), self.cols or 1):
+            yield bytes(self.data[start:start + self.cols])
+
+    def copy(self) -> 'Grid':
+        return Grid(self.rows, self.cols, self.data)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Grid):
+            return NotImplemented
+        return self.rows == other.rows and self.cols == other.cols and self.data == other.data
+
+    def __repr__(self) -> str:
+        return f"Grid(rows={self.rows}, cols={self.cols})"
+
+
+class GridRowView(Sequence):
+    """Строка сетки, ведущая себя как список символов '0'/'1' (совместимость с list_maze)."""
+    __slots__ = ('_grid', '_start')
+
+    def __init__(self, grid: Grid, row: int) -> None:
+        self._grid = grid
+        self._start = row * grid.cols
+
+    def __len__(self) -> int:
+        return self._grid.cols
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return list(self._bytes()[item].decode())
+        if item < 0:
+            item += self._grid.cols
+        if not 0 <= item < self._grid.cols:
+            raise IndexError("Индекс столбца вне лабиринта.")
+        return chr(self._grid.data[self._start + item])
+
+    def __setitem__(self, item: int, value: str) -> None:
+        if item < 0:
+            item += self._grid.cols
+        if not 0 <= item < self._grid.cols:
+            raise IndexError("Индекс столбца вне лабиринта.")
+        self._grid.data[self._start + item] = ord(value)
+        self._grid.invalidate()
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._bytes().decode())
+
+    def __contains__(self, value: object) -> bool:
+        return isinstance(value, str) and len(value) == 1 and ord(value) in self._bytes()
+
+    def __add__(self, other) -> List[str]:
+        return list(self) + list(other)
+
+    def __radd__(self, other) -> List[str]:
+        return list(other) + list(self)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (list, GridRowView)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+    def _bytes(self) -> bytes:
+        return bytes(self._grid.data[self._start:self._start + self._grid.cols])
+
+
+class GridView(Sequence):
+    """Ленивое представление сетки в виде списка строк-списков (совместимость с list_maze)."""
+    __slots__ = ('_grid',)
+
+    def __init__(self, grid: Grid) -> None:
+        self._grid = grid
+
+    def __len__(self) -> int:
+        return self._grid.rows
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return [GridRowView(self._grid, row) for row in range(self._grid.rows)[item]]
+        if item < 0:
+            item += self._grid.rows
+        if not 0 <= item < self._grid.rows:
+            raise IndexError("Индекс строки вне лабиринта.")
+        return GridRowView(self._grid, item)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (list, GridView)):
+            return len(self) == len(other) and all(a == list(b) for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return repr([list(row) for row in self])
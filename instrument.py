@@ -0,0 +1,228 @@
+"""
+Необязательная инструментация операций лабиринта.
+
+Профилировщик подменяет зарегистрированные функции обертками только на время
+своей работы и восстанавливает оригиналы при остановке, поэтому без него код
+выполняется без каких-либо проверок и дополнительных вызовов.
+"""
+import functools
+import inspect
+import os
+import time
+import tracemalloc
+from collections import Counter, defaultdict
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+import generators
+import maze
+from grid import PASSAGE
+
+
+class Hook(NamedTuple):
+    """
+    Зарегистрированная точка инструментации.
+
+    owner: класс или модуль, в котором находится функция
+    attribute: имя функции
+    operation: имя операции в отчете
+    counters: функция (аргументы вызова, результат) -> словарь счетчиков
+    """
+    owner: object
+    attribute: str
+    operation: str
+    counters: Optional[Callable[[Dict, object], Dict[str, int]]]
+
+
+HOOKS: List[Hook] = []
+_active = None
+
+
+def register(owner: object, attribute: str, operation: str = None,
+             counters: Callable[[Dict, object], Dict[str, int]] = None) -> None:
+    """
+    Регистрирует функцию owner.attribute для инструментации.
+
+    Функция counters получает аргументы вызова по именам (со значениями по умолчанию)
+    и результат и возвращает счетчики операции; вызывается только при включенном профилировщике.
+    """
+    HOOKS.append(Hook(owner, attribute, operation or attribute, counters))
+
+
+class Profiler:
+    """
+    Собирает время, количество вызовов, счетчики и пиковую память зарегистрированных операций.
+
+    Вложенные операции (например, maze_check внутри load_maze_from_file) учитываются
+    отдельно и одновременно входят во время внешней операции.
+    """
+
+    def __init__(self, callback: Callable[[Dict], None] = None, memory: bool = False) -> None:
+        """
+        :param callback: функция, получающая запись о каждом вызове операции
+            ({'operation', 'elapsed', 'counters', 'peak_bytes'}), например, для отправки во внешний сборщик метрик
+        :param memory: измерять пиковую память операций через tracemalloc (заметно замедляет код)
+        """
+        self.callback = callback
+        self.memory = memory
+        self.calls = Counter()
+        self.timings = defaultdict(float)
+        self.counters = defaultdict(Counter)
+        self.peak_memory = defaultdict(int)
+        self._originals = []
+        self._peaks = []
+        self._tracing = False
+
+    def start(self) -> 'Profiler':
+        """
+        Подменяет зарегистрированные функции обертками.
+
+        Raises:
+            RuntimeError: Если уже работает другой профилировщик.
+        """
+        global _active
+        if _active is not None:
+            raise RuntimeError("Профилировщик уже запущен.")
+        _active = self
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._tracing = True
+        for hook in HOOKS:
+            original = getattr(hook.owner, hook.attribute)
+            self._originals.append((hook.owner, hook.attribute, original))
+            setattr(hook.owner, hook.attribute, self._wrap(hook, original))
+        return self
+
+    def stop(self) -> None:
+        """Восстанавливает исходные функции."""
+        global _active
+        for owner, attribute, original in reversed(self._originals):
+            setattr(owner, attribute, original)
+        self._originals.clear()
+        if self._tracing:
+            tracemalloc.stop()
+            self._tracing = False
+        _active = None
+
+    def __enter__(self) -> 'Profiler':
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def _wrap(self, hook: Hook, func: Callable) -> Callable:
+        """Обертка, измеряющая один вызов операции."""
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if self.memory:
+                _, outer_peak = tracemalloc.get_traced_memory()
+                tracemalloc.reset_peak()
+                base, _ = tracemalloc.get_traced_memory()
+                self._peaks.append(0)
+            started = time.perf_counter()
+            result = failed = None
+            try:
+                result = func(*args, **kwargs)
+            except BaseException:
+                failed = True
+                raise
+            finally:
+                elapsed = time.perf_counter() - started
+                peak_bytes = None
+                if self.memory:
+                    _, peak = tracemalloc.get_traced_memory()
+                    # Вложенная операция сбросила пик: учитываем максимум, который она видела
+                    peak = max(peak, self._peaks.pop())
+                    peak_bytes = peak - base
+                    if self._peaks:
+                        self._peaks[-1] = max(self._peaks[-1], outer_peak, peak)
+                # Неудачный вызов учитывается по времени, но без счетчиков
+                counters = {}
+                if hook.counters is not None and not failed:
+                    bound = signature.bind(*args, **kwargs)
+                    bound.apply_defaults()
+                    counters = hook.counters(bound.arguments, result)
+                self._record(hook.operation, elapsed, counters, peak_bytes)
+            return result
+        return wrapper
+
+    def _record(self, operation: str, elapsed: float, counters: Dict[str, int], peak_bytes: Optional[int]) -> None:
+        """Добавляет вызов операции в статистику и передает его в callback."""
+        self.calls[operation] += 1
+        self.timings[operation] += elapsed
+        self.counters[operation].update(counters)
+        if peak_bytes is not None:
+            self.peak_memory[operation] = max(self.peak_memory[operation], peak_bytes)
+        if self.callback is not None:
+            self.callback({'operation': operation, 'elapsed': elapsed, 'counters': counters,
+                           'peak_bytes': peak_bytes})
+
+    def report(self) -> Dict[str, Dict]:
+        """
+        Returns:
+            dict: {операция: {'calls', 'time_s', 'counters', 'peak_bytes'}}
+        """
+        return {operation: {'calls': self.calls[operation], 'time_s': self.timings[operation],
+                            'counters': dict(self.counters[operation]),
+                            'peak_bytes': self.peak_memory.get(operation)}
+                for operation in self.calls}
+
+    def format_report(self) -> str:
+        """Таблица операций, отсортированная по суммарному времени."""
+        lines = [f"{'Операция':<22}{'Вызовы':>8}{'Время, с':>12}{'Пик памяти, КиБ':>18}  Счетчики"]
+        for operation, stats in sorted(self.report().items(), key=lambda item: -item[1]['time_s']):
+            peak = f"{stats['peak_bytes'] / 1024:.1f}" if stats['peak_bytes'] is not None else '-'
+            counters = ', '.join(f'{name}={value}' for name, value in stats['counters'].items())
+            lines.append(f"{operation:<22}{stats['calls']:>8}{stats['time_s']:>12.6f}{peak:>18}  {counters}")
+        return '\n'.join(lines)
+
+
+def _file_size(path: str) -> int:
+    """Размер файла или 0, если это stdout или файла нет."""
+    return os.path.getsize(path) if path != '-' and os.path.exists(path) else 0
+
+
+def _generated(arguments: Dict, result: object) -> Dict[str, int]:
+    # Проходы сетки - это клетки лабиринта и удаленные между ними стены; считаются только стены
+    maze_object = arguments['self']
+    return {'cells_carved': maze_object.grid.data.count(PASSAGE) - maze_object.height * maze_object.width}
+
+
+def _streamed(arguments: Dict, result: object) -> Dict[str, int]:
+    return {'cells_written': (2 * arguments['height'] + 1) * (2 * arguments['width'] + 1),
+            'bytes_written': result}
+
+
+def _solved(arguments: Dict, result: object) -> Dict[str, int]:
+    return {'nodes_expanded': arguments['self'].solve_stats.nodes_expanded}
+
+
+def _bytes_read(path_argument: str) -> Callable[[Dict, object], Dict[str, int]]:
+    return lambda arguments, result: {'bytes_read': _file_size(arguments[path_argument])}
+
+
+def _bytes_written(path_argument: str) -> Callable[[Dict, object], Dict[str, int]]:
+    return lambda arguments, result: {'bytes_written': _file_size(arguments[path_argument])}
+
+
+def _image_written(arguments: Dict, result: object) -> Dict[str, int]:
+    grid, cell_size = arguments['self'].grid, arguments['cell_size']
+    return {'pixels_written': grid.rows * grid.cols * cell_size * cell_size,
+            'bytes_written': _file_size(arguments['output_path'])}
+
+
+register(maze.Maze, 'generate_maze', counters=_generated)
+register(maze.Maze, 'solve_maze', counters=_solved)
+register(maze.Maze, 'build_path_index')
+register(maze.Maze, 'build_junction_graph')
+register(maze, 'maze_check')
+register(maze.Maze, 'load_maze_from_file', counters=_bytes_read('file_path'))
+register(maze.Maze, 'load_maze_from_binary', counters=_bytes_read('file_path'))
+register(maze.Maze, 'load_maze_from_image', counters=_bytes_read('image_path'))
+register(maze.Maze, 'save_maze_to_file', counters=_bytes_written('file_path'))
+register(maze.Maze, 'save_maze_to_binary', counters=_bytes_written('file_path'))
+register(maze.Maze, 'save_maze_as_image', counters=_image_written)
+register(maze.Maze, 'print_maze')
+register(maze.Maze, 'print_solution')
+register(generators, 'stream_maze_to_file', counters=_streamed)
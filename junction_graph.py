@@ -0,0 +1,310 @@
+import heapq
+import time
+from array import array
+from typing import List, Sequence, Tuple
+
+from grid import Grid, PASSAGE, WALL
+from solver import SolveResult, is_enclosed
+
+# Проходимость клетки: 1 - проход, 0 - стена или клетка пути
+_OPEN = bytes(1 if code == PASSAGE else 0 for code in range(256))
+# Код клетки 8 * проход + число соседних проходов -> 1 для узлов графа (тупиков,
+# развилок и изолированных клеток), то есть проходов со степенью, отличной от 2
+_NODE_CODES = bytes(1 if code in (8, 9, 11, 12) else 0 for code in range(256))
+# То же для тупиков и изолированных клеток (степень 0 или 1)
+_DEAD_END_CODES = bytes(1 if code in (8, 9) else 0 for code in range(256))
+
+
+def _cell_codes(grid: Grid) -> bytes:
+    """
+    Коды клеток сетки: 8 * проход + число соседних проходов.
+
+    Соседи складываются как большие числа из байтов сдвинутых копий сетки: коды не
+    больше 12, поэтому переносов между байтами нет. Перенос соседа через край строки
+    попадает только на клетки внешней стены, поэтому сетка должна быть окружена стенами.
+    """
+    cols = grid.cols
+    open_cells = grid.data.translate(_OPEN)
+    size = len(open_cells)
+    pad = bytes(cols)
+    total = (int.from_bytes(open_cells, 'big') * 8 +
+             int.from_bytes(pad + open_cells[:-cols], 'big') +
+             int.from_bytes(open_cells[cols:] + pad, 'big') +
+             int.from_bytes(b'\x00' + open_cells[:-1], 'big') +
+             int.from_bytes(open_cells[1:] + b'\x00', 'big'))
+    return total.to_bytes(size, 'big')
+
+
+def _marked(flags: bytes) -> List[int]:
+    """Индексы ненулевых байтов."""
+    indices = []
+    index = flags.find(1)
+    while index >= 0:
+        indices.append(index)
+        index = flags.find(1, index + 1)
+    return indices
+
+
+def fill_dead_ends(grid: Grid, keep: Sequence[Tuple[int, int]] = ()) -> Grid:
+    """
+    Заполнение тупиков: тупиковые клетки по одной замуровываются, пока тупики не кончатся.
+
+    От лабиринта остаются только циклы и проходы между сохраняемыми клетками keep;
+    ветви, ведущие в тупик, и изолированные клетки удаляются. В идеальном лабиринте
+    с двумя сохраняемыми клетками остается ровно путь между ними.
+
+    Args:
+        grid (Grid): Сетка лабиринта, окруженная стенами.
+        keep (Sequence[Tuple[int, int]]): Клетки в координатах сетки, которые нельзя замуровывать.
+
+    Returns:
+        Grid: Новая сетка (исходная не изменяется).
+
+    Raises:
+        ValueError: Если сетка не окружена стенами.
+    """
+    if not is_enclosed(grid):
+        raise ValueError("Лабиринт должен быть окружён стенами.")
+    filled = grid.copy()
+    data, cols = filled.data, filled.cols
+    offsets = (-cols, cols, -1, 1)
+    kept = {row * cols + col for row, col in keep}
+    stack = [index for index in _marked(_cell_codes(grid).translate(_DEAD_END_CODES)) if index not in kept]
+    while stack:
+        index = stack.pop()
+        if data[index] != PASSAGE:
+            continue
+        neighbors = [index + offset for offset in offsets if data[index + offset] == PASSAGE]
+        if len(neighbors) > 1:
+            continue
+        data[index] = WALL
+        # Единственный сосед мог сам стать тупиком
+        for neighbor in neighbors:
+            if neighbor not in kept:
+                stack.append(neighbor)
+    filled.invalidate()
+    return filled
+
+
+class JunctionGraph:
+    """
+    Сжатый граф лабиринта для повторных поисков пути.
+
+    Узлы графа - тупики и развилки (проходы, у которых не два соседних прохода), ребра -
+    коридоры между ними с длиной в шагах сетки. Граф хранится в массивах array в формате
+    CSR: ребра узла v - это targets[offsets[v]:offsets[v + 1]] с длинами weights и первыми
+    клетками коридоров firsts, по которым путь разворачивается обратно в клетки сетки.
+
+    Поиск - A* по узлам графа с манхэттенской эвристикой, поэтому за один шаг проходится
+    целый коридор, а не одна клетка. Начальная и конечная клетки могут лежать внутри
+    коридора: тогда поиск начинается (и заканчивается) в узлах на его концах.
+    Граф - снимок сетки: после изменения лабиринта его нужно построить заново.
+    """
+
+    def __init__(self, grid: Grid) -> None:
+        """
+        :param grid: сетка лабиринта
+        :raises ValueError: если сетка не окружена стенами
+        """
+        if not is_enclosed(grid):
+            raise ValueError("Лабиринт должен быть окружён стенами.")
+        self.grid = grid
+        data, cols = grid.data, grid.cols
+        self.node_ids = array('i', [-1]) * len(data)
+        self.nodes = array('i', _marked(_cell_codes(grid).translate(_NODE_CODES)))
+        node_ids = self.node_ids
+        for node_id, index in enumerate(self.nodes):
+            node_ids[index] = node_id
+
+        # Коридор проходится один раз и дает ребра в обе стороны
+        open_cells = int.from_bytes(data.translate(_OPEN), 'big')
+        seen = bytearray(len(data))
+        sources, targets, weights, firsts = array('i'), array('i'), array('i'), array('i')
+        offsets = (-cols, cols, -1, 1)
+        position = 0
+        while True:
+            if position == len(self.nodes):
+                # Непросмотренные проходы остаются только в кольцах без развилок и тупиков:
+                # одна клетка кольца становится узлом
+                ring = (open_cells - int.from_bytes(seen, 'big')).to_bytes(len(data), 'big').find(1)
+                if ring < 0:
+                    break
+                node_ids[ring] = len(self.nodes)
+                self.nodes.append(ring)
+            source = self.nodes[position]
+            position += 1
+            seen[source] = 1
+            for offset in offsets:
+                first = source + offset
+                if data[first] != PASSAGE:
+                    continue
+                if node_ids[first] >= 0:
+                    # Соседние узлы: ребро добавляется один раз, со стороны меньшего индекса
+                    if source < first:
+                        sources.extend((node_ids[source], node_ids[first]))
+                        targets.extend((node_ids[first], node_ids[source]))
+                        weights.extend((1, 1))
+                        firsts.extend((first, source))
+                    continue
+                if seen[first]:
+                    continue
+                cells = self._walk(source, first)
+                for cell in cells[:-1]:
+                    seen[cell] = 1
+                target, last = cells[-1], cells[-2]
+                sources.extend((node_ids[source], node_ids[target]))
+                targets.extend((node_ids[target], node_ids[source]))
+                weights.extend((len(cells), len(cells)))
+                firsts.extend((first, last))
+
+        # Сортировка ребер подсчетом по исходному узлу
+        count = len(self.nodes)
+        self.offsets = array('i', [0]) * (count + 1)
+        for source in sources:
+            self.offsets[source + 1] += 1
+        for node in range(count):
+            self.offsets[node + 1] += self.offsets[node]
+        self.targets = array('i', [0]) * len(sources)
+        self.weights = array('i', [0]) * len(sources)
+        self.firsts = array('i', [0]) * len(sources)
+        fill = array('i', self.offsets[:-1])
+        for edge, source in enumerate(sources):
+            slot = fill[source]
+            fill[source] += 1
+            self.targets[slot] = targets[edge]
+            self.weights[slot] = weights[edge]
+            self.firsts[slot] = firsts[edge]
+
+    @property
+    def node_count(self) -> int:
+        """Количество узлов графа."""
+        return len(self.nodes)
+
+    @property
+    def edge_count(self) -> int:
+        """Количество коридоров (каждый хранится двумя направленными ребрами)."""
+        return len(self.targets) // 2
+
+    def _walk(self, previous: int, current: int) -> List[int]:
+        """Клетки коридора от current (сосед previous) до ближайшего узла включительно."""
+        data, node_ids = self.grid.data, self.node_ids
+        cols = self.grid.cols
+        cells = [current]
+        while node_ids[current] < 0:
+            for offset in (-cols, cols, -1, 1):
+                neighbor = current + offset
+                if neighbor != previous and data[neighbor] == PASSAGE:
+                    previous, current = current, neighbor
+                    break
+            cells.append(current)
+        return cells
+
+    def _exits(self, index: int) -> List[List[int]]:
+        """Пути от клетки index до узлов графа: [index] для узла или два коридора до концов."""
+        if self.node_ids[index] >= 0:
+            return [[index]]
+        data, cols = self.grid.data, self.grid.cols
+        return [[index] + self._walk(index, index + offset)
+                for offset in (-cols, cols, -1, 1) if data[index + offset] == PASSAGE]
+
+    def solve(self, start: Tuple[int, int], end: Tuple[int, int]) -> SolveResult:
+        """
+        Кратчайший путь между клетками лабиринта start и end.
+
+        Returns:
+            SolveResult: Путь в координатах сетки (как Maze.solve_maze), количество
+            раскрытых узлов графа и время поиска.
+        """
+        started = time.perf_counter()
+        start_index, end_index = self.grid.cell_index(start, 'стартовая'), self.grid.cell_index(end, 'конечная')
+        indices, expanded = self._search(start_index, end_index)
+        cols = self.grid.cols
+        path = [(index // cols, index % cols) for index in indices]
+        return SolveResult(path, expanded, time.perf_counter() - started)
+
+    def path(self, start: Tuple[int, int], end: Tuple[int, int]) -> List[Tuple[int, int]]:
+        """Путь между клетками лабиринта start и end в координатах сетки."""
+        return self.solve(start, end).path
+
+    def query_paths(self, starts: Sequence[Tuple[int, int]],
+                    ends: Sequence[Tuple[int, int]]) -> List[List[Tuple[int, int]]]:
+        """Пути для пар (starts[i], ends[i])."""
+        if len(starts) != len(ends):
+            raise ValueError("Количество стартовых и конечных позиций должно совпадать.")
+        return [self.path(start, end) for start, end in zip(starts, ends)]
+
+    def _search(self, start: int, end: int) -> Tuple[List[int], int]:
+        """A* по узлам графа от клетки start до клетки end (плоские индексы сетки)."""
+        if start == end:
+            return [start], 0
+        node_ids, nodes, cols = self.node_ids, self.nodes, self.grid.cols
+        best, best_path = None, None
+
+        # Начальные узлы - концы коридора со стартовой клеткой; конец в том же коридоре - готовый путь
+        costs, starts = {}, {}
+        for cells in self._exits(start):
+            if end in cells:
+                steps = cells.index(end)
+                if best is None or steps < best:
+                    best, best_path = steps, cells[:steps + 1]
+                continue
+            node, steps = node_ids[cells[-1]], len(cells) - 1
+            if steps < costs.get(node, steps + 1):
+                costs[node], starts[node] = steps, cells
+        # Конечные узлы: узел -> (шагов до конечной клетки, клетки от узла до нее)
+        goals = {}
+        for cells in self._exits(end):
+            node, steps = node_ids[cells[-1]], len(cells) - 1
+            if steps < goals.get(node, (steps + 1,))[0]:
+                goals[node] = (steps, cells[::-1])
+
+        end_row, end_col = divmod(end, cols)
+        heap = []
+        for node, cost in costs.items():
+            row, col = divmod(nodes[node], cols)
+            heapq.heappush(heap, (cost + abs(row - end_row) + abs(col - end_col), cost, node))
+        # Предки узлов: узел -> (предыдущий узел, ребро)
+        parents = {}
+        offsets, targets, weights = self.offsets, self.targets, self.weights
+        closed = set()
+        expanded = 0
+        goal = None
+        while heap:
+            estimate, cost, node = heapq.heappop(heap)
+            if best is not None and estimate >= best:
+                break
+            if node in closed:
+                continue
+            closed.add(node)
+            expanded += 1
+            if node in goals and (best is None or cost + goals[node][0] < best):
+                best, goal = cost + goals[node][0], node
+            for edge in range(offsets[node], offsets[node + 1]):
+                target = targets[edge]
+                if target in closed:
+                    continue
+                target_cost = cost + weights[edge]
+                if target_cost < costs.get(target, target_cost + 1):
+                    costs[target] = target_cost
+                    parents[target] = (node, edge)
+                    row, col = divmod(nodes[target], cols)
+                    heapq.heappush(heap, (target_cost + abs(row - end_row) + abs(col - end_col),
+                                          target_cost, target))
+        if goal is None:
+            return (best_path or []), expanded
+
+        # Разворачивание ребер в клетки сетки: коридор от стартовой клетки, коридоры графа,
+        # коридор до конечной клетки
+        edges = []
+        node = goal
+        while node in parents:
+            node, edge = parents[node]
+            edges.append(edge)
+        path = list(starts[node])
+        previous = nodes[node]
+        for edge in reversed(edges):
+            cells = self._walk(previous, self.firsts[edge])
+            path.extend(cells)
+            previous = cells[-1]
+        path.extend(goals[goal][1][1:])
+        return path, expanded
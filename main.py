@@ -1,6 +1,26 @@
 import argparse
 import os
+import generators
+from generators import GENERATORS, generate_rows
 from maze import Maze
+from mzb import CODECS
+from solver import SOLVERS
+
+
+def positive_int(value: str) -> int:
+    """
+    Тип аргумента argparse: целое число больше нуля.
+
+    Raises:
+        argparse.ArgumentTypeError: Если значение не положительное целое число.
+    """
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"ожидается положительное целое число, получено {value!r}")
+    return number
 
 
 def main() -> None:
@@ -13,42 +33,161 @@ def main() -> None:
 
     # Добавляем аргументы
     parser.add_argument('-gm', '--generate_maze', nargs=2, type=int, metavar=('HEIGHT', 'WIDTH'),
-                        help="Генерация лабиринта. Принимает два значения от 1 до 100.")
+                        help="Генерация лабиринта. Принимает два значения от 1 до 100 "
+                             "(без ограничения сверху при потоковом экспорте в .txt или '-').")
+    parser.add_argument('-ga', '--algorithm', choices=tuple(GENERATORS), default='binary_tree',
+                        help="Алгоритм генерации лабиринта (по умолчанию binary_tree).")
+    parser.add_argument('--seed', type=int, default=None,
+                        help="Зерно генератора случайных чисел для воспроизводимой генерации.")
+    parser.add_argument('--workers', type=positive_int, default=None,
+                        help="Параллельная генерация полосами в WORKERS процессах (binary_tree, sidewinder; "
+                             "без ограничения размера).")
     parser.add_argument('-pm', '--print_maze', action='store_true',
                         help="Вывод лабиринта в консоль.")
     parser.add_argument('-im', '--import_maze', type=str,
-                        help="Импорт лабиринта из файла (.txt, .png, .jpg).")
+                        help="Импорт лабиринта из файла (.txt, .png, .jpg, .mzb).")
     parser.add_argument('-em', '--export_maze', type=str,
-                        help="Экспорт лабиринта в файл (.txt, .png, .jpg).")
+                        help="Экспорт лабиринта в файл (.txt, .png, .jpg, .mzb) или в stdout ('-').")
+    parser.add_argument('-cs', '--cell_size', type=positive_int, default=None,
+                        help="Размер клетки изображения в пикселях (экспорт - 20 по умолчанию, "
+                             "импорт - определяется автоматически).")
+    parser.add_argument('-pc', '--png_compression', type=int, choices=range(10), metavar='LEVEL',
+                        help="Уровень сжатия PNG при экспорте: 0 (быстрее) - 9 (меньше файл).")
+    parser.add_argument('-mc', '--mzb_compression', choices=tuple(CODECS), default='none',
+                        help="Сжатие данных клеток при экспорте в .mzb (по умолчанию none).")
+    parser.add_argument('-rm', '--render_mode', choices=('text', 'half'), default='text',
+                        help="Режим вывода в консоль: text - символы '#', half - полублоки "
+                             "(две строки лабиринта на строку терминала).")
     parser.add_argument('-psm', '--print_solved_maze', action='store_true',
                         help="Вывод лабиринта с решением в консоль.")
     parser.add_argument('-esm', '--export_solved_maze', type=str,
-                        help="Экспорт решенного лабиринта в файл (.png, .jpg).")
+                        help="Экспорт решенного лабиринта в файл (.png, .jpg, .txt, .mzb).")
     # Добавляем аргумент для решения лабиринта
     parser.add_argument('-sm', '--solve_maze', nargs=4, type=int, metavar=('START_X', 'START_Y', 'END_X', 'END_Y'),
                         help="Решение лабиринта. Принимает 4 значения: начальные и конечные координаты "
                              "(START_X, START_Y, END_X, END_Y).")
+    parser.add_argument('-sa', '--solve_method', choices=tuple(SOLVERS), default='bfs',
+                        help="Метод решения лабиринта (по умолчанию bfs).")
+    parser.add_argument('--profile', nargs='?', const='', default=None, metavar='FILE',
+                        help="Вывести время, счетчики и пиковую память операций; "
+                             "если указан FILE, сохранить в него также профиль cProfile (pstats).")
+
+    # Пакетная генерация и решение множества лабиринтов в пуле процессов
+    subparsers = parser.add_subparsers(dest='command')
+    batch_parser = subparsers.add_parser('batch', help="Пакетная генерация, решение и экспорт лабиринтов.")
+    batch_parser.add_argument('count', type=int, help="Количество лабиринтов.")
+    batch_parser.add_argument('--size', nargs=2, type=int, default=(10, 50), metavar=('MIN', 'MAX'),
+                              help="Диапазон высоты и ширины лабиринтов (по умолчанию 10 50).")
+    # Свои dest, чтобы значения по умолчанию подкоманды не затирали одноименные общие аргументы
+    batch_parser.add_argument('--seed', dest='batch_seed', type=int, default=None,
+                              help="Базовое зерно: i-й лабиринт генерируется с зерном SEED + i (по умолчанию 0).")
+    batch_parser.add_argument('-ga', '--algorithm', dest='batch_algorithm', choices=tuple(GENERATORS),
+                              default=None, help="Алгоритм генерации лабиринтов.")
+    batch_parser.add_argument('-sa', '--solve_method', dest='batch_solve_method', choices=tuple(SOLVERS),
+                              default=None, help="Метод решения лабиринтов.")
+    batch_parser.add_argument('-w', '--workers', dest='batch_workers', type=positive_int, default=None,
+                              help="Количество процессов (по умолчанию - число ядер).")
+    batch_parser.add_argument('--chunk_size', type=positive_int, default=8,
+                              help="Сколько лабиринтов отправлять в пул процессов за раз.")
+    batch_parser.add_argument('-o', '--output_dir', type=str, default='batch_output',
+                              help="Каталог для файлов лабиринтов и манифеста.")
+    batch_parser.add_argument('-f', '--formats', nargs='*', choices=('txt', 'png', 'jpg'), default=['txt'],
+                              help="Форматы экспорта каждого лабиринта.")
+
+    # Большие лабиринты в тайловом файле: в памяти держится ограниченное число тайлов
+    tiled_parser = subparsers.add_parser('tiled', help="Работа с большими лабиринтами в тайловом файле .mzt.")
+    tiled_parser.add_argument('file', type=str, help="Тайловый файл лабиринта (.mzt).")
+    tiled_parser.add_argument('-gm', '--generate_maze', nargs=2, type=int, metavar=('HEIGHT', 'WIDTH'),
+                              help="Сгенерировать лабиринт сразу в тайловый файл (без ограничения размера).")
+    tiled_parser.add_argument('-ga', '--algorithm', choices=tuple(GENERATORS), default='binary_tree',
+                              help="Алгоритм генерации лабиринта.")
+    tiled_parser.add_argument('--seed', type=int, default=None, help="Зерно генерации.")
+    tiled_parser.add_argument('-im', '--import_maze', type=str,
+                              help="Преобразовать текстовый лабиринт (.txt) в тайловый файл.")
+    tiled_parser.add_argument('--tile_size', type=int, default=256, help="Сторона тайла в клетках сетки.")
+    tiled_parser.add_argument('--cache_tiles', type=int, default=64,
+                              help="Сколько тайлов держать в памяти.")
+    tiled_parser.add_argument('-sm', '--solve_maze', nargs=4, type=int,
+                              metavar=('START_X', 'START_Y', 'END_X', 'END_Y'),
+                              help="Решение лабиринта между клетками (по умолчанию - между углами).")
+    tiled_parser.add_argument('-pm', '--print_maze', action='store_true', help="Вывод лабиринта в консоль.")
+    tiled_parser.add_argument('-psm', '--print_solved_maze', action='store_true',
+                              help="Вывод лабиринта с решением в консоль.")
+    tiled_parser.add_argument('-em', '--export_maze', type=str,
+                              help="Экспорт лабиринта (с решением, если оно найдено) в .png по тайлам.")
+    tiled_parser.add_argument('-cs', '--cell_size', type=positive_int, default=1,
+                              help="Размер клетки изображения в пикселях (по умолчанию 1).")
+    tiled_parser.add_argument('-rm', '--render_mode', choices=('text', 'half'), default='text',
+                              help="Режим вывода в консоль.")
 
     # Парсим аргументы
     args = parser.parse_args()
 
+    if args.profile is None:
+        run_commands(args, parser)
+        return
+    # Профилировщик загружается только по запросу, чтобы не замедлять обычный запуск
+    import cProfile
+    from instrument import Profiler
+    with Profiler(memory=True) as profiler:
+        if args.profile:
+            profile = cProfile.Profile()
+            profile.runcall(run_commands, args, parser)
+            profile.dump_stats(args.profile)
+        else:
+            run_commands(args, parser)
+    print("Профиль операций:")
+    print(profiler.format_report())
+
+
+def run_commands(args: argparse.Namespace, parser: argparse.ArgumentParser) -> None:
+    """
+    Выполняет операции, заданные аргументами командной строки.
+    :return: None
+    """
+    if args.command == 'batch':
+        run_batch_command(args)
+        return
+    if args.command == 'tiled':
+        run_tiled_command(args)
+        return
+
     maze = None
 
+    # Потоковая генерация сразу в файл: вся сетка не хранится в памяти
+    if is_streaming_export(args):
+        height, width = args.generate_maze
+        if not (height >= 1 and width >= 1):
+            print("Ошибка: значения HEIGHT и WIDTH должны быть положительными.")
+            return
+        # Через модуль, чтобы вызов видел обертку профилировщика
+        generators.stream_maze_to_file(args.export_maze, height, width, args.algorithm, args.seed)
+        return
+
     # Генерация лабиринта
     if args.generate_maze:
         height, width = args.generate_maze
-        if not (1 <= height <= 100 and 1 <= width <= 100):
+        if args.workers is not None:
+            # Параллельная генерация предназначена для больших лабиринтов
+            if not (height >= 1 and width >= 1 and args.workers >= 1):
+                print("Ошибка: значения HEIGHT, WIDTH и WORKERS должны быть положительными.")
+                return
+        elif not (1 <= height <= 100 and 1 <= width <= 100):
             print("Ошибка: значения HEIGHT и WIDTH должны быть от 1 до 100.")
             return
         maze = Maze(height, width)
-        maze.generate_maze()
+        try:
+            maze.generate_maze(seed=args.seed, algorithm=args.algorithm, workers=args.workers)
+        except ValueError as e:
+            print(e)
+            return
 
     # Импорт лабиринта из файла
     if args.import_maze:
         file_path = args.import_maze
         _, ext = os.path.splitext(file_path)
-        if ext not in ('.txt', '.png', '.jpg'):
-            print("Ошибка: поддерживаются только файлы с расширением .txt, .png, .jpg.")
+        if ext not in ('.txt', '.png', '.jpg', '.mzb'):
+            print("Ошибка: поддерживаются только файлы с расширением .txt, .png, .jpg, .mzb.")
             return
 
         if maze is None:
@@ -57,28 +196,38 @@ def main() -> None:
         try:
             if ext == '.txt':
                 maze.load_maze_from_file(file_path)
+            elif ext == '.mzb':
+                maze.load_maze_from_binary(file_path)
             elif ext in ('.png', '.jpg'):
-                maze.load_maze_from_image(file_path)
-        except ValueError as e:
+                maze.load_maze_from_image(file_path, cell_size=args.cell_size)
+        except (ValueError, ImportError) as e:
             print(e)
 
     # Вывод лабиринта в консоль
     if args.print_maze and maze:
         print("Лабиринт:")
-        maze.print_maze()
+        maze.print_maze(args.render_mode)
 
     # Экспорт лабиринта в файл
     if args.export_maze and maze:
         file_path = args.export_maze
         _, ext = os.path.splitext(file_path)
-        if ext not in ('.txt', '.png', '.jpg'):
-            print("Ошибка: поддерживаются только файлы с расширением .txt, .png, .jpg.")
+        if ext not in ('.txt', '.png', '.jpg', '.mzb'):
+            print("Ошибка: поддерживаются только файлы с расширением .txt, .png, .jpg, .mzb.")
             return
 
         if ext == '.txt':
             maze.save_maze_to_file(file_path)
+        elif ext == '.mzb':
+            try:
+                maze.save_maze_to_binary(file_path, compression=args.mzb_compression)
+            except ValueError as e:
+                print(e)
         elif ext in ('.png', '.jpg'):
-            maze.save_maze_as_image(file_path)
+            try:
+                maze.save_maze_as_image(file_path, args.cell_size or 20, compress_level=args.png_compression)
+            except (ValueError, ImportError) as e:
+                print(e)
 
     # Решение лабиринта
     try:
@@ -86,25 +235,27 @@ def main() -> None:
             if maze:
                 if args.solve_maze:
                     x1, y1, x2, y2 = args.solve_maze
-                    maze.solve_maze((y1, x1), (y2, x2))
+                    maze.solve_maze((y1, x1), (y2, x2), method=args.solve_method)
                 else:
-                    maze.solve_maze()
+                    maze.solve_maze(method=args.solve_method)
                 if args.print_solved_maze:
                     print("Решение лабиринта:")
-                    maze.print_solution()
+                    maze.print_solution(args.render_mode)
 
                 # Экспорт решенного лабиринта
                 if args.export_solved_maze:
                     file_path = args.export_solved_maze
                     _, ext = os.path.splitext(file_path)
-                    if ext not in ('.png', '.jpg', '.txt'):
-                        print("Ошибка: поддерживаются только файлы с расширением .png, .jpg.")
+                    if ext not in ('.png', '.jpg', '.txt', '.mzb'):
+                        print("Ошибка: поддерживаются только файлы с расширением .png, .jpg, .txt, .mzb.")
                         return
                     if ext == '.txt':
                         maze.save_maze_to_file(file_path, True)
+                    elif ext == '.mzb':
+                        maze.save_maze_to_binary(file_path, True, compression=args.mzb_compression)
                     else:
-                        maze.save_maze_as_image(file_path)
-    except ValueError as e:
+                        maze.save_maze_as_image(file_path, args.cell_size or 20, compress_level=args.png_compression)
+    except (ValueError, ImportError) as e:
         print(e)
 
     # Если не было ни одной операции
@@ -113,5 +264,94 @@ def main() -> None:
         parser.print_help()
 
 
+def run_batch_command(args: argparse.Namespace) -> None:
+    """
+    Выполняет подкоманду batch: лабиринты обрабатываются в пуле процессов,
+    а записи о них выводятся и дописываются в manifest.jsonl по мере готовности.
+
+    Зерно, алгоритмы и число процессов берутся из аргументов подкоманды, а если они
+    не указаны - из общих аргументов перед batch.
+    """
+    # Пул процессов нужен только пакетному режиму
+    from batch import make_tasks, run_batch, write_manifest
+
+    low, high = args.size
+    if not (1 <= low <= high):
+        print("Ошибка: диапазон размеров должен удовлетворять 1 <= MIN <= MAX.")
+        return
+    os.makedirs(args.output_dir, exist_ok=True)
+    seed = args.batch_seed if args.batch_seed is not None else args.seed or 0
+    algorithm = args.batch_algorithm or args.algorithm
+    solve_method = args.batch_solve_method or args.solve_method
+    workers = args.batch_workers or args.workers
+    tasks = make_tasks(args.count, (low, high), seed, algorithm, solve_method, args.output_dir, args.formats)
+    manifest_path = os.path.join(args.output_dir, 'manifest.jsonl')
+    records = run_batch(tasks, workers=workers, chunk_size=args.chunk_size)
+    for record in write_manifest(records, manifest_path):
+        print(f"#{record['index']} seed={record['seed']} {record['height']}x{record['width']} "
+              f"path={record['path_length']}", flush=True)
+
+
+def run_tiled_command(args: argparse.Namespace) -> None:
+    """
+    Выполняет подкоманду tiled: создание тайлового файла генерацией или из текста,
+    решение, вывод и экспорт в PNG через кэш тайлов со статистикой попаданий.
+    """
+    from tiles import TiledMaze, save_tiled_png, solve_tiled, text_rows, write_tiled, write_tiled_frame
+
+    try:
+        if args.generate_maze:
+            height, width = args.generate_maze
+            if not (height >= 1 and width >= 1):
+                print("Ошибка: значения HEIGHT и WIDTH должны быть положительными.")
+                return
+            write_tiled(args.file, generate_rows(args.algorithm, height, width, args.seed), args.tile_size)
+        elif args.import_maze:
+            write_tiled(args.file, text_rows(args.import_maze), args.tile_size)
+
+        with TiledMaze(args.file, args.cache_tiles) as store:
+            path = []
+            if args.solve_maze or args.print_solved_maze:
+                if args.solve_maze:
+                    x1, y1, x2, y2 = args.solve_maze
+                else:
+                    x1, y1, x2, y2 = 0, 0, (store.cols - 1) // 2 - 1, (store.rows - 1) // 2 - 1
+                result = solve_tiled(store, (2 * y1 + 1, 2 * x1 + 1), (2 * y2 + 1, 2 * x2 + 1))
+                path = result.path
+                print(f"Путь: {len(path)} клеток, раскрыто {result.nodes_expanded}, {result.elapsed:.3f} с")
+            if args.print_maze:
+                print("Лабиринт:")
+                write_tiled_frame(store, mode=args.render_mode)
+            if args.print_solved_maze:
+                print("Решение лабиринта:")
+                write_tiled_frame(store, path, args.render_mode)
+            if args.export_maze:
+                if os.path.splitext(args.export_maze)[1] != '.png':
+                    print("Ошибка: тайловый лабиринт экспортируется только в .png.")
+                    return
+                save_tiled_png(store, args.export_maze, path, args.cell_size)
+            stats = store.stats()
+            print(f"Тайлы: попаданий {stats['hits']}, промахов {stats['misses']}, "
+                  f"доля попаданий {stats['hit_rate']:.1%}")
+    except (ValueError, OSError) as e:
+        print(e)
+
+
+def is_streaming_export(args: argparse.Namespace) -> bool:
+    """
+    Проверяет, можно ли сгенерировать лабиринт потоково: только генерация и экспорт в текст
+    потоковым алгоритмом, без импорта, вывода и решения, которым нужна вся сетка.
+    """
+    if not (args.generate_maze and args.export_maze):
+        return False
+    if args.import_maze or args.print_maze or args.print_solved_maze or args.export_solved_maze:
+        return False
+    if args.workers is not None:
+        return False
+    if args.export_maze != '-' and os.path.splitext(args.export_maze)[1] != '.txt':
+        return False
+    return GENERATORS[args.algorithm].streaming
+
+
 if __name__ == '__main__':
     main()
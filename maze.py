@@ -1,7 +1,16 @@
-import random
-from collections import deque
-from typing import Tuple, List
-from PIL import Image
+import mmap
+import os
+import time
+from typing import Tuple, List, Union
+
+import mzb
+from generators import generate_rows, write_rows
+from grid import Grid, GridView, PASSAGE, PATH, WALL
+from junction_graph import JunctionGraph, fill_dead_ends
+from path_index import PathIndex
+from render import write_frame
+from solution_cache import SOLUTION_CACHE
+from solver import SolveResult, solve
 
 
 class Maze:
@@ -13,127 +22,179 @@ class Maze:
         Инициализация лабиринта с созданием клеток окруженных стенами
         :param height: высота
         :param width: ширина
-        list_maze: список для лабиринта
+        grid: компактная сетка лабиринта (один байт на клетку)
         list_way: список для пути от начальной до конечной точек
+        solve_stats: статистика последнего решения (раскрытые клетки, время)
+        solution_cache: LRU-кэш решений (по умолчанию общий для всех лабиринтов, None - без кэша)
+        seed: зерно последней генерации
+        algorithm: алгоритм последней генерации
         """
         self.height = height
         self.width = width
-        self.list_maze = []
+        self.grid = Grid(0, 0)
         self.list_way = []
+        self.solve_stats = None
+        self.solution_cache = SOLUTION_CACHE
+        self.seed = None
+        self.algorithm = None
         self.init_base_data()
 
+    @property
+    def list_maze(self) -> GridView:
+        """Ленивое представление сетки в виде списка списков символов '0'/'1'."""
+        return GridView(self.grid)
+
+    @list_maze.setter
+    def list_maze(self, maze: Union[List, Grid]) -> None:
+        self.grid = maze if isinstance(maze, Grid) else Grid.from_rows(maze)
+
     def init_base_data(self) -> None:
         """Инициализация пустого лабиринта с внешними стенами."""
         # Создаем лабиринт размером (2*height + 1) на (2*width + 1)
-        self.list_maze = [['0'] * (2 * self.width + 1) for _ in range(2 * self.height + 1)]
+        self.grid = Grid(2 * self.height + 1, 2 * self.width + 1)
 
         # Заполнение внутренней части лабиринта пустыми клетками
+        cols = self.grid.cols
         for y in range(self.height):
-            for x in range(self.width):
-                self.list_maze[2 * y + 1][2 * x + 1] = '1'
+            start = (2 * y + 1) * cols
+            self.grid.data[start + 1:start + cols - 1:2] = b'1' * self.width
 
-    def generate_maze(self) -> None:
-        """Генерация лабиринта с использованием алгоритма бинарного дерева."""
-        for y in range(self.height):
-            for x in range(self.width):
-                # Для каждой клетки выбираем, куда удалить стену: вниз или вправо
-                if x == self.width - 1 and y == self.height - 1:
-                    # В правом нижнем углу ничего не делаем
-                    continue
-                if x == self.width - 1:  # Если мы в последнем столбце, удаляем стену вниз
-                    self.list_maze[2 * y + 2][2 * x + 1] = '1'
-                elif y == self.height - 1:  # Если мы в последней строке, удаляем стену вправо
-                    self.list_maze[2 * y + 1][2 * x + 2] = '1'
-                else:
-                    # Выбираем случайное направление (вправо или вниз)
-                    if random.choice([True, False]):
-                        self.list_maze[2 * y + 1][2 * x + 2] = '1'  # Удаляем стену вправо
-                    else:
-                        self.list_maze[2 * y + 2][2 * x + 1] = '1'  # Удаляем стену вниз
-
-    def print_maze(self) -> None:
-        """Вывод лабиринта."""
-        for row in self.list_maze:
-            print(' '.join(row).replace('0', '#').replace('1', ' '))
-
-    def solve_maze(self, start: Tuple[int, int] = None, end: Tuple[int, int] = None) -> List[Tuple[int, int]]:
+    def generate_maze(self, seed: int = None, algorithm: str = 'binary_tree', workers: int = None) -> None:
+        """
+        Генерация лабиринта выбранным алгоритмом.
+
+        Args:
+            seed (int): Зерно генератора случайных чисел (None - случайное).
+            algorithm (str): Имя алгоритма из реестра generators.GENERATORS
+                ('binary_tree', 'sidewinder', 'eller', 'backtracker').
+            workers (int): Если задано, лабиринт генерируется полосами в workers процессах
+                (только binary_tree и sidewinder, см. parallel.generate_parallel). Результат
+                не зависит от числа процессов, но отличается от последовательной генерации.
+
+        Raises:
+            ValueError: Если алгоритм неизвестен или не поддерживает параллельную генерацию.
         """
-        Решение лабиринта методом DFS от стартовой до конечной позиции.
+        if workers is not None:
+            # Пул процессов и общая память нужны только параллельной генерации
+            from parallel import generate_parallel
+            self.grid = generate_parallel(self.height, self.width, algorithm, seed, workers)
+            self.seed = seed
+            self.algorithm = algorithm
+            return
+        rows = generate_rows(algorithm, self.height, self.width, seed)
+        grid = Grid(2 * self.height + 1, 2 * self.width + 1)
+        data, cols = grid.data, grid.cols
+        for start, row in zip(range(0, len(data), cols), rows):
+            data[start:start + cols] = row
+        self.grid = grid
+        self.seed = seed
+        self.algorithm = algorithm
+
+    def print_maze(self, mode: str = 'text') -> None:
+        """
+        Вывод лабиринта.
+
+        :param mode: 'text' - стены '#', или 'half' - полублоки, две строки сетки на строку терминала
+        """
+        write_frame(self.grid, mode=mode)
+
+    def solve_maze(self, start: Tuple[int, int] = None, end: Tuple[int, int] = None,
+                   method: str = 'bfs') -> List[Tuple[int, int]]:
+        """
+        Решение лабиринта от стартовой до конечной позиции.
 
         Args:
             start (Tuple[int, int]): Начальная позиция в виде (строка, столбец).
             end (Tuple[int, int]): Конечная позиция в виде (строка, столбец).
+            method (str): Метод поиска: 'bfs', 'astar' или 'bidirectional'.
+
+        Returns:
+            List[Tuple[int, int]]: Путь в координатах сетки (пустой, если пути нет).
+            Количество раскрытых клеток и время поиска сохраняются в solve_stats.
+        """
+        start_real, end_real = self.grid_positions(start, end)
+        grid = self.grid
+
+        # Решения кэшируются по содержимому сетки, поэтому переживают повторную загрузку лабиринта
+        cache = self.solution_cache
+        key = (grid.digest(), start_real, end_real, method)
+        started = time.perf_counter()
+        path = cache.get(key) if cache is not None else None
+        if path is not None:
+            self.solve_stats = SolveResult(path, 0, time.perf_counter() - started)
+        else:
+            self.solve_stats = solve(grid, start_real, end_real, method)
+            if cache is not None:
+                cache.put(key, self.solve_stats.path)
+        self.list_way = list(self.solve_stats.path)
+        return self.list_way
+
+    def grid_positions(self, start: Tuple[int, int] = None,
+                       end: Tuple[int, int] = None) -> Tuple[Tuple[int, int], Tuple[int, int]]:
+        """
+        Переводит стартовую и конечную позиции лабиринта в координаты сетки с проверкой.
+
+        Args:
+            start (Tuple[int, int]): Начальная позиция (по умолчанию левый верхний угол).
+            end (Tuple[int, int]): Конечная позиция (по умолчанию правый нижний угол).
 
         Returns:
-            None
+            tuple: Начальная и конечная клетки в координатах сетки.
+
+        Raises:
+            ValueError: Если позиция вне лабиринта или находится в стене.
         """
         if start is None:
             start = (0, 0)
         if end is None:
             end = (self.height - 1, self.width - 1)
-        # Преобразование стартовой и конечной позиции в реальные координаты
-        start_real = (2 * start[0] + 1, 2 * start[1] + 1)
-        end_real = (2 * end[0] + 1, 2 * end[1] + 1)
+        # Преобразование стартовой и конечной позиции в реальные координаты с проверкой
+        cols = self.grid.cols
+        start_real = divmod(self.grid.cell_index(start, 'стартовая'), cols)
+        end_real = divmod(self.grid.cell_index(end, 'конечная'), cols)
+        return start_real, end_real
+
+    def build_path_index(self) -> PathIndex:
+        """
+        Строит индекс для быстрых запросов путей по текущему лабиринту.
+
+        Returns:
+            PathIndex: Индекс с методами path_length, path, query_lengths и query_paths.
+        """
+        return PathIndex(self.grid)
 
-        # Размеры лабиринта
-        rows, cols = len(self.list_maze), len(self.list_maze[0])
+    def build_junction_graph(self, keep: List[Tuple[int, int]] = None) -> JunctionGraph:
+        """
+        Строит сжатый граф развилок и коридоров для повторных поисков пути.
 
-        # Проверяем, что стартовая и конечная позиции корректны
-        if not (0 <= start_real[0] < rows and 0 <= start_real[1] < cols):
-            raise ValueError("Недопустимая стартовая позиция.")
-        if not (0 <= end_real[0] < rows and 0 <= end_real[1] < cols):
-            raise ValueError("Недопустимая конечная позиция.")
-        if self.list_maze[start_real[0]][start_real[1]] == '0' or self.list_maze[end_real[0]][end_real[1]] == '0':
-            raise ValueError("Стартовая или конечная позиция находится в стене.")
+        Args:
+            keep (List[Tuple[int, int]]): Позиции лабиринта, между которыми будут запросы.
+                Если заданы, перед построением тупики заполняются (сохраняя эти позиции),
+                и граф содержит только проходы между ними и циклы.
 
-        # Стек для DFS
-        stack = deque()
-        stack.append((start_real, []))  # Добавляем начальную позицию и пустой путь
+        Returns:
+            JunctionGraph: Граф с методами solve, path и query_paths.
+        """
+        grid = self.grid
+        if keep is not None:
+            grid = fill_dead_ends(grid, [(2 * row + 1, 2 * col + 1) for row, col in keep])
+        return JunctionGraph(grid)
 
-        # Множество для отслеживания посещённых клеток
-        visited = set()
+    def print_solution(self, mode: str = 'text') -> None:
+        """
+        Отображение решения в лабиринте: путь накладывается на кадр, сетка не изменяется.
 
-        # DFS
-        while stack:
-            current, path = stack.pop()
-            if current in visited:
-                continue
-
-            visited.add(current)
-            path = path + [current]
-
-            # Если достигли конечной точки, сохраняем путь и выходим
-            if current == end_real:
-                self.list_way = path
-                return path
-
-            # Проверяем соседей (вверх, вниз, влево, вправо)
-            neighbors = [
-                (current[0] - 1, current[1]),  # вверх
-                (current[0] + 1, current[1]),  # вниз
-                (current[0], current[1] - 1),  # влево
-                (current[0], current[1] + 1),  # вправо
-            ]
-
-            for neighbor in neighbors:
-                n_row, n_col = neighbor
-                if (
-                        0 <= n_row < rows and
-                        0 <= n_col < cols and
-                        self.list_maze[n_row][n_col] == '1' and
-                        neighbor not in visited
-                ):
-                    stack.append((neighbor, path))
-
-        # Если выход из цикла, пути не существует
-        self.list_way = []
+        :param mode: 'text' - путь отмечается '.', или 'half' - полублоки, путь выделяется цветом
+        """
+        write_frame(self.grid, self.list_way, mode)
 
-    def print_solution(self) -> None:
-        """Отображение решения в лабиринте."""
+    def solution_grid(self) -> Grid:
+        """Копия сетки, в которой клетки пути list_way отмечены символом '.'."""
+        grid = self.grid.copy()
         for y, x in self.list_way:
-            if self.list_maze[y][x] == '1':
-                self.list_maze[y][x] = '.'
-        self.print_maze()
+            if grid.get(y, x) == PASSAGE:
+                grid.set(y, x, PATH)
+        return grid
 
     def load_maze_from_file(self, file_path: str) -> List:
         """
@@ -148,29 +209,17 @@ class Maze:
         Raises:
             ValueError: Если строки имеют разную длину или содержат символы, отличные от '0' и '1'.
         """
-        maze = []
-        with open(file_path, 'r') as file:
-            for line in file:
-                stripped_line = line.strip()
-                if not stripped_line:  # Пропускаем пустые строки
-                    continue
-
-                # Проверка на допустимые символы
-                if not all(char in '01' for char in stripped_line):
-                    raise ValueError(f"Строка содержит недопустимые символы: {stripped_line}")
-
-                maze.append(list(stripped_line))
-
-        # Проверка на одинаковую длину строк
-        if len(set(len(row) for row in maze)) > 1:
-            raise ValueError("Строки в лабиринте имеют разное количество символов.")
+        with open(file_path, 'rb') as file:
+            if os.fstat(file.fileno()).st_size:
+                with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                    maze = Grid.from_text(buffer)
+            else:
+                maze = Grid(0, 0)
 
         if maze_check(maze):
-            self.list_maze = maze
-            self.height = (len(self.list_maze) - 1) // 2
-            self.width = (len(self.list_maze[0]) - 1) // 2
+            self._set_grid(maze)
 
-        return maze
+        return self.list_maze
 
     def save_maze_to_file(self, file_path: str, way: bool = False) -> None:
         """
@@ -178,110 +227,98 @@ class Maze:
 
         Args:
             file_path (str): Путь к файлу для сохранения лабиринта.
-            way (bool): решение лабиринта
+            way (bool): Отметить решение лабиринта символами '.' (сетка лабиринта не изменяется).
+        """
+        grid = self.solution_grid() if way and self.list_way else self.grid
+        write_rows(grid.iter_rows(), file_path)
+
+    def save_maze_to_binary(self, file_path: str, way: bool = False, compression: str = 'none') -> None:
+        """
+        Сохраняет лабиринт в двоичный файл .mzb (клетки упакованы по битам).
+
+        Args:
+            file_path (str): Путь к файлу для сохранения лабиринта.
+            way (bool): Сохранить также решение лабиринта.
+            compression (str): Сжатие данных клеток: 'none', 'zlib' или 'lzma'.
+        """
+        mzb.save(file_path, self.grid, self.algorithm, self.seed,
+                 self.list_way if way else [], compression)
+
+    def load_maze_from_binary(self, file_path: str) -> None:
         """
-        if way and len(self.list_way) > 0:
-            for y in range(self.height):
-                for x in range(self.width):
-                    if (y, x) in self.list_way:
-                        self.list_maze[y][x] = '.'
-        with open(file_path, 'w') as file:
-            for row in self.list_maze:
-                file.write(''.join(row) + '\n')  # Преобразуем каждую строку в строку текста
-
-    def save_maze_as_image(self, output_path: str, cell_size: int = 20) -> None:
+        Загружает лабиринт из двоичного файла .mzb вместе с алгоритмом, зерном и решением.
+
+        Raises:
+            ValueError: Если файл поврежден или лабиринт некорректен.
         """
-        Сохраняет лабиринт в виде изображения.
+        maze_file = mzb.load(file_path)
+        if maze_check(maze_file.grid):
+            self._set_grid(maze_file.grid)
+            self.algorithm = maze_file.algorithm
+            self.seed = maze_file.seed
+            self.list_way = maze_file.path
+
+    def save_maze_as_image(self, output_path: str, cell_size: int = 20, compress_level: int = None) -> None:
+        """
+        Сохраняет лабиринт в виде изображения (см. maze_image.save_image).
+        Модуль изображений и Pillow загружаются только при первом вызове.
 
         Args:
             output_path (str): Путь для сохранения изображения.
             cell_size (int): Размер клетки в пикселях.
+            compress_level (int): Уровень сжатия PNG от 0 (быстрее) до 9 (меньше файл).
+
+        Raises:
+            ImportError: Если Pillow не установлен.
         """
-        # Размеры изображения
-        rows = len(self.list_maze)
-        cols = len(self.list_maze[0])
-        img_width = cols * cell_size
-        img_height = rows * cell_size
-
-        # Создаем пустое изображение
-        img = Image.new('RGB', (img_width, img_height), 'white')
-        pixels = img.load()
-
-        # Заполняем изображение в соответствии с лабиринтом
-        for i in range(rows):
-            for j in range(cols):
-                if (i, j) in self.list_way:
-                    color = (255, 100, 200)
-                else:
-                    color = (0, 0, 0) if self.list_maze[i][j] == '0' else (255, 255, 255)  # Черный или белый
-                for x in range(cell_size):
-                    for y in range(cell_size):
-                        pixels[j * cell_size + x, i * cell_size + y] = color
-
-        # Сохранение изображения
-        img.save(output_path)
-
-    def load_maze_from_image(self, image_path: str, cell_size: int = 20) -> None:
+        import maze_image
+        maze_image.save_image(self.grid, self.list_way, output_path, cell_size, compress_level)
+
+    def load_maze_from_image(self, image_path: str, cell_size: int = None) -> None:
         """
-        Импортирует лабиринт из изображения.
+        Импортирует лабиринт из изображения (см. maze_image.load_image).
+        Модуль изображений и Pillow загружаются только при первом вызове.
 
         Args:
             image_path (str): Путь к изображению лабиринта.
-            cell_size (int): Размер клетки в пикселях.
+            cell_size (int): Размер клетки в пикселях (None - определить по внешней стене).
 
-        Returns:
-            list: Двумерный массив, представляющий лабиринт.
+        Raises:
+            ValueError: Если размер клетки не удалось определить или лабиринт некорректен.
+            ImportError: Если Pillow не установлен.
         """
-        # Открыть изображение и перевести в черно-белый режим
-        img = Image.open(image_path).convert('L')  # Переводим в grayscale
-
-        # Получаем размеры лабиринта в клетках
-        rows = img.height // cell_size
-        cols = img.width // cell_size
-
-        # Создаем пустой массив для лабиринта
-        maze = []
-
-        for i in range(rows):
-            row = []
-            for j in range(cols):
-                # Определяем верхний левый угол клетки
-                top_left_x = j * cell_size
-                top_left_y = i * cell_size
-
-                # Проверяем средний пиксель клетки для определения ее цвета
-                mid_x = top_left_x + cell_size // 2
-                mid_y = top_left_y + cell_size // 2
-                color = img.getpixel((mid_x, mid_y))
-
-                # Черный цвет (0-127) — стена, белый (128-255) — проход
-                row.append('0' if color < 128 else '1')
-            maze.append(row)
+        import maze_image
+        maze = maze_image.load_image(image_path, cell_size)
         if maze_check(maze):
-            self.list_maze = maze
-            self.height = (len(self.list_maze) - 1) // 2
-            self.width = (len(self.list_maze[0]) - 1) // 2
+            self._set_grid(maze)
 
-    def build_right_walls(self):
-        pass
+    def _set_grid(self, grid: Grid) -> None:
+        """Устанавливает новую сетку и пересчитывает размеры лабиринта в клетках."""
+        self.grid = grid
+        self.height = (grid.rows - 1) // 2
+        self.width = (grid.cols - 1) // 2
 
-    def build_bottom_walls(self):
-        pass
 
-    def check_walls(self):
-        pass
+# Таблицы перевода клеток в битовые маски: байт 1 для прохода (стены) и 0 для остальных клеток
+_PASSAGE_MASK = bytes(1 if code == PASSAGE else 0 for code in range(256))
+_WALL_MASK = bytes(1 if code == WALL else 0 for code in range(256))
+# Сколько байт сетки обрабатывается за раз при поиске замурованных клеток
+_CHECK_BAND_BYTES = 1 << 24
 
 
-def maze_check(maze: List) -> bool:
+def maze_check(maze: Union[List, Grid], report_all: bool = False, check_connectivity: bool = False) -> bool:
     """
     Проверяет корректность лабиринта.
 
     Условия:
     1. Лабиринт должен быть окружён стенами (значениями '0').
     2. Внутренняя клетка '1' не должна быть полностью окружена стенами.
+    3. (если check_connectivity) Каждая клетка '1' достижима из клетки (1, 1).
 
     Args:
-        maze (list): Двумерный массив лабиринта.
+        maze (list | Grid): Двумерный массив лабиринта или сетка.
+        report_all (bool): Перечислить в ошибке все замурованные клетки, а не только первую.
+        check_connectivity (bool): Проверить достижимость всех проходов из (1, 1).
 
     Returns:
         bool: True, если лабиринт корректный, иначе False.
@@ -289,32 +326,101 @@ def maze_check(maze: List) -> bool:
     Raises:
         ValueError: Если лабиринт некорректен.
     """
-    rows = len(maze)
-    cols = len(maze[0])
+    grid = maze if isinstance(maze, Grid) else Grid.from_rows(maze)
+    rows, cols, data = grid.rows, grid.cols, grid.data
+    if not rows or not cols:
+        raise ValueError("Лабиринт пуст.")
 
     # Проверка, что лабиринт окружён стенами
-    if any(cell != '0' for cell in maze[0] + maze[-1]):  # Верхняя и нижняя границы
+    wall_row = bytes([WALL]) * cols
+    if data[:cols] != wall_row or data[-cols:] != wall_row:  # Верхняя и нижняя границы
         raise ValueError("Лабиринт должен быть окружён стенами сверху и снизу.")
-    if any(row[0] != '0' or row[-1] != '0' for row in maze):  # Левые и правые границы
+    if data[0::cols].count(WALL) != rows or data[cols - 1::cols].count(WALL) != rows:  # Левые и правые границы
         raise ValueError("Лабиринт должен быть окружён стенами слева и справа.")
 
     # Проверка, что ни одна внутренняя клетка '1' не окружена стенами
-    for i in range(1, rows - 1):  # Пропускаем границы
-        for j in range(1, cols - 1):
-            if maze[i][j] == '1':
-                # Проверяем соседей (верх, низ, лево, право)
-                neighbors = [
-                    maze[i - 1][j],  # Верх
-                    maze[i + 1][j],  # Низ
-                    maze[i][j - 1],  # Лево
-                    maze[i][j + 1],  # Право
-                ]
-                if all(neighbor == '0' for neighbor in neighbors):
-                    raise ValueError(f"Клетка {i, j} окружена стенами со всех сторон.")
+    enclosed = find_enclosed_cells(grid, limit=None if report_all else 1)
+    if enclosed and report_all:
+        raise ValueError(f"Клетки {', '.join(map(str, enclosed))} окружены стенами со всех сторон.")
+    if enclosed:
+        raise ValueError(f"Клетка {enclosed[0]} окружена стенами со всех сторон.")
+
+    if check_connectivity:
+        unreachable = find_unreachable_cell(grid)
+        if unreachable is not None:
+            raise ValueError(f"Клетка {unreachable} недостижима из клетки (1, 1).")
 
     return True
 
 
+def find_enclosed_cells(grid: Grid, limit: int = None) -> List[Tuple[int, int]]:
+    """
+    Находит внутренние клетки '1', у которых все четыре соседа - стены.
+
+    Сетка переводится в целое число, где каждой клетке соответствует байт 0/1, и соседи
+    сравниваются сдвигами этого числа на 1 клетку и на строку. Сетка обрабатывается
+    полосами строк, чтобы промежуточные числа не превышали _CHECK_BAND_BYTES.
+    Считается, что внешние стены уже проверены.
+
+    Args:
+        grid (Grid): Сетка лабиринта.
+        limit (int): Максимальное количество найденных клеток (None - все).
+
+    Returns:
+        list: Координаты (строка, столбец) замурованных клеток по порядку обхода.
+    """
+    rows, cols, data = grid.rows, grid.cols, grid.data
+    band_rows = max(1, _CHECK_BAND_BYTES // cols)
+    cells = []
+    for first in range(1, rows - 1, band_rows):
+        last = min(first + band_rows, rows - 1)
+        # Полоса включает по строке соседей сверху и снизу; клетки проверяются только внутри полосы
+        band = data[(first - 1) * cols:(last + 1) * cols]
+        passages = bytearray(band.translate(_PASSAGE_MASK))
+        passages[:cols] = bytes(cols)
+        passages[-cols:] = bytes(cols)
+        walls = int.from_bytes(band.translate(_WALL_MASK), 'big')
+        shift = 8 * cols
+        enclosed = (int.from_bytes(passages, 'big') & (walls << 8) & (walls >> 8) &
+                    (walls << shift) & (walls >> shift))
+        if not enclosed:
+            continue
+        found = enclosed.to_bytes(len(band), 'big')
+        index = found.find(1)
+        while index >= 0:
+            cells.append((first - 1 + index // cols, index % cols))
+            if limit is not None and len(cells) >= limit:
+                return cells
+            index = found.find(1, index + 1)
+    return cells
+
+
+def find_unreachable_cell(grid: Grid) -> Union[Tuple[int, int], None]:
+    """
+    Проверяет связность лабиринта заливкой из клетки (1, 1) за линейное время.
+
+    Returns:
+        tuple | None: Первая клетка '1', недостижимая из (1, 1), или None, если все достижимы.
+    """
+    cols = grid.cols
+    marks = bytearray(grid.data)
+    start = cols + 1
+    if len(marks) > start and marks[start] == PASSAGE:
+        reached = ord('2')
+        offsets = (-cols, cols, -1, 1)
+        marks[start] = reached
+        stack = [start]
+        while stack:
+            current = stack.pop()
+            for offset in offsets:
+                neighbor = current + offset
+                if marks[neighbor] == PASSAGE:
+                    marks[neighbor] = reached
+                    stack.append(neighbor)
+    index = marks.find(PASSAGE)
+    return None if index < 0 else (index // cols, index % cols)
+
+
 if __name__ == '__main__':
     maxe = Maze(3, 3)
     maxe.load_maze_from_image('maze.png')
@@ -0,0 +1,153 @@
+"""
+Импорт и экспорт лабиринтов в изображения (Pillow).
+
+Модуль импортируется только при работе с изображениями, поэтому операции
+с текстовыми и двоичными файлами не требуют Pillow и не тратят время на его загрузку.
+"""
+import math
+import os
+from typing import Iterable, Tuple
+
+try:
+    from PIL import Image
+except ImportError as error:
+    raise ImportError("Для работы с изображениями нужен пакет Pillow (pip install pillow).") from error
+
+from grid import Grid, PASSAGE, WALL
+
+# Палитра изображения лабиринта и перевод клеток сетки в номера цветов палитры
+_IMAGE_PALETTE = [0, 0, 0, 255, 255, 255, 255, 100, 200]
+_IMAGE_PALETTE_INDEX = bytes(0 if code == WALL else 1 for code in range(256))
+# Порог яркости при импорте: сразу в байты сетки и в черно-белую маску для поиска проходов
+_IMAGE_THRESHOLD = [WALL] * 128 + [PASSAGE] * 128
+_LIGHT_THRESHOLD = [0] * 128 + [255] * 128
+# Сколько пикселей изображения обрабатывается за раз при импорте
+_IMAGE_BAND_PIXELS = 1 << 26
+# Допустимый размер импортируемого изображения (у Pillow по умолчанию около 89 млн пикселей)
+MAX_IMAGE_PIXELS = 1 << 31
+
+
+def save_image(grid: Grid, path: Iterable[Tuple[int, int]], output_path: str, cell_size: int = 20,
+               compress_level: int = None) -> None:
+    """
+    Сохраняет сетку лабиринта в виде изображения.
+
+    Изображение строится в палитровом режиме по одному пикселю на клетку прямо из
+    байтов сетки и затем увеличивается до cell_size методом ближайшего соседа.
+
+    Args:
+        grid (Grid): Сетка лабиринта.
+        path (Iterable): Клетки пути в координатах сетки (отмечаются розовым).
+        output_path (str): Путь для сохранения изображения.
+        cell_size (int): Размер клетки в пикселях.
+        compress_level (int): Уровень сжатия PNG от 0 (быстрее) до 9 (меньше файл).
+
+    Raises:
+        ValueError: Если размер клетки не положительное целое число.
+    """
+    _check_cell_size(cell_size)
+    rows, cols = grid.rows, grid.cols
+
+    # Номера цветов палитры: стена - черный, проход - белый, путь - розовый
+    indices = bytearray(grid.data.translate(_IMAGE_PALETTE_INDEX))
+    for i, j in set(path):
+        if 0 <= i < rows and 0 <= j < cols:
+            indices[i * cols + j] = 2
+    img = Image.frombytes('P', (cols, rows), bytes(indices))
+    img.putpalette(_IMAGE_PALETTE)
+    img = img.resize((cols * cell_size, rows * cell_size), Image.NEAREST)
+
+    # Сохранение изображения
+    ext = os.path.splitext(output_path)[1].lower()
+    if ext in ('.jpg', '.jpeg'):
+        img = img.convert('RGB')
+    options = {}
+    if compress_level is not None and ext == '.png':
+        options['compress_level'] = compress_level
+    img.save(output_path, **options)
+
+
+def _check_cell_size(cell_size: int) -> None:
+    """Проверяет, что размер клетки - положительное целое число."""
+    if not isinstance(cell_size, int) or isinstance(cell_size, bool) or cell_size < 1:
+        raise ValueError(f"Размер клетки должен быть положительным целым числом, получено {cell_size!r}.")
+
+
+def load_image(image_path: str, cell_size: int = None) -> Grid:
+    """
+    Читает сетку лабиринта из изображения.
+
+    Цвет клетки берется из ее центрального пикселя: центры всех клеток выбираются
+    уменьшением изображения методом ближайшего соседа, а порог применяется таблицей
+    Image.point, которая сразу дает байты '0'/'1' сетки. Изображение обрабатывается
+    полосами строк клеток, поэтому кроме самого изображения в памяти только одна полоса.
+
+    Args:
+        image_path (str): Путь к изображению лабиринта.
+        cell_size (int): Размер клетки в пикселях (None - определить по внешней стене).
+
+    Returns:
+        Grid: Сетка лабиринта (без проверки корректности).
+
+    Raises:
+        ValueError: Если размер клетки не положительный или его не удалось определить.
+    """
+    if cell_size is not None:
+        _check_cell_size(cell_size)
+    with _open_image(image_path) as img:
+        # Для JPEG декодируем сразу в оттенки серого, без промежуточной RGB-копии
+        img.draft('L', img.size)
+        if cell_size is None:
+            cell_size = detect_cell_size(img)
+
+        # Получаем размеры лабиринта в клетках
+        rows = img.height // cell_size
+        cols = img.width // cell_size
+
+        data = bytearray()
+        band_rows = max(1, _IMAGE_BAND_PIXELS // max(1, img.width * cell_size))
+        for first in range(0, rows, band_rows):
+            last = min(rows, first + band_rows)
+            box = (0, first * cell_size, cols * cell_size, last * cell_size)
+            # Ближайший сосед при уменьшении в cell_size раз берет средний пиксель клетки
+            band = img.resize((cols, last - first), Image.NEAREST, box=box)
+            # Черный цвет (0-127) — стена, белый (128-255) — проход
+            data += band.convert('L').point(_IMAGE_THRESHOLD).tobytes()
+    return Grid(rows, cols, data)
+
+
+def _open_image(image_path: str) -> Image.Image:
+    """Открывает изображение, допуская размер до MAX_IMAGE_PIXELS пикселей."""
+    limit = Image.MAX_IMAGE_PIXELS
+    Image.MAX_IMAGE_PIXELS = MAX_IMAGE_PIXELS
+    try:
+        return Image.open(image_path)
+    finally:
+        Image.MAX_IMAGE_PIXELS = limit
+
+
+def detect_cell_size(img: Image.Image) -> int:
+    """
+    Определяет размер клетки по толщине внешней стены изображения лабиринта.
+
+    Первая строка и первый столбец сетки - стены, поэтому первые светлые пиксели
+    сверху и слева находятся на расстоянии, кратном размеру клетки. Просматривается
+    верхняя полоса изображения, которая увеличивается, пока в ней нет светлых пикселей.
+
+    Raises:
+        ValueError: Если размер клетки определить не удалось.
+    """
+    probe = min(img.height, 1024)
+    while True:
+        band = img.crop((0, 0, img.width, probe)).convert('L').point(_LIGHT_THRESHOLD)
+        bbox = band.getbbox()
+        if bbox is not None or probe == img.height:
+            break
+        probe = min(img.height, probe * 2)
+    if bbox is None:
+        raise ValueError("Не удалось определить размер клетки: на изображении нет проходов.")
+    left, top = bbox[0], bbox[1]
+    cell_size = math.gcd(left, top, img.width, img.height)
+    if not cell_size:
+        raise ValueError("Не удалось определить размер клетки: изображение не окружено стенами.")
+    return cell_size
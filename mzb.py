@@ -0,0 +1,162 @@
+"""
+Двоичный формат лабиринта .mzb.
+
+Файл состоит из заголовка и упакованных по битам клеток сетки (1 - проход, 0 - стена),
+построчно, старший бит первым. Заголовок (little-endian):
+
+    magic      4 байта  b'MZB1'
+    version    u8       версия формата (1)
+    codec      u8       сжатие данных клеток: 0 - нет, 1 - zlib, 2 - lzma
+    flags      u8       бит 0 - задано зерно, бит 1 - сохранен путь
+    reserved   u8
+    rows       u32      строк сетки
+    cols       u32      столбцов сетки
+    seed       i64      зерно генерации (0, если не задано)
+    algorithm  u16 + utf-8 строка (имя алгоритма генерации, может быть пустым)
+    path       u32 + пары u32 (строка, столбец) в координатах сетки
+    payload    u64 + данные клеток
+"""
+import lzma
+import mmap
+import os
+import struct
+import zlib
+from typing import List, NamedTuple, Optional, Tuple
+
+from grid import Grid
+
+MAGIC = b'MZB1'
+VERSION = 1
+CODECS = {'none': 0, 'zlib': 1, 'lzma': 2}
+
+_HEADER = struct.Struct('<4sBBBxIIq')
+_LENGTH16 = struct.Struct('<H')
+_LENGTH32 = struct.Struct('<I')
+_LENGTH64 = struct.Struct('<Q')
+_FLAG_SEED = 1
+_FLAG_PATH = 2
+# Все клетки, кроме стен ('0'), упаковываются как проходы (например, отметки пути '.')
+_BITS_TABLE = bytes(ord('0') if code == ord('0') else ord('1') for code in range(256))
+
+
+class MazeFile(NamedTuple):
+    """Содержимое файла .mzb."""
+    grid: Grid
+    algorithm: Optional[str]
+    seed: Optional[int]
+    path: List[Tuple[int, int]]
+
+
+def pack_cells(grid: Grid) -> bytes:
+    """Упаковывает клетки сетки по битам (8 клеток на байт, старший бит первым)."""
+    count = len(grid.data)
+    if not count:
+        return b''
+    padding = -count % 8
+    value = int(grid.data.translate(_BITS_TABLE), 2) << padding
+    return value.to_bytes((count + padding) // 8, 'big')
+
+
+def unpack_cells(payload, rows: int, cols: int) -> Grid:
+    """Распаковывает клетки, упакованные pack_cells, обратно в сетку '0'/'1'."""
+    count = rows * cols
+    if len(payload) != (count + 7) // 8:
+        raise ValueError("Неверный формат файла лабиринта: размер данных не совпадает с размером сетки.")
+    if not count:
+        return Grid(rows, cols)
+    value = int.from_bytes(payload, 'big') >> (-count % 8)
+    return Grid(rows, cols, format(value, 'b').zfill(count).encode())
+
+
+def save(file_path: str, grid: Grid, algorithm: str = None, seed: int = None,
+         path: List[Tuple[int, int]] = (), compression: str = 'none') -> int:
+    """
+    Сохраняет сетку в файл .mzb.
+
+    Args:
+        file_path (str): Путь к файлу.
+        grid (Grid): Сетка лабиринта.
+        algorithm (str): Алгоритм генерации.
+        seed (int): Зерно генерации.
+        path (list): Путь решения в координатах сетки.
+        compression (str): 'none', 'zlib' или 'lzma'.
+
+    Returns:
+        int: Размер файла в байтах.
+
+    Raises:
+        ValueError: Если метод сжатия неизвестен или зерно не помещается в 64 бита со знаком.
+    """
+    if compression not in CODECS:
+        raise ValueError(f"Неизвестный метод сжатия: {compression}. Доступны: {', '.join(CODECS)}.")
+    if seed is not None and not -(1 << 63) <= seed < 1 << 63:
+        raise ValueError("Зерно не помещается в файл .mzb: допустимы числа от -2**63 до 2**63 - 1.")
+    payload = pack_cells(grid)
+    if compression == 'zlib':
+        payload = zlib.compress(payload)
+    elif compression == 'lzma':
+        payload = lzma.compress(payload)
+
+    flags = (_FLAG_SEED if seed is not None else 0) | (_FLAG_PATH if path else 0)
+    name = (algorithm or '').encode()
+    parts = [
+        _HEADER.pack(MAGIC, VERSION, CODECS[compression], flags, grid.rows, grid.cols, seed or 0),
+        _LENGTH16.pack(len(name)), name,
+        _LENGTH32.pack(len(path)), struct.pack(f'<{2 * len(path)}I', *(v for point in path for v in point)),
+        _LENGTH64.pack(len(payload)), payload,
+    ]
+    with open(file_path, 'wb') as file:
+        return sum(file.write(part) for part in parts)
+
+
+def load(file_path: str) -> MazeFile:
+    """
+    Загружает файл .mzb через mmap: заголовок читается struct.unpack_from, а несжатые
+    данные клеток распаковываются прямо из отображенной памяти без промежуточного чтения.
+
+    Raises:
+        ValueError: Если файл не является корректным файлом .mzb.
+    """
+    with open(file_path, 'rb') as file:
+        if not os.fstat(file.fileno()).st_size:
+            raise ValueError("Неверный формат файла лабиринта: файл пуст.")
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            try:
+                return _parse(buffer)
+            except struct.error:
+                raise ValueError("Неверный формат файла лабиринта: файл обрезан.") from None
+
+
+def _parse(buffer: mmap.mmap) -> MazeFile:
+    """Разбирает содержимое файла .mzb."""
+    magic, version, codec, flags, rows, cols, seed = _HEADER.unpack_from(buffer, 0)
+    if magic != MAGIC:
+        raise ValueError("Неверный формат файла лабиринта: это не файл .mzb.")
+    if version != VERSION:
+        raise ValueError(f"Неподдерживаемая версия файла лабиринта: {version}.")
+    offset = _HEADER.size
+    (name_length,) = _LENGTH16.unpack_from(buffer, offset)
+    offset += _LENGTH16.size
+    algorithm = buffer[offset:offset + name_length].decode()
+    offset += name_length
+    (path_length,) = _LENGTH32.unpack_from(buffer, offset)
+    offset += _LENGTH32.size
+    values = struct.unpack_from(f'<{2 * path_length}I', buffer, offset)
+    path = list(zip(values[0::2], values[1::2]))
+    offset += 8 * path_length
+    (payload_length,) = _LENGTH64.unpack_from(buffer, offset)
+    offset += _LENGTH64.size
+    if offset + payload_length > len(buffer):
+        raise ValueError("Неверный формат файла лабиринта: файл обрезан.")
+
+    with memoryview(buffer)[offset:offset + payload_length] as payload:
+        if codec == CODECS['zlib']:
+            grid = unpack_cells(zlib.decompress(payload), rows, cols)
+        elif codec == CODECS['lzma']:
+            grid = unpack_cells(lzma.decompress(payload), rows, cols)
+        elif codec == CODECS['none']:
+            grid = unpack_cells(payload, rows, cols)
+        else:
+            raise ValueError(f"Неизвестный метод сжатия в файле лабиринта: {codec}.")
+    return MazeFile(grid, algorithm or None, seed if flags & _FLAG_SEED else None,
+                    path if flags & _FLAG_PATH else [])
@@ -0,0 +1,91 @@
+"""
+Параллельная генерация одного большого лабиринта горизонтальными полосами.
+
+Алгоритмы, у которых строки лабиринта генерируются независимо (binary_tree, sidewinder),
+делят лабиринт на полосы фиксированной высоты. Каждая полоса генерируется в процессе
+пула со своим зерном, выведенным из базового зерна и номера полосы, и записывается
+прямо в общий буфер multiprocessing.shared_memory. Поэтому результат зависит только
+от зерна и размера полосы, но не от количества процессов и порядка их выполнения.
+"""
+import hashlib
+import random
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import List, Tuple
+
+from generators import GENERATORS
+from grid import Grid
+
+# Высота полосы в строках лабиринта; от нее зависит результат, поэтому она не зависит от числа процессов
+STRIP_ROWS = 256
+
+
+def strip_seed(seed: int, index: int) -> int:
+    """Зерно полосы index, выведенное из базового зерна."""
+    digest = hashlib.blake2b(f'{seed}:{index}'.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, 'big')
+
+
+def _generate_strip(memory_name: str, algorithm: str, height: int, width: int,
+                    first: int, last: int, seed: int) -> None:
+    """Генерирует строки лабиринта first..last-1 в общий буфер сетки."""
+    memory = shared_memory.SharedMemory(name=memory_name)
+    try:
+        cols = 2 * width + 1
+        offset = (2 * first + 1) * cols
+        rows = GENERATORS[algorithm].strip(height, width, first, last, random.Random(seed))
+        for row in rows:
+            memory.buf[offset:offset + cols] = row
+            offset += cols
+    finally:
+        memory.close()
+
+
+def generate_parallel(height: int, width: int, algorithm: str = 'binary_tree', seed: int = None,
+                      workers: int = None, strip_rows: int = STRIP_ROWS) -> Grid:
+    """
+    Генерирует лабиринт полосами в пуле процессов.
+
+    Лабиринт отличается от созданного Maze.generate_maze с тем же зерном (у каждой полосы
+    свой генератор случайных чисел), но одинаков при любом количестве процессов.
+
+    Args:
+        height (int): Высота лабиринта в клетках.
+        width (int): Ширина лабиринта в клетках.
+        algorithm (str): 'binary_tree' или 'sidewinder'.
+        seed (int): Базовое зерно (None - случайное).
+        workers (int): Количество процессов (1 - без пула, None - число ядер).
+        strip_rows (int): Высота полосы в строках лабиринта.
+
+    Returns:
+        Grid: Сетка лабиринта.
+
+    Raises:
+        ValueError: Если алгоритм не поддерживает генерацию полосами.
+    """
+    engine = GENERATORS.get(algorithm)
+    if engine is None or engine.strip is None:
+        supported = ', '.join(name for name, item in GENERATORS.items() if item.strip is not None)
+        raise ValueError(f"Алгоритм {algorithm} не поддерживает параллельную генерацию. Доступны: {supported}.")
+    if seed is None:
+        seed = random.randrange(1 << 63)
+    rows, cols = 2 * height + 1, 2 * width + 1
+    strips: List[Tuple[int, int]] = [(first, min(height, first + strip_rows))
+                                     for first in range(0, height, max(1, strip_rows))]
+    memory = shared_memory.SharedMemory(create=True, size=rows * cols)
+    try:
+        # Верхняя стена; остальные строки записывают полосы
+        memory.buf[:cols] = b'0' * cols
+        tasks = [(memory.name, algorithm, height, width, first, last, strip_seed(seed, index))
+                 for index, (first, last) in enumerate(strips)]
+        if workers == 1:
+            for task in tasks:
+                _generate_strip(*task)
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                for _ in executor.map(_generate_strip, *zip(*tasks)):
+                    pass
+        return Grid(rows, cols, memory.buf[:rows * cols])
+    finally:
+        memory.close()
+        memory.unlink()
@@ -0,0 +1,153 @@
+from array import array
+from collections import deque
+from typing import List, Sequence, Tuple
+
+from grid import Grid, PASSAGE
+from solver import is_enclosed, solve
+
+
+class PathIndex:
+    """
+    Индекс для быстрых запросов путей в идеальном лабиринте (остовном дереве проходов).
+
+    При построении выполняется один BFS от корневой клетки: для каждой достижимой клетки
+    запоминаются предок и глубина, а по ним строятся таблицы двоичного подъема для
+    поиска наименьшего общего предка (LCA). После этого длина пути между двумя клетками
+    находится за O(log n), а сам путь - за O(длины пути).
+
+    Если в лабиринте есть циклы (например, импортированный неидеальный лабиринт) или
+    клетка не достижима из корня, запрос выполняется обычным поиском в ширину.
+    Индекс - снимок сетки: после изменения лабиринта его нужно построить заново.
+    """
+
+    def __init__(self, grid: Grid, root: Tuple[int, int] = (1, 1)) -> None:
+        """
+        :param grid: сетка лабиринта
+        :param root: корневая клетка в координатах сетки (если это стена - первый проход сетки)
+        :raises ValueError: если сетка не окружена стенами
+        """
+        if not is_enclosed(grid):
+            raise ValueError("Лабиринт должен быть окружён стенами.")
+        self.grid = grid
+        cols, data = grid.cols, grid.data
+        root_index = root[0] * cols + root[1]
+        if not (0 <= root_index < len(data) and data[root_index] == PASSAGE):
+            root_index = data.find(PASSAGE)
+
+        # Вершины нумеруются в порядке обхода BFS: nodes[id] - плоский индекс клетки
+        self.node_ids = array('i', [-1]) * len(data)
+        self.nodes = array('i')
+        parents = array('i')
+        self.depths = array('i')
+        self.is_tree = True
+        if root_index >= 0:
+            self._bfs(root_index, parents)
+
+        # up[k][v] - предок вершины v на 2**k уровней выше (корень - сам себе предок)
+        self.up = [parents]
+        max_depth = max(self.depths, default=0)
+        if self.is_tree:
+            for _ in range(max_depth.bit_length() - 1):
+                previous = self.up[-1]
+                self.up.append(array('i', [previous[parent] for parent in previous]))
+
+    def _bfs(self, root_index: int, parents: array) -> None:
+        """Обход проходов от корня с подсчетом глубин и проверкой на циклы."""
+        cols, data = self.grid.cols, self.grid.data
+        offsets = (-cols, cols, -1, 1)
+        node_ids, nodes, depths = self.node_ids, self.nodes, self.depths
+        node_ids[root_index] = 0
+        nodes.append(root_index)
+        parents.append(0)
+        depths.append(0)
+        queue = deque([root_index])
+        while queue:
+            current = queue.popleft()
+            current_id = node_ids[current]
+            parent_index = nodes[parents[current_id]]
+            for offset in offsets:
+                neighbor = current + offset
+                if data[neighbor] != PASSAGE:
+                    continue
+                if node_ids[neighbor] >= 0:
+                    # Уже посещенный сосед, не являющийся предком, означает цикл
+                    if neighbor != parent_index:
+                        self.is_tree = False
+                    continue
+                node_ids[neighbor] = len(nodes)
+                nodes.append(neighbor)
+                parents.append(current_id)
+                depths.append(depths[current_id] + 1)
+                queue.append(neighbor)
+
+    def _indexed(self, start: int, end: int) -> bool:
+        """Можно ли ответить на запрос по дереву (иначе - обычный поиск)."""
+        return self.is_tree and self.node_ids[start] >= 0 and self.node_ids[end] >= 0
+
+    def _lca(self, a: int, b: int) -> int:
+        """Наименьший общий предок вершин a и b двоичным подъемом."""
+        depths, up = self.depths, self.up
+        if depths[a] < depths[b]:
+            a, b = b, a
+        difference = depths[a] - depths[b]
+        level = 0
+        while difference:
+            if difference & 1:
+                a = up[level][a]
+            difference >>= 1
+            level += 1
+        if a == b:
+            return a
+        for table in reversed(up):
+            if table[a] != table[b]:
+                a, b = table[a], table[b]
+        return up[0][a]
+
+    def path_length(self, start: Tuple[int, int], end: Tuple[int, int]) -> int:
+        """
+        Количество клеток сетки на пути между клетками лабиринта start и end
+        (как len(Maze.solve_maze(start, end)); 0, если пути нет).
+        """
+        start_index, end_index = self.grid.cell_index(start, 'стартовая'), self.grid.cell_index(end, 'конечная')
+        if not self._indexed(start_index, end_index):
+            return len(self._search(start_index, end_index))
+        a, b = self.node_ids[start_index], self.node_ids[end_index]
+        depths = self.depths
+        return depths[a] + depths[b] - 2 * depths[self._lca(a, b)] + 1
+
+    def path(self, start: Tuple[int, int], end: Tuple[int, int]) -> List[Tuple[int, int]]:
+        """Путь между клетками лабиринта start и end в координатах сетки (как Maze.solve_maze)."""
+        start_index, end_index = self.grid.cell_index(start, 'стартовая'), self.grid.cell_index(end, 'конечная')
+        if not self._indexed(start_index, end_index):
+            return self._search(start_index, end_index)
+        a, b = self.node_ids[start_index], self.node_ids[end_index]
+        common = self._lca(a, b)
+        parents, nodes, cols = self.up[0], self.nodes, self.grid.cols
+        head, tail = [], []
+        while a != common:
+            head.append(nodes[a])
+            a = parents[a]
+        while b != common:
+            tail.append(nodes[b])
+            b = parents[b]
+        head.append(nodes[common])
+        head.extend(reversed(tail))
+        return [(index // cols, index % cols) for index in head]
+
+    def query_lengths(self, starts: Sequence[Tuple[int, int]], ends: Sequence[Tuple[int, int]]) -> List[int]:
+        """Длины путей для пар (starts[i], ends[i])."""
+        if len(starts) != len(ends):
+            raise ValueError("Количество стартовых и конечных позиций должно совпадать.")
+        return [self.path_length(start, end) for start, end in zip(starts, ends)]
+
+    def query_paths(self, starts: Sequence[Tuple[int, int]],
+                    ends: Sequence[Tuple[int, int]]) -> List[List[Tuple[int, int]]]:
+        """Пути для пар (starts[i], ends[i])."""
+        if len(starts) != len(ends):
+            raise ValueError("Количество стартовых и конечных позиций должно совпадать.")
+        return [self.path(start, end) for start, end in zip(starts, ends)]
+
+    def _search(self, start: int, end: int) -> List[Tuple[int, int]]:
+        """Обычный поиск в ширину для лабиринтов с циклами и клеток вне дерева."""
+        cols = self.grid.cols
+        return solve(self.grid, divmod(start, cols), divmod(end, cols)).path
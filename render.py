@@ -0,0 +1,100 @@
+"""
+Вывод лабиринта в консоль.
+
+Кадр целиком собирается таблицами перевода (bytes.translate, str.translate) и
+выводится одним вызовом write, без отдельного print на каждую строку.
+"""
+import sys
+from typing import Iterable, TextIO, Tuple
+
+from grid import Grid, PASSAGE, PATH, WALL
+
+MODES = ('text', 'half')
+
+# Состояния клеток кадра: 0 - стена, 1 - проход, 2 - клетка пути
+_STATES = bytes(0 if code == WALL else 2 if code == PATH else 1 for code in range(256))
+_TEXT = bytes.maketrans(b'\x00\x01\x02', b'# .')
+# Для полублочного режима состояние верхней клетки умножается на 3, нижней - прибавляется
+_UPPER = bytes.maketrans(b'\x00\x01\x02', b'\x00\x03\x06')
+_RED, _RED_BACKGROUND, _RESET = '\x1b[31m', '\x1b[41m', '\x1b[0m'
+# Символ для пары клеток (верхняя, нижняя); клетки пути выделяются красным цветом
+_HALF_BLOCKS = {
+    0: '█',                                  # стена, стена
+    1: '▀',                                  # стена, проход
+    2: _RED_BACKGROUND + '▀' + _RESET,       # стена, путь
+    3: '▄',                                  # проход, стена
+    4: ' ',                                  # проход, проход
+    5: _RED + '▄' + _RESET,                  # проход, путь
+    6: _RED_BACKGROUND + '▄' + _RESET,       # путь, стена
+    7: _RED + '▀' + _RESET,                  # путь, проход
+    8: _RED + '█' + _RESET,                  # путь, путь
+}
+
+
+def _states(grid: Grid, path: Iterable[Tuple[int, int]]) -> bytearray:
+    """Состояния клеток сетки с наложенным путем (сама сетка не изменяется)."""
+    states = bytearray(grid.data.translate(_STATES))
+    rows, cols, data = grid.rows, grid.cols, grid.data
+    for i, j in path:
+        if 0 <= i < rows and 0 <= j < cols and data[i * cols + j] == PASSAGE:
+            states[i * cols + j] = 2
+    return states
+
+
+def render_text(grid: Grid, path: Iterable[Tuple[int, int]] = ()) -> str:
+    """
+    Текстовый кадр: стены - '#', проходы - пробелы, путь - '.', клетки строки разделены пробелами.
+
+    Каждая строка сетки из cols клеток занимает в кадре 2 * cols символов вместе с
+    переводом строки, поэтому клетки ложатся в четные позиции кадра одним срезом.
+    """
+    rows, cols = grid.rows, grid.cols
+    if not rows or not cols:
+        return ''
+    frame = bytearray(b' ') * (2 * rows * cols)
+    frame[0::2] = _states(grid, path).translate(_TEXT)
+    frame[2 * cols - 1::2 * cols] = b'\n' * rows
+    return frame.decode('ascii')
+
+
+def render_half(grid: Grid, path: Iterable[Tuple[int, int]] = ()) -> str:
+    """
+    Компактный кадр: символы полублоков, две строки сетки на строку терминала,
+    один символ на клетку. Клетки пути выделяются красным цветом (ANSI).
+    """
+    rows, cols = grid.rows, grid.cols
+    if not rows or not cols:
+        return ''
+    states = _states(grid, path)
+    if rows % 2:
+        # Под последней строкой нечетной сетки - пустота (как проход)
+        states += b'\x01' * cols
+    lines = []
+    for start in range(0, len(states), 2 * cols):
+        upper = states[start:start + cols].translate(_UPPER)
+        lower = states[start + cols:start + 2 * cols]
+        # Байты состояний не больше 8, поэтому сложение чисел не дает переносов между байтами
+        codes = int.from_bytes(upper, 'big') + int.from_bytes(lower, 'big')
+        lines.append(codes.to_bytes(cols, 'big').decode('latin-1'))
+    lines.append('')
+    return '\n'.join(lines).translate(_HALF_BLOCKS)
+
+
+def write_frame(grid: Grid, path: Iterable[Tuple[int, int]] = (), mode: str = 'text',
+                stream: TextIO = None) -> None:
+    """
+    Выводит кадр лабиринта одним вызовом write.
+
+    Args:
+        grid (Grid): Сетка лабиринта.
+        path (Iterable): Клетки пути в координатах сетки.
+        mode (str): 'text' - символы '#', или 'half' - полублоки, две строки сетки на строку.
+        stream (TextIO): Поток вывода (по умолчанию sys.stdout).
+
+    Raises:
+        ValueError: Если режим неизвестен.
+    """
+    if mode not in MODES:
+        raise ValueError(f"Неизвестный режим вывода: {mode}. Доступны: {', '.join(MODES)}.")
+    frame = render_text(grid, path) if mode == 'text' else render_half(grid, path)
+    (stream or sys.stdout).write(frame)
@@ -0,0 +1,642 @@
+"""
+Асинхронный сервис лабиринтов: HTTP/1.1 поверх TCP (localhost) или Unix-сокета.
+
+Запросы - POST с телом JSON, ответы - JSON:
+
+    POST /generate  {"height", "width", "seed"?, "algorithm"?}          -> {"id", "height", "width"}
+    POST /load      {"path"}                                             -> {"id", "height", "width"}
+    POST /solve     {"id", "start"?, "end"?, "method"?}                  -> {"id", "path", "length",
+                                                                             "nodes_expanded", "cached"}
+    POST /export    {"id", "path", "way"?, "cell_size"?, "compression"?} -> {"id", "path", "bytes"}
+    POST /drop      {"id"}                                               -> {"id"}
+    POST /batch     {"requests": [{"op": "solve", ...}, ...]}             -> {"results": [...]}
+    GET  /stats                                                          -> счетчики сервиса и кэша решений
+
+Запросы POST должны иметь заголовок Content-Type: application/json: браузер не может
+отправить такой запрос с чужой страницы без предварительного запроса CORS, на который
+сервис не отвечает разрешением. Пути path в /load и /export задаются относительно каталога
+данных сервиса; пути за его пределами (в том числе через символические ссылки) отклоняются.
+
+Позиции start и end задаются в клетках лабиринта (строка, столбец), путь возвращается
+в координатах сетки, как у Maze.solve_maze. При ошибке возвращается {"error": сообщение}
+с кодом 400 (неверный запрос), 404 (неизвестный лабиринт или адрес), 415 (тело не JSON)
+или 501 (для изображений не установлен Pillow).
+Размер генерируемой сетки и сохраняемого изображения ограничен MAX_GRID_CELLS и MAX_IMAGE_PIXELS.
+
+Лабиринты хранятся в памяти сервиса между запросами. Генерация и поиск пути выполняются
+в пуле процессов, загрузка и запись файлов - в пуле потоков, поэтому цикл событий
+остается отзывчивым. Решения запросов пакета к одному лабиринту отправляются в процесс
+одной задачей. Процессы пула хранят полученные сетки по digest, поэтому сетка передается
+в процесс только при первом обращении к нему, а дальше - только digest и позиции. Если процесс
+пула аварийно завершился, запрос завершается ошибкой 500, а пул создается заново.
+"""
+import argparse
+import asyncio
+import functools
+import itertools
+import json
+import math
+import os
+import random
+import time
+from collections import Counter, OrderedDict, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from generators import GENERATORS
+from grid import Grid
+from maze import Maze
+from solution_cache import SOLUTION_CACHE
+from solver import SOLVERS, solve
+
+# Максимальный размер тела запроса
+MAX_BODY_BYTES = 1 << 26
+_REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+            413: 'Payload Too Large', 415: 'Unsupported Media Type', 500: 'Internal Server Error',
+            501: 'Not Implemented'}
+# Максимальное число клеток сетки в /generate и пикселей изображения в /export
+MAX_GRID_CELLS = 1 << 26
+MAX_IMAGE_PIXELS = 1 << 26
+
+
+# Суммарный размер сеток, которые хранит один процесс пула
+WORKER_GRID_BYTES = 1 << 28
+_worker_grids: 'OrderedDict[bytes, Grid]' = OrderedDict()
+
+
+class MazeNotFound(LookupError):
+    """Запрошенный лабиринт не загружен в сервис."""
+
+
+def _generate_grid(height: int, width: int, seed: Optional[int], algorithm: str) -> bytes:
+    """Генерирует лабиринт в процессе пула и возвращает байты сетки."""
+    maze = Maze(height, width)
+    maze.generate_maze(seed=seed, algorithm=algorithm)
+    return bytes(maze.grid.data)
+
+
+def _init_worker() -> None:
+    """Инициализация процесса пула: пустой кэш сеток."""
+    _worker_grids.clear()
+
+
+def _solve_queries(digest: bytes, queries: Sequence[Tuple[Tuple[int, int], Tuple[int, int], str]],
+                   rows: int = None, cols: int = None, data: bytes = None) -> Optional[List[Tuple[List, int]]]:
+    """
+    Решает в процессе пула несколько запросов к одной сетке.
+
+    Сетка берется из кэша процесса по digest; если ее там нет, она должна быть передана
+    в rows, cols и data и сохраняется в кэше (старые сетки вытесняются при превышении
+    WORKER_GRID_BYTES).
+
+    Returns:
+        list: (путь, раскрытые клетки) на запрос или None, если сетки нет в кэше и она не передана.
+    """
+    grid = _worker_grids.get(digest)
+    if grid is None:
+        if data is None:
+            return None
+        grid = _worker_grids[digest] = Grid(rows, cols, data)
+        total = sum(len(cached.data) for cached in _worker_grids.values())
+        while total > WORKER_GRID_BYTES and len(_worker_grids) > 1:
+            _, evicted = _worker_grids.popitem(last=False)
+            total -= len(evicted.data)
+    else:
+        _worker_grids.move_to_end(digest)
+    results = []
+    for start, end, method in queries:
+        result = solve(grid, start, end, method)
+        results.append((result.path, result.nodes_expanded))
+    return results
+
+
+def _field(payload: Dict, name: str):
+    """Обязательное поле запроса."""
+    if name not in payload:
+        raise ValueError(f"Не указано поле {name}.")
+    return payload[name]
+
+
+def _is_int(value) -> bool:
+    """Целое число JSON (true и false в Python тоже int, но числами не считаются)."""
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _position(value) -> Optional[Tuple[int, int]]:
+    """Позиция (строка, столбец) из JSON-массива."""
+    if value is None:
+        return None
+    if not (isinstance(value, list) and len(value) == 2 and all(_is_int(v) for v in value)):
+        raise ValueError("Позиция должна быть массивом [строка, столбец].")
+    return value[0], value[1]
+
+
+class MazeService:
+    """
+    Обработчик запросов сервиса с лабиринтами, хранящимися в памяти.
+
+    mazes: загруженные лабиринты по номеру
+    requests: количество запросов по адресам
+    """
+
+    def __init__(self, workers: int = None, data_dir: str = None) -> None:
+        """
+        :param workers: количество процессов для генерации и поиска пути (по умолчанию - число ядер)
+        :param data_dir: каталог, в котором /load и /export читают и пишут файлы (по умолчанию текущий)
+        """
+        self.data_dir = os.path.realpath(data_dir or os.getcwd())
+        self.mazes: Dict[int, Maze] = {}
+        self.requests = Counter()
+        self.workers = workers
+        self.processes = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker)
+        self._ids = itertools.count(1)
+        self.routes = {
+            '/generate': ('POST', self.generate),
+            '/load': ('POST', self.load),
+            '/solve': ('POST', self.solve),
+            '/export': ('POST', self.export),
+            '/drop': ('POST', self.drop),
+            '/batch': ('POST', self.batch),
+            '/stats': ('GET', self.stats),
+        }
+        self.operations = {
+            'generate': self.generate,
+            'load': self.load,
+            'solve': self.solve,
+            'export': self.export,
+            'drop': self.drop,
+        }
+
+    def close(self) -> None:
+        """Останавливает пул процессов."""
+        self.processes.shutdown(cancel_futures=True)
+
+    async def _run_in_processes(self, func, *args):
+        """
+        Выполняет функцию в пуле процессов.
+
+        Процесс пула может аварийно завершиться (например, при нехватке памяти), после чего
+        пул больше не принимает задачи. Такой пул заменяется новым с пустыми кэшами сеток,
+        а запрос завершается ошибкой.
+
+        Raises:
+            RuntimeError: Если пул процессов оказался неработоспособным.
+        """
+        processes = self.processes
+        try:
+            return await asyncio.get_running_loop().run_in_executor(processes, func, *args)
+        except BrokenProcessPool:
+            # Пул заменяет только первый из запросов, получивших ошибку
+            if self.processes is processes:
+                processes.shutdown(wait=False, cancel_futures=True)
+                self.processes = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker)
+            raise RuntimeError("Процесс пула аварийно завершился, пул процессов перезапущен.") from None
+
+    def _maze(self, payload: Dict) -> Tuple[int, Maze]:
+        """
+        Лабиринт по полю id запроса.
+
+        Raises:
+            MazeNotFound: Если лабиринта нет в сервисе.
+        """
+        maze_id = _field(payload, 'id')
+        maze = self.mazes.get(maze_id)
+        if maze is None:
+            raise MazeNotFound(f"Лабиринт {maze_id} не найден.")
+        return maze_id, maze
+
+    def _data_path(self, payload: Dict) -> str:
+        """
+        Путь к файлу из поля path запроса внутри каталога данных сервиса.
+
+        Raises:
+            ValueError: Если путь не строка или указывает за пределы каталога данных.
+        """
+        file_path = _field(payload, 'path')
+        if not isinstance(file_path, str) or not file_path:
+            raise ValueError("Поле path должно быть непустой строкой.")
+        # realpath раскрывает '..' и символические ссылки, поэтому проверяется итоговый путь
+        resolved = os.path.realpath(os.path.join(self.data_dir, file_path))
+        if os.path.commonpath([resolved, self.data_dir]) != self.data_dir:
+            raise ValueError("Путь должен находиться внутри каталога данных сервиса.")
+        return resolved
+
+    def _add(self, maze: Maze) -> Dict:
+        """Сохраняет лабиринт в сервисе и возвращает описание для ответа."""
+        maze_id = next(self._ids)
+        self.mazes[maze_id] = maze
+        return {'id': maze_id, 'height': maze.height, 'width': maze.width}
+
+    async def generate(self, payload: Dict) -> Dict:
+        """Генерирует лабиринт в пуле процессов."""
+        height, width = _field(payload, 'height'), _field(payload, 'width')
+        if not (_is_int(height) and _is_int(width) and height >= 1 and width >= 1):
+            raise ValueError("Значения height и width должны быть положительными целыми числами.")
+        if (2 * height + 1) * (2 * width + 1) > MAX_GRID_CELLS:
+            raise ValueError(f"Сетка лабиринта не должна превышать {MAX_GRID_CELLS} клеток.")
+        algorithm = payload.get('algorithm', 'binary_tree')
+        if algorithm not in GENERATORS:
+            raise ValueError(f"Неизвестный алгоритм генерации: {algorithm}. Доступны: {', '.join(GENERATORS)}.")
+        seed = payload.get('seed')
+        if seed is not None and not _is_int(seed):
+            raise ValueError("Значение seed должно быть целым числом.")
+        data = await self._run_in_processes(_generate_grid, height, width, seed, algorithm)
+        maze = Maze(height, width)
+        maze.grid = Grid(2 * height + 1, 2 * width + 1, data)
+        maze.seed = seed
+        maze.algorithm = algorithm
+        return self._add(maze)
+
+    async def load(self, payload: Dict) -> Dict:
+        """
+        Загружает лабиринт из файла каталога данных (.txt, .mzb, .png, .jpg) в пуле потоков.
+
+        Содержимое файла в сообщения об ошибках не попадает: при некорректном файле
+        возвращается только общее сообщение.
+        """
+        file_path = self._data_path(payload)
+        ext = os.path.splitext(file_path)[1]
+        maze = Maze(1, 1)
+        loaders = {'.txt': maze.load_maze_from_file, '.mzb': maze.load_maze_from_binary,
+                   '.png': maze.load_maze_from_image, '.jpg': maze.load_maze_from_image}
+        if ext not in loaders:
+            raise ValueError("Поддерживаются только файлы с расширением .txt, .png, .jpg, .mzb.")
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, loaders[ext], file_path)
+        except OSError as e:
+            raise ValueError(f"Не удалось прочитать файл: {e.strerror}.") from None
+        except ValueError:
+            raise ValueError("Файл не содержит корректного лабиринта.") from None
+        return self._add(maze)
+
+    async def solve(self, payload: Dict) -> Dict:
+        """Ищет путь в лабиринте (готовые решения берутся из общего кэша решений)."""
+        maze_id, _ = self._maze(payload)
+        (result,) = await self._solve_group(maze_id, [payload])
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    async def _solve_group(self, maze_id: int, payloads: Sequence[Dict]) -> List:
+        """
+        Решает несколько запросов к одному лабиринту.
+
+        Запросы, которых нет в кэше, отправляются в пул процессов одной задачей. Сначала
+        передается только digest сетки; если у процесса ее нет, задача повторяется с сеткой.
+
+        Returns:
+            list: Ответ или исключение для каждого запроса.
+        """
+        maze = self.mazes[maze_id]
+        grid = maze.grid
+        digest = grid.digest()
+        results: List = [None] * len(payloads)
+        queries, keys, slots = [], [], []
+        for slot, payload in enumerate(payloads):
+            try:
+                method = payload.get('method', 'bfs')
+                if method not in SOLVERS:
+                    raise ValueError(f"Неизвестный метод решения: {method}. Доступны: {', '.join(SOLVERS)}.")
+                start, end = maze.grid_positions(_position(payload.get('start')), _position(payload.get('end')))
+            except ValueError as e:
+                results[slot] = e
+                continue
+            # Тот же ключ, что и в Maze.solve_maze: решения общие для сервиса и лабиринтов процесса
+            key = (digest, start, end, method)
+            path = SOLUTION_CACHE.get(key)
+            if path is not None:
+                results[slot] = self._solution(maze_id, maze, path, 0, True)
+            else:
+                queries.append((start, end, method))
+                keys.append(key)
+                slots.append(slot)
+
+        if queries:
+            solved = await self._run_in_processes(_solve_queries, digest, queries)
+            if solved is None:
+                solved = await self._run_in_processes(_solve_queries, digest, queries,
+                                                      grid.rows, grid.cols, grid.data)
+            for slot, key, (path, nodes_expanded) in zip(slots, keys, solved):
+                SOLUTION_CACHE.put(key, path)
+                results[slot] = self._solution(maze_id, maze, path, nodes_expanded, False)
+        return results
+
+    @staticmethod
+    def _solution(maze_id: int, maze: Maze, path: List[Tuple[int, int]], nodes_expanded: int,
+                  cached: bool) -> Dict:
+        """Ответ на запрос решения; путь запоминается для экспорта с решением."""
+        maze.list_way = path
+        return {'id': maze_id, 'path': path, 'length': len(path), 'nodes_expanded': nodes_expanded,
+                'cached': cached}
+
+    async def export(self, payload: Dict) -> Dict:
+        """
+        Сохраняет лабиринт в файл каталога данных (.txt, .mzb, .png, .jpg) в пуле потоков.
+        При way=true отмечается последнее найденное решение лабиринта.
+        """
+        maze_id, maze = self._maze(payload)
+        file_path = self._data_path(payload)
+        way = bool(payload.get('way', False))
+        ext = os.path.splitext(file_path)[1]
+        if ext == '.txt':
+            save = functools.partial(maze.save_maze_to_file, file_path, way)
+        elif ext == '.mzb':
+            save = functools.partial(maze.save_maze_to_binary, file_path, way, payload.get('compression', 'none'))
+        elif ext in ('.png', '.jpg'):
+            cell_size = payload.get('cell_size', 20)
+            if _is_int(cell_size) and maze.grid.rows * maze.grid.cols * cell_size ** 2 > MAX_IMAGE_PIXELS:
+                raise ValueError(f"Изображение не должно превышать {MAX_IMAGE_PIXELS} пикселей.")
+            save = functools.partial(maze.save_maze_as_image, file_path, cell_size)
+        else:
+            raise ValueError("Поддерживаются только файлы с расширением .txt, .png, .jpg, .mzb.")
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, save)
+        except OSError as e:
+            raise ValueError(f"Не удалось записать файл: {e.strerror}.") from None
+        return {'id': maze_id, 'path': os.path.relpath(file_path, self.data_dir),
+                'bytes': os.path.getsize(file_path)}
+
+    async def drop(self, payload: Dict) -> Dict:
+        """Удаляет лабиринт из памяти сервиса."""
+        maze_id, _ = self._maze(payload)
+        del self.mazes[maze_id]
+        return {'id': maze_id}
+
+    async def batch(self, payload: Dict) -> Dict:
+        """
+        Выполняет пакет независимых запросов {"op": операция, ...}.
+
+        Решения группируются по лабиринтам, остальные операции выполняются параллельно.
+        Ответы возвращаются в порядке запросов; ошибка одного запроса не прерывает пакет.
+        """
+        requests = _field(payload, 'requests')
+        if not isinstance(requests, list):
+            raise ValueError("Поле requests должно быть массивом.")
+        results: List = [None] * len(requests)
+        groups = defaultdict(list)
+        tasks = {}
+        for slot, request in enumerate(requests):
+            operation = request.get('op') if isinstance(request, dict) else None
+            if operation not in self.operations:
+                results[slot] = ValueError(f"Неизвестная операция: {operation}.")
+            elif operation == 'solve' and request.get('id') in self.mazes:
+                groups[request['id']].append(slot)
+            else:
+                tasks[slot] = self.operations[operation](request)
+
+        solve_groups = [self._solve_group(maze_id, [requests[slot] for slot in slots])
+                        for maze_id, slots in groups.items()]
+        done = await asyncio.gather(*tasks.values(), *solve_groups, return_exceptions=True)
+        for slot, result in zip(tasks, done):
+            results[slot] = result
+        for slots, group in zip(groups.values(), done[len(tasks):]):
+            for slot, result in zip(slots, group if isinstance(group, list) else [group] * len(slots)):
+                results[slot] = result
+        return {'results': [self._error(result)[1] if isinstance(result, Exception) else result
+                            for result in results]}
+
+    async def stats(self, payload: Dict) -> Dict:
+        """Количество лабиринтов, запросов и счетчики кэша решений."""
+        return {'mazes': len(self.mazes), 'requests': dict(self.requests), 'solution_cache': SOLUTION_CACHE.stats()}
+
+    @staticmethod
+    def _error(error: Exception) -> Tuple[int, Dict]:
+        """Код и тело ответа для ошибки обработки запроса."""
+        if isinstance(error, MazeNotFound):
+            return 404, {'error': str(error)}
+        if isinstance(error, ImportError):
+            return 501, {'error': str(error)}
+        if isinstance(error, (ValueError, TypeError)):
+            return 400, {'error': str(error)}
+        return 500, {'error': f"Внутренняя ошибка сервиса: {error!r}."}
+
+    async def dispatch(self, method: str, target: str, body: bytes,
+                       content_type: str = 'application/json') -> Tuple[int, Dict]:
+        """Выполняет запрос и возвращает код ответа и тело JSON."""
+        route = target.split('?', 1)[0]
+        if route not in self.routes:
+            return 404, {'error': f"Неизвестный адрес: {route}."}
+        expected, handler = self.routes[route]
+        if method != expected:
+            return 405, {'error': f"Адрес {route} принимает только {expected}."}
+        if method == 'POST' and content_type.split(';', 1)[0].strip().lower() != 'application/json':
+            return 415, {'error': "Тело запроса должно иметь тип application/json."}
+        self.requests[route] += 1
+        try:
+            payload = json.loads(body) if body else {}
+            if not isinstance(payload, dict):
+                raise ValueError("Тело запроса должно быть объектом JSON.")
+            return 200, await handler(payload)
+        except Exception as e:
+            return self._error(e)
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Обрабатывает запросы одного соединения (с поддержкой keep-alive)."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                parts = request_line.decode('latin-1').split()
+                length = headers.get('content-length', '0')
+                if len(parts) != 3 or not length.isdigit():
+                    await _write_response(writer, 400, {'error': "Неверный запрос HTTP."}, False)
+                    break
+                if int(length) > MAX_BODY_BYTES:
+                    await _write_response(writer, 413, {'error': "Слишком большое тело запроса."}, False)
+                    break
+                method, target, version = parts
+                body = await reader.readexactly(int(length))
+                status, response = await self.dispatch(method, target, body, headers.get('content-type', ''))
+                keep_alive = version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+                await _write_response(writer, status, response, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+async def _write_response(writer: asyncio.StreamWriter, status: int, response: Dict, keep_alive: bool) -> None:
+    """Отправляет ответ HTTP с телом JSON."""
+    body = json.dumps(response, ensure_ascii=False).encode()
+    head = (f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+            f"Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    writer.write(head.encode('latin-1') + body)
+    await writer.drain()
+
+
+async def start(service: MazeService, host: str = '127.0.0.1', port: int = 8765,
+                unix_path: str = None) -> asyncio.AbstractServer:
+    """Запускает сервер на TCP-адресе host:port или на Unix-сокете unix_path."""
+    if unix_path:
+        return await asyncio.start_unix_server(service.handle_connection, unix_path)
+    return await asyncio.start_server(service.handle_connection, host, port)
+
+
+async def serve(host: str = '127.0.0.1', port: int = 8765, unix_path: str = None, workers: int = None,
+                data_dir: str = None) -> None:
+    """Запускает сервис и обрабатывает запросы до остановки процесса."""
+    service = MazeService(workers, data_dir)
+    try:
+        server = await start(service, host, port, unix_path)
+        async with server:
+            print(f"Сервис лабиринтов слушает {unix_path or f'{host}:{port}'}", flush=True)
+            await server.serve_forever()
+    finally:
+        service.close()
+
+
+class Client:
+    """Клиент сервиса лабиринтов с одним постоянным соединением."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.reader = reader
+        self.writer = writer
+
+    @classmethod
+    async def connect(cls, host: str = '127.0.0.1', port: int = 8765, unix_path: str = None) -> 'Client':
+        """Подключается к сервису по TCP или через Unix-сокет."""
+        if unix_path:
+            reader, writer = await asyncio.open_unix_connection(unix_path)
+        else:
+            reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+    async def request(self, route: str, payload: Dict = None) -> Tuple[int, Dict]:
+        """
+        Отправляет запрос (GET без тела, если payload не задан) и возвращает код и тело ответа.
+        """
+        body = json.dumps(payload).encode() if payload is not None else b''
+        method = 'POST' if payload is not None else 'GET'
+        head = (f"{method} {route} HTTP/1.1\r\nHost: maze\r\n"
+                f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n")
+        self.writer.write(head.encode('latin-1') + body)
+        await self.writer.drain()
+
+        status = int((await self.reader.readline()).split()[1])
+        length = 0
+        while True:
+            line = await self.reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            if name.strip().lower() == 'content-length':
+                length = int(value)
+        return status, json.loads(await self.reader.readexactly(length))
+
+    async def close(self) -> None:
+        """Закрывает соединение."""
+        self.writer.close()
+        await self.writer.wait_closed()
+
+
+def _percentile(values: Sequence[float], fraction: float) -> float:
+    """Перцентиль отсортированной выборки методом ближайшего ранга."""
+    if not values:
+        return 0.0
+    return values[max(0, math.ceil(fraction * len(values)) - 1)]
+
+
+async def load_test(host: str = '127.0.0.1', port: int = 8765, unix_path: str = None, requests: int = 1000,
+                    concurrency: int = 16, size: Tuple[int, int] = (100, 100), method: str = 'bfs',
+                    seed: int = 0) -> Dict:
+    """
+    Нагрузочный тест: генерирует лабиринт и отправляет requests запросов решения
+    между случайными клетками через concurrency параллельных соединений.
+
+    Returns:
+        dict: Количество запросов и ошибок, пропускная способность (запросов в секунду)
+        и задержки p50/p99 в миллисекундах.
+    """
+    client = await Client.connect(host, port, unix_path)
+    status, maze = await client.request('/generate', {'height': size[0], 'width': size[1], 'seed': seed})
+    await client.close()
+    if status != 200:
+        raise ValueError(maze['error'])
+
+    latencies = []
+    errors = 0
+
+    async def worker(index: int, count: int) -> None:
+        nonlocal errors
+        rng = random.Random(seed + index)
+        connection = await Client.connect(host, port, unix_path)
+        try:
+            for _ in range(count):
+                payload = {'id': maze['id'], 'method': method,
+                           'start': [rng.randrange(size[0]), rng.randrange(size[1])],
+                           'end': [rng.randrange(size[0]), rng.randrange(size[1])]}
+                started = time.perf_counter()
+                status, _ = await connection.request('/solve', payload)
+                latencies.append(time.perf_counter() - started)
+                errors += status != 200
+        finally:
+            await connection.close()
+
+    shares = [requests // concurrency + (index < requests % concurrency) for index in range(concurrency)]
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(index, count) for index, count in enumerate(shares) if count))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'concurrency': concurrency,
+        'size': list(size),
+        'method': method,
+        'elapsed_s': elapsed,
+        'throughput_rps': len(latencies) / elapsed if elapsed else None,
+        'p50_ms': _percentile(latencies, 0.50) * 1000,
+        'p99_ms': _percentile(latencies, 0.99) * 1000,
+    }
+
+
+def main() -> None:
+    """Запуск сервиса (serve) или нагрузочного теста (loadtest) из командной строки."""
+    parser = argparse.ArgumentParser(description="Maze service")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    for name, help_text in (('serve', "Запуск сервиса."), ('loadtest', "Нагрузочный тест запущенного сервиса.")):
+        command = subparsers.add_parser(name, help=help_text)
+        command.add_argument('--host', default='127.0.0.1', help="Адрес сервиса (по умолчанию 127.0.0.1).")
+        command.add_argument('--port', type=int, default=8765, help="Порт сервиса (по умолчанию 8765).")
+        command.add_argument('--unix', help="Путь к Unix-сокету вместо TCP.")
+    subparsers.choices['serve'].add_argument('-w', '--workers', type=int, default=None,
+                                             help="Количество процессов для генерации и решения.")
+    subparsers.choices['serve'].add_argument('-d', '--data_dir', default=None,
+                                             help="Каталог файлов для /load и /export (по умолчанию текущий).")
+    loadtest = subparsers.choices['loadtest']
+    loadtest.add_argument('-n', '--requests', type=int, default=1000, help="Количество запросов решения.")
+    loadtest.add_argument('-c', '--concurrency', type=int, default=16, help="Количество соединений.")
+    loadtest.add_argument('--size', nargs=2, type=int, default=(100, 100), metavar=('HEIGHT', 'WIDTH'),
+                          help="Размер лабиринта.")
+    loadtest.add_argument('-sa', '--solve_method', choices=tuple(SOLVERS), default='bfs',
+                          help="Метод решения.")
+    loadtest.add_argument('--seed', type=int, default=0, help="Зерно лабиринта и случайных запросов.")
+    args = parser.parse_args()
+
+    try:
+        if args.command == 'serve':
+            asyncio.run(serve(args.host, args.port, args.unix, args.workers, args.data_dir))
+        else:
+            report = asyncio.run(load_test(args.host, args.port, args.unix, args.requests,
+                                           max(1, args.concurrency), tuple(args.size), args.solve_method,
+                                           args.seed))
+            print(json.dumps(report, indent=2))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
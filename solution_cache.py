@@ -0,0 +1,83 @@
+from array import array
+from collections import OrderedDict
+from typing import Dict, Hashable, List, Optional, Tuple
+
+
+class SolutionCache:
+    """
+    Ограниченный LRU-кэш решений лабиринтов.
+
+    Ключ - (хэш содержимого сетки, начало, конец, метод), поэтому одинаковые лабиринты,
+    загруженные заново из того же файла, используют уже найденные решения.
+
+    Пути хранятся компактно, в массиве array('i') с чередующимися строками и столбцами
+    клеток (8 байт на клетку). Кэш ограничен и количеством решений, и суммарным числом
+    клеток путей; пути длиннее max_path_cells не кэшируются.
+    """
+
+    def __init__(self, maxsize: int = 1024, max_cells: int = 1 << 22, max_path_cells: int = 1 << 19) -> None:
+        """
+        :param maxsize: максимальное количество хранимых решений
+        :param max_cells: максимальное суммарное количество клеток в хранимых путях
+        :param max_path_cells: максимальная длина кэшируемого пути
+        """
+        self.maxsize = maxsize
+        self.max_cells = max_cells
+        self.max_path_cells = min(max_path_cells, max_cells)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.skipped = 0
+        self.cells = 0
+        self._entries: 'OrderedDict[Hashable, array]' = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[List[Tuple[int, int]]]:
+        """Возвращает копию сохраненного пути или None, если решения нет в кэше."""
+        flat = self._entries.get(key)
+        if flat is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return list(zip(flat[0::2], flat[1::2]))
+
+    def put(self, key: Hashable, path: List[Tuple[int, int]]) -> None:
+        """
+        Сохраняет путь, вытесняя давно не использованные решения при переполнении.
+        Слишком длинные пути не сохраняются (учитываются в счетчике skipped).
+        """
+        if self.maxsize <= 0:
+            return
+        if len(path) > self.max_path_cells:
+            self.skipped += 1
+            return
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self.cells -= len(previous) // 2
+        flat = array('i')
+        for cell in path:
+            flat.extend(cell)
+        self._entries[key] = flat
+        self.cells += len(path)
+        while len(self._entries) > self.maxsize or self.cells > self.max_cells:
+            _, evicted = self._entries.popitem(last=False)
+            self.cells -= len(evicted) // 2
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """Очищает кэш и счетчики."""
+        self._entries.clear()
+        self.hits = self.misses = self.evictions = self.skipped = self.cells = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Счетчики попаданий, промахов, вытеснений и пропущенных длинных путей, заполненность кэша."""
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions, 'skipped': self.skipped,
+                'size': len(self._entries), 'maxsize': self.maxsize,
+                'cells': self.cells, 'max_cells': self.max_cells, 'bytes': self.cells * 2 * array('i').itemsize}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Общий кэш решений для всех лабиринтов процесса
+SOLUTION_CACHE = SolutionCache()
@@ -0,0 +1,251 @@
+import heapq
+import threading
+import time
+from array import array
+from collections import deque
+from typing import List, NamedTuple, Tuple
+
+from grid import Grid, PASSAGE, WALL
+
+
+class SolveResult(NamedTuple):
+    """
+    Результат поиска пути.
+
+    path: путь в координатах сетки (пустой список, если пути нет)
+    nodes_expanded: количество раскрытых клеток
+    elapsed: время поиска в секундах
+    """
+    path: List[Tuple[int, int]]
+    nodes_expanded: int
+    elapsed: float
+
+
+def solve(grid: Grid, start: Tuple[int, int], end: Tuple[int, int], method: str = 'bfs') -> SolveResult:
+    """
+    Ищет путь между двумя проходимыми клетками сетки.
+
+    Поиск ведется по плоским индексам клеток, предки хранятся в массиве array,
+    поэтому на каждую клетку не создаются копии пути. Массивы поиска переиспользуются
+    между запросами (см. _Workspace), поэтому короткий поиск в большой сетке не тратит
+    время на их выделение. Буферы сеток больше WORKSPACE_CACHE_CELLS клеток не сохраняются.
+
+    Args:
+        grid (Grid): Сетка лабиринта.
+        start (Tuple[int, int]): Начальная клетка в координатах сетки (строка, столбец).
+        end (Tuple[int, int]): Конечная клетка в координатах сетки (строка, столбец).
+        method (str): 'bfs' (кратчайший путь), 'astar' (A* с манхэттенской эвристикой)
+            или 'bidirectional' (двунаправленный BFS).
+
+    Returns:
+        SolveResult: Путь, количество раскрытых клеток и затраченное время.
+
+    Raises:
+        ValueError: Если метод поиска неизвестен.
+    """
+    if method not in SOLVERS:
+        raise ValueError(f"Неизвестный метод решения: {method}. Доступны: {', '.join(SOLVERS)}.")
+    started = time.perf_counter()
+
+    # Поиск опирается на внешнюю стену: без нее соседи по плоскому индексу переходят через край
+    shift = 0
+    if not is_enclosed(grid):
+        grid = _with_border(grid)
+        shift = 1
+    cols = grid.cols
+    start_index = (start[0] + shift) * cols + start[1] + shift
+    end_index = (end[0] + shift) * cols + end[1] + shift
+
+    indices, nodes_expanded = SOLVERS[method](grid, start_index, end_index)
+    path = [(index // cols - shift, index % cols - shift) for index in indices]
+    return SolveResult(path, nodes_expanded, time.perf_counter() - started)
+
+
+def is_enclosed(grid: Grid) -> bool:
+    """Проверяет, что по периметру сетки только стены."""
+    data, cols = grid.data, grid.cols
+    wall_row = bytes([WALL]) * cols
+    return (data[:cols] == wall_row and data[-cols:] == wall_row and
+            data[0::cols].count(WALL) == grid.rows and data[cols - 1::cols].count(WALL) == grid.rows)
+
+
+def _with_border(grid: Grid) -> Grid:
+    """Копия сетки, окруженная дополнительным слоем стен."""
+    cols = grid.cols + 2
+    bordered = Grid(grid.rows + 2, cols)
+    for row in range(grid.rows):
+        start = (row + 1) * cols + 1
+        bordered.data[start:start + grid.cols] = grid.data[row * grid.cols:(row + 1) * grid.cols]
+    return bordered
+
+
+class _Workspace:
+    """
+    Буферы поиска, переиспользуемые между запросами к сеткам одного размера.
+
+    Вместо очистки массивов перед каждым поиском используется номер поколения: клетка
+    считается отмеченной в marks[k], только если там записан номер текущего поиска,
+    а значение values[k] для нее действительно только при такой отметке. Массивы
+    создаются при первом обращении, поэтому BFS держит только те, что использует.
+    """
+    __slots__ = ('size', 'generation', '_marks', '_values')
+
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self.generation = 0
+        self._marks = [None, None]
+        self._values = [None, None]
+
+    def start(self) -> int:
+        """Начинает новый поиск и возвращает его номер поколения."""
+        self.generation += 1
+        if self.generation > 0xFFFFFFFF:
+            # Переполнение счетчика: старые отметки стираются один раз
+            self._marks = [None, None]
+            self.generation = 1
+        return self.generation
+
+    def marks(self, k: int) -> array:
+        if self._marks[k] is None:
+            self._marks[k] = array('I', [0]) * self.size
+        return self._marks[k]
+
+    def values(self, k: int) -> array:
+        if self._values[k] is None:
+            self._values[k] = array('i', [0]) * self.size
+        return self._values[k]
+
+
+# Буферы поиска свои у каждого потока; для больших сеток они освобождаются после поиска
+WORKSPACE_CACHE_CELLS = 1 << 22
+_local = threading.local()
+
+
+def _workspace(size: int) -> _Workspace:
+    """Буферы поиска текущего потока для сетки из size клеток."""
+    if size > WORKSPACE_CACHE_CELLS:
+        return _Workspace(size)
+    workspace = getattr(_local, 'workspace', None)
+    if workspace is None or workspace.size != size:
+        workspace = _local.workspace = _Workspace(size)
+    return workspace
+
+
+def _trace(parents: array, index: int) -> List[int]:
+    """Восстанавливает путь от корня до index по массиву предков."""
+    path = []
+    while True:
+        path.append(index)
+        parent = parents[index]
+        if parent == index:
+            break
+        index = parent
+    path.reverse()
+    return path
+
+
+def _bfs(grid: Grid, start: int, end: int) -> Tuple[List[int], int]:
+    """Поиск в ширину: кратчайший путь по числу шагов."""
+    data = grid.data
+    offsets = (-grid.cols, grid.cols, -1, 1)
+    workspace = _workspace(len(data))
+    generation = workspace.start()
+    seen, parents = workspace.marks(0), workspace.values(0)
+    seen[start] = generation
+    parents[start] = start
+    queue = deque([start])
+    expanded = 0
+    while queue:
+        current = queue.popleft()
+        expanded += 1
+        if current == end:
+            return _trace(parents, end), expanded
+        for offset in offsets:
+            neighbor = current + offset
+            if data[neighbor] == PASSAGE and seen[neighbor] != generation:
+                seen[neighbor] = generation
+                parents[neighbor] = current
+                queue.append(neighbor)
+    return [], expanded
+
+
+def _astar(grid: Grid, start: int, end: int) -> Tuple[List[int], int]:
+    """A* с манхэттенской эвристикой."""
+    data, cols = grid.data, grid.cols
+    offsets = (-cols, cols, -1, 1)
+    end_row, end_col = divmod(end, cols)
+    workspace = _workspace(len(data))
+    generation = workspace.start()
+    seen, closed = workspace.marks(0), workspace.marks(1)
+    parents, costs = workspace.values(0), workspace.values(1)
+    seen[start] = generation
+    parents[start] = start
+    costs[start] = 0
+    heap = [(0, start)]
+    expanded = 0
+    while heap:
+        _, current = heapq.heappop(heap)
+        if closed[current] == generation:
+            continue
+        closed[current] = generation
+        expanded += 1
+        if current == end:
+            return _trace(parents, end), expanded
+        cost = costs[current] + 1
+        for offset in offsets:
+            neighbor = current + offset
+            if data[neighbor] != PASSAGE or closed[neighbor] == generation:
+                continue
+            if seen[neighbor] != generation or cost < costs[neighbor]:
+                seen[neighbor] = generation
+                parents[neighbor] = current
+                costs[neighbor] = cost
+                row, col = divmod(neighbor, cols)
+                heapq.heappush(heap, (cost + abs(row - end_row) + abs(col - end_col), neighbor))
+    return [], expanded
+
+
+def _bidirectional(grid: Grid, start: int, end: int) -> Tuple[List[int], int]:
+    """Двунаправленный поиск в ширину: волны идут навстречу от начала и от конца."""
+    if start == end:
+        return [start], 1
+    data = grid.data
+    offsets = (-grid.cols, grid.cols, -1, 1)
+    workspace = _workspace(len(data))
+    generation = workspace.start()
+    forward_seen, backward_seen = workspace.marks(0), workspace.marks(1)
+    forward, backward = workspace.values(0), workspace.values(1)
+    forward_seen[start] = backward_seen[end] = generation
+    forward[start] = start
+    backward[end] = end
+    frontiers = ([start], [end])
+    expanded = 0
+    while frontiers[0] and frontiers[1]:
+        # Расширяем меньший фронт на один слой
+        side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+        own, other = (forward, backward) if side == 0 else (backward, forward)
+        own_seen, other_seen = (forward_seen, backward_seen) if side == 0 else (backward_seen, forward_seen)
+        layer = []
+        for current in frontiers[side]:
+            expanded += 1
+            for offset in offsets:
+                neighbor = current + offset
+                if data[neighbor] != PASSAGE or own_seen[neighbor] == generation:
+                    continue
+                own_seen[neighbor] = generation
+                own[neighbor] = current
+                if other_seen[neighbor] == generation:
+                    head = _trace(forward, neighbor)
+                    tail = _trace(backward, neighbor)
+                    tail.reverse()
+                    return head + tail[1:], expanded
+                layer.append(neighbor)
+        frontiers = (layer, frontiers[1]) if side == 0 else (frontiers[0], layer)
+    return [], expanded
+
+
+SOLVERS = {
+    'bfs': _bfs,
+    'astar': _astar,
+    'bidirectional': _bidirectional,
+}
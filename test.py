@@ -1,5 +1,32 @@
+import asyncio
+import contextlib
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
 import unittest
-from maze import Maze
+from unittest import mock
+import bench
+import instrument
+import junction_graph
+import maze as maze_module
+import parallel
+import render
+import tiles
+import server
+from batch import make_tasks, run_batch, write_manifest
+from solution_cache import SolutionCache
+from generators import GENERATORS, stream_maze_to_file
+from grid import Grid
+from maze import Maze, maze_check
+
+try:
+    import PIL
+except ImportError:
+    # Без Pillow тесты изображений пропускаются: остальное от него не зависит
+    PIL = None
 
 
 class TestMazeFunctions(unittest.TestCase):
@@ -97,6 +124,1043 @@ class TestMazeFunctions(unittest.TestCase):
         self.assertIn(start_real, self.maze.list_way, "Начальная точка должна быть в пути.")
         self.assertIn(end_real, self.maze.list_way, "Конечная точка должна быть в пути.")
 
+    def test_generate_maze_seed(self):
+        """
+        Проверка воспроизводимости генерации при одинаковом зерне.
+        """
+        first, second = Maze(10, 12), Maze(10, 12)
+        first.generate_maze(seed=42)
+        second.generate_maze(seed=42)
+        self.assertEqual(first.grid, second.grid)
+
+    def test_generate_maze_binary_tree_rules(self):
+        """
+        Проверка граничных правил бинарного дерева и того, что лабиринт идеальный.
+        """
+        maze = Maze(8, 9)
+        maze.generate_maze(seed=7)
+        grid = maze.list_maze
+        # Последняя строка удаляет стены вправо, последний столбец - вниз
+        self.assertTrue(all(grid[15][2 * x + 2] == '1' for x in range(8)))
+        self.assertTrue(all(grid[2 * y + 2][17] == '1' for y in range(7)))
+        # В идеальном лабиринте проходов ровно клетки плюс (клетки - 1) удаленных стен
+        self.assertEqual(maze.grid.data.count(b'1'), 2 * 8 * 9 - 1)
+
+
+class TestGenerators(unittest.TestCase):
+    def test_all_algorithms_build_perfect_mazes(self):
+        """
+        Проверка, что каждый алгоритм строит корректный идеальный лабиринт.
+        """
+        for algorithm in GENERATORS:
+            for height, width in ((1, 4), (4, 1), (6, 9)):
+                with self.subTest(algorithm=algorithm, size=(height, width)):
+                    maze = Maze(height, width)
+                    maze.generate_maze(seed=3, algorithm=algorithm)
+                    self.assertTrue(maze_check(maze.grid))
+                    self.assertEqual(maze.grid.data.count(b'1'), 2 * height * width - 1)
+                    self.assertTrue(maze.solve_maze())
+
+    def test_algorithms_are_seeded(self):
+        """
+        Проверка воспроизводимости всех алгоритмов при одинаковом зерне.
+        """
+        for algorithm in GENERATORS:
+            first, second = Maze(7, 7), Maze(7, 7)
+            first.generate_maze(seed=11, algorithm=algorithm)
+            second.generate_maze(seed=11, algorithm=algorithm)
+            self.assertEqual(first.grid, second.grid, algorithm)
+
+    def test_unknown_algorithm(self):
+        with self.assertRaises(ValueError):
+            Maze(3, 3).generate_maze(algorithm='prim')
+
+    def test_streaming_export_matches_maze(self):
+        """
+        Проверка, что потоковый экспорт совпадает с генерацией в памяти и сохранением.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            streamed = os.path.join(directory, 'streamed.txt')
+            saved = os.path.join(directory, 'saved.txt')
+            for algorithm in GENERATORS:
+                stream_maze_to_file(streamed, 9, 13, algorithm, seed=5, buffer_size=64)
+                maze = Maze(9, 13)
+                maze.generate_maze(seed=5, algorithm=algorithm)
+                maze.save_maze_to_file(saved)
+                with open(streamed, 'rb') as first, open(saved, 'rb') as second:
+                    self.assertEqual(first.read(), second.read(), algorithm)
+
+
+class TestTextLoader(unittest.TestCase):
+    def load(self, content: bytes) -> Maze:
+        with tempfile.TemporaryDirectory() as directory:
+            file_path = os.path.join(directory, 'maze.txt')
+            with open(file_path, 'wb') as file:
+                file.write(content)
+            maze = Maze(1, 1)
+            maze.load_maze_from_file(file_path)
+        return maze
+
+    def test_load_regular_and_irregular_files(self):
+        """
+        Проверка загрузки ровного файла и файла с CRLF, пустыми строками и пробелами.
+        """
+        expected = b'00000' b'01110' b'00000'
+        for content in (b'00000\n01110\n00000\n', b'00000\n01110\n00000',
+                        b'00000\r\n01110\r\n\r\n 00000 \r\n'):
+            maze = self.load(content)
+            self.assertEqual(maze.grid.data, expected)
+            self.assertEqual((maze.height, maze.width), (1, 2))
+
+    def test_load_errors(self):
+        """
+        Проверка ошибок при недопустимых символах и строках разной длины.
+        """
+        with self.assertRaisesRegex(ValueError, 'недопустимые символы: 0x0'):
+            self.load(b'000\n0x0\n000\n')
+        with self.assertRaisesRegex(ValueError, 'разное количество символов'):
+            self.load(b'000\n01\n000\n')
+
+
+class TestMazeCheck(unittest.TestCase):
+    def setUp(self):
+        self.grid = Grid.from_rows(['0000000', '0100010', '0000000', '0111000', '0000000'])
+
+    def test_first_and_all_enclosed_cells(self):
+        """
+        Проверка сообщения о первой и обо всех замурованных клетках.
+        """
+        with self.assertRaisesRegex(ValueError, r'^Клетка \(1, 1\) окружена'):
+            maze_check(self.grid)
+        with self.assertRaisesRegex(ValueError, r'^Клетки \(1, 1\), \(1, 5\) окружены'):
+            maze_check(self.grid, report_all=True)
+
+    def test_enclosed_cells_across_bands(self):
+        """
+        Проверка поиска замурованных клеток при обработке сетки полосами по одной строке.
+        """
+        with mock.patch.object(maze_module, '_CHECK_BAND_BYTES', 1):
+            self.assertEqual(maze_module.find_enclosed_cells(self.grid), [(1, 1), (1, 5)])
+
+    def test_borders(self):
+        with self.assertRaisesRegex(ValueError, 'слева и справа'):
+            maze_check(['000', '011', '000'])
+        with self.assertRaisesRegex(ValueError, 'сверху и снизу'):
+            maze_check(['010', '010', '000'])
+
+    def test_connectivity(self):
+        """
+        Проверка необязательной проверки связности.
+        """
+        grid = ['0000000', '0110110', '0000000']
+        self.assertTrue(maze_check(grid))
+        with self.assertRaisesRegex(ValueError, r'Клетка \(1, 4\) недостижима'):
+            maze_check(grid, check_connectivity=True)
+        maze = Maze(6, 6)
+        maze.generate_maze(seed=1, algorithm='eller')
+        self.assertTrue(maze_check(maze.grid, check_connectivity=True))
+
+
+@unittest.skipUnless(PIL, "Нужен пакет Pillow.")
+class TestImageExport(unittest.TestCase):
+    def test_image_matches_per_pixel_rendering(self):
+        """
+        Проверка, что изображение совпадает попиксельно с отрисовкой по клеткам.
+        """
+        from PIL import Image
+        maze = Maze(4, 6)
+        maze.generate_maze(seed=2)
+        maze.solve_maze()
+        cell_size = 3
+        rows, cols = maze.grid.rows, maze.grid.cols
+        expected = Image.new('RGB', (cols * cell_size, rows * cell_size), 'white')
+        for i in range(rows):
+            for j in range(cols):
+                if (i, j) in maze.list_way:
+                    color = (255, 100, 200)
+                else:
+                    color = (0, 0, 0) if maze.list_maze[i][j] == '0' else (255, 255, 255)
+                expected.paste(color, (j * cell_size, i * cell_size, (j + 1) * cell_size, (i + 1) * cell_size))
+        with tempfile.TemporaryDirectory() as directory:
+            file_path = os.path.join(directory, 'maze.png')
+            maze.save_maze_as_image(file_path, cell_size, compress_level=1)
+            with Image.open(file_path) as img:
+                self.assertEqual(img.size, expected.size)
+                self.assertEqual(img.convert('RGB').tobytes(), expected.tobytes())
+
+    def test_image_round_trip_detects_cell_size(self):
+        """
+        Проверка импорта изображения с автоматическим определением размера клетки.
+        """
+        maze = Maze(5, 8)
+        maze.generate_maze(seed=4, algorithm='sidewinder')
+        with tempfile.TemporaryDirectory() as directory:
+            for cell_size, ext in ((1, '.png'), (7, '.png'), (20, '.jpg')):
+                file_path = os.path.join(directory, 'maze' + ext)
+                maze.save_maze_as_image(file_path, cell_size)
+                loaded = Maze(1, 1)
+                # Маленькая полоса заставляет импорт читать изображение по частям
+                with mock.patch('maze_image._IMAGE_BAND_PIXELS', 1):
+                    loaded.load_maze_from_image(file_path)
+                self.assertEqual(loaded.grid, maze.grid, (cell_size, ext))
+                self.assertEqual((loaded.height, loaded.width), (5, 8))
+
+    def test_invalid_cell_size(self):
+        """
+        Проверка понятной ошибки при неположительном размере клетки.
+        """
+        maze = Maze(2, 2)
+        with tempfile.TemporaryDirectory() as directory:
+            file_path = os.path.join(directory, 'maze.png')
+            with self.assertRaises(ValueError):
+                maze.save_maze_as_image(file_path, -1)
+            maze.save_maze_as_image(file_path, 2)
+            with self.assertRaises(ValueError):
+                maze.load_maze_from_image(file_path, cell_size=0)
+        import main
+        self.assertEqual(main.positive_int('3'), 3)
+        for value in ('0', '-1', 'x'):
+            with self.assertRaises(main.argparse.ArgumentTypeError):
+                main.positive_int(value)
+
+
+class TestBatch(unittest.TestCase):
+    def test_batch_is_deterministic_for_any_worker_count(self):
+        """
+        Проверка, что результаты пакета зависят только от зерна, а не от числа процессов.
+        """
+        tasks = make_tasks(6, (3, 12), base_seed=100)
+        results = []
+        for workers, chunk_size in ((1, 6), (3, 1)):
+            records = sorted(run_batch(tasks, workers=workers, chunk_size=chunk_size), key=lambda r: r['index'])
+            results.append([(r['seed'], r['height'], r['width'], r['path_length']) for r in records])
+        self.assertEqual(results[0], results[1])
+        self.assertEqual([seed for seed, *_ in results[0]], list(range(100, 106)))
+
+    def test_manifest_and_exports(self):
+        """
+        Проверка манифеста JSONL и экспортированных файлов.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            tasks = make_tasks(3, (2, 4), output_dir=directory, formats=('txt',))
+            manifest_path = os.path.join(directory, 'manifest.jsonl')
+            records = list(write_manifest(run_batch(tasks, workers=2), manifest_path))
+            with open(manifest_path) as manifest:
+                self.assertEqual(len(manifest.readlines()), 3)
+            for record in records:
+                loaded = Maze(1, 1)
+                loaded.load_maze_from_file(record['files'][0])
+                self.assertEqual((loaded.height, loaded.width), (record['height'], record['width']))
+
+
+    def test_command_line_arguments(self):
+        """
+        Проверка, что аргументы подкоманды batch и общие аргументы перед ней не затирают друг друга,
+        а неположительное число процессов отклоняется парсером.
+        """
+        import main
+        for argv, seeds, algorithm in ((['--seed', '5', '-ga', 'eller', 'batch', '2'], [5, 6], 'eller'),
+                                       (['--seed', '5', 'batch', '2', '--seed', '7'], [7, 8], 'binary_tree'),
+                                       (['batch', '2', '-w', '1'], [0, 1], 'binary_tree')):
+            with tempfile.TemporaryDirectory() as directory:
+                argv = ['main.py'] + argv + ['-o', directory]
+                with mock.patch.object(sys, 'argv', argv), contextlib.redirect_stdout(io.StringIO()):
+                    main.main()
+                with open(os.path.join(directory, 'manifest.jsonl')) as manifest:
+                    records = [json.loads(line) for line in manifest]
+            self.assertEqual(sorted(record['seed'] for record in records), seeds, argv)
+            self.assertEqual({record['algorithm'] for record in records}, {algorithm}, argv)
+        for option in ('-w', '--chunk_size'):
+            argv = ['main.py', 'batch', '2', option, '-1']
+            with mock.patch.object(sys, 'argv', argv), contextlib.redirect_stderr(io.StringIO()):
+                with self.assertRaises(SystemExit):
+                    main.main()
+
+
+class TestBinaryFormat(unittest.TestCase):
+    def test_round_trip_with_metadata(self):
+        """
+        Проверка сохранения и загрузки .mzb со всеми видами сжатия.
+        """
+        maze = Maze(7, 11)
+        maze.generate_maze(seed=9, algorithm='eller')
+        path = maze.solve_maze()
+        with tempfile.TemporaryDirectory() as directory:
+            file_path = os.path.join(directory, 'maze.mzb')
+            for compression in ('none', 'zlib', 'lzma'):
+                maze.save_maze_to_binary(file_path, way=True, compression=compression)
+                loaded = Maze(1, 1)
+                loaded.load_maze_from_binary(file_path)
+                self.assertEqual(loaded.grid, maze.grid, compression)
+                self.assertEqual((loaded.height, loaded.width), (7, 11))
+                self.assertEqual((loaded.algorithm, loaded.seed), ('eller', 9))
+                self.assertEqual(loaded.list_way, path)
+
+    def test_file_is_bit_packed(self):
+        """
+        Проверка, что клетки занимают в восемь раз меньше места, чем в тексте.
+        """
+        maze = Maze(40, 40)
+        maze.generate_maze(seed=1)
+        with tempfile.TemporaryDirectory() as directory:
+            file_path = os.path.join(directory, 'maze.mzb')
+            maze.save_maze_to_binary(file_path)
+            cells = maze.grid.rows * maze.grid.cols
+            self.assertLess(os.path.getsize(file_path), cells // 8 + 64)
+
+    def test_invalid_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            file_path = os.path.join(directory, 'maze.mzb')
+            with open(file_path, 'wb') as file:
+                file.write(b'not a maze file at all, definitely not')
+            with self.assertRaises(ValueError):
+                Maze(1, 1).load_maze_from_binary(file_path)
+            with open(file_path, 'wb') as file:
+                file.write(b'MZB1')
+            with self.assertRaises(ValueError):
+                Maze(1, 1).load_maze_from_binary(file_path)
+
+    def test_seed_out_of_range(self):
+        """
+        Проверка ошибки для зерна, которое не помещается в заголовок.
+        """
+        maze = Maze(2, 3)
+        maze.generate_maze(seed=1 << 70)
+        with tempfile.TemporaryDirectory() as directory:
+            file_path = os.path.join(directory, 'maze.mzb')
+            with self.assertRaises(ValueError):
+                maze.save_maze_to_binary(file_path)
+            self.assertFalse(os.path.exists(file_path))
+            maze.seed = -(1 << 63)
+            maze.save_maze_to_binary(file_path)
+            loaded = Maze(1, 1)
+            loaded.load_maze_from_binary(file_path)
+            self.assertEqual(loaded.seed, -(1 << 63))
+
+
+class TestPathIndex(unittest.TestCase):
+    def test_index_matches_solver(self):
+        """
+        Проверка, что ответы индекса совпадают с поиском пути.
+        """
+        maze = Maze(12, 15)
+        maze.generate_maze(seed=6, algorithm='backtracker')
+        index = maze.build_path_index()
+        self.assertTrue(index.is_tree)
+        starts = [(0, 0), (11, 14), (5, 7), (3, 3), (11, 0)]
+        ends = [(11, 14), (0, 0), (5, 7), (9, 2), (0, 14)]
+        expected = [maze.solve_maze(start, end) for start, end in zip(starts, ends)]
+        self.assertEqual(index.query_paths(starts, ends), expected)
+        self.assertEqual(index.query_lengths(starts, ends), [len(path) for path in expected])
+
+    def test_cyclic_maze_falls_back_to_search(self):
+        """
+        Проверка, что в лабиринте с циклом запросы выполняются обычным поиском.
+        """
+        maze = Maze(1, 1)
+        maze.list_maze = ['0000000', '0111110', '0101010', '0111110', '0000000']
+        index = maze.build_path_index()
+        self.assertFalse(index.is_tree)
+        self.assertEqual(index.path_length((0, 0), (1, 2)), 7)
+        self.assertEqual(index.path((0, 0), (1, 2)), maze.solve_maze((0, 0), (1, 2)))
+
+    def test_invalid_positions(self):
+        index = Maze(2, 2).build_path_index()
+        with self.assertRaises(ValueError):
+            index.path((-1, 0), (1, 1))
+        with self.assertRaises(ValueError):
+            index.query_lengths([(0, 0)], [])
+
+
+class TestJunctionGraph(unittest.TestCase):
+    def test_graph_matches_solver(self):
+        """
+        Проверка, что пути по графу развилок - кратчайшие и проходят по клеткам сетки.
+        """
+        maze = Maze(12, 15)
+        maze.generate_maze(seed=6, algorithm='backtracker')
+        # Несколько лишних проходов создают циклы
+        for row, col in ((4, 5), (10, 9), (15, 20), (7, 12)):
+            maze.list_maze[row][col] = '1'
+        graph = maze.build_junction_graph()
+        self.assertLess(graph.node_count, maze.grid.data.count(b'1'))
+        starts = [(0, 0), (11, 14), (5, 7), (3, 3), (11, 0), (2, 9)]
+        ends = [(11, 14), (0, 0), (5, 7), (9, 2), (0, 14), (2, 10)]
+        for start, end in zip(starts, ends):
+            path = graph.path(start, end)
+            self.assertEqual(len(path), len(maze.solve_maze(start, end)), (start, end))
+            self.assertEqual((path[0], path[-1]), ((2 * start[0] + 1, 2 * start[1] + 1),
+                                                  (2 * end[0] + 1, 2 * end[1] + 1)))
+            for (row, col), (next_row, next_col) in zip(path, path[1:]):
+                self.assertEqual(abs(row - next_row) + abs(col - next_col), 1)
+                self.assertEqual(maze.grid.get(next_row, next_col), ord('1'))
+
+    def test_ring_and_unreachable(self):
+        """
+        Проверка кольца без развилок и пары клеток без пути между ними.
+        """
+        maze = Maze(2, 2)
+        maze.list_maze = ['00000', '01110', '01010', '01110', '00000']
+        graph = maze.build_junction_graph()
+        self.assertEqual((graph.node_count, graph.edge_count), (1, 1))
+        self.assertEqual(graph.path((1, 1), (0, 0)), maze.solve_maze((1, 1), (0, 0), method='astar'))
+        maze.list_maze = ['00000', '01010', '00000', '01110', '00000']
+        result = maze.build_junction_graph().solve((0, 0), (1, 1))
+        self.assertEqual(result.path, [])
+        with self.assertRaises(ValueError):
+            maze.build_junction_graph().path((0, 0), (5, 5))
+
+    def test_fill_dead_ends(self):
+        """
+        Проверка, что после заполнения тупиков в идеальном лабиринте остается только путь.
+        """
+        maze = Maze(10, 10)
+        maze.generate_maze(seed=2, algorithm='sidewinder')
+        path = maze.solve_maze((0, 3), (9, 9))
+        filled = junction_graph.fill_dead_ends(maze.grid, [path[0], path[-1]])
+        self.assertEqual(filled.data.count(b'1'), len(path))
+        self.assertTrue(all(filled.get(row, col) == ord('1') for row, col in path))
+        graph = maze.build_junction_graph(keep=[(0, 3), (9, 9)])
+        self.assertEqual(graph.node_count, 2)
+        result = graph.solve((0, 3), (9, 9))
+        self.assertEqual((result.path, result.nodes_expanded), (path, 2))
+
+
+class TestSolutionCache(unittest.TestCase):
+    def setUp(self):
+        self.cache = SolutionCache(maxsize=2)
+        self.maze = Maze(6, 6)
+        self.maze.generate_maze(seed=8)
+        self.maze.solution_cache = self.cache
+
+    def test_cache_survives_reload(self):
+        """
+        Проверка, что решение берется из кэша после повторной загрузки того же лабиринта.
+        """
+        path = self.maze.solve_maze()
+        with tempfile.TemporaryDirectory() as directory:
+            file_path = os.path.join(directory, 'maze.txt')
+            self.maze.save_maze_to_file(file_path)
+            loaded = Maze(1, 1)
+            loaded.solution_cache = self.cache
+            loaded.load_maze_from_file(file_path)
+            self.assertEqual(loaded.solve_maze(), path)
+        self.assertEqual(self.cache.stats()['hits'], 1)
+        self.assertEqual(self.cache.stats()['misses'], 1)
+        self.assertEqual(loaded.solve_stats.nodes_expanded, 0)
+
+    def test_eviction_and_invalidation(self):
+        """
+        Проверка вытеснения старых решений и сброса хэша при изменении клетки.
+        """
+        self.maze.solve_maze((0, 0), (5, 5))
+        self.maze.solve_maze((0, 0), (4, 4))
+        self.maze.solve_maze((0, 0), (3, 3))
+        self.assertEqual(self.cache.stats()['evictions'], 1)
+        digest = self.maze.grid.digest()
+        self.maze.list_maze[0][0] = '0'
+        self.maze.list_maze[1][2] = '0' if self.maze.list_maze[1][2] == '1' else '1'
+        self.assertNotEqual(self.maze.grid.digest(), digest)
+
+    def test_size_limits(self):
+        """
+        Проверка ограничения кэша по суммарной длине путей и пропуска длинных путей.
+        """
+        cache = SolutionCache(maxsize=10, max_cells=10, max_path_cells=6)
+        cache.put('a', [(1, 1)] * 4)
+        cache.put('b', [(1, 2)] * 5)
+        cache.put('long', [(1, 3)] * 7)
+        self.assertIsNone(cache.get('long'))
+        self.assertEqual(cache.stats()['skipped'], 1)
+        self.assertEqual((len(cache), cache.cells), (2, 9))
+        cache.put('c', [(2, 3), (3, 3)])
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(cache.get('c'), [(2, 3), (3, 3)])
+        self.assertEqual((cache.stats()['evictions'], cache.cells), (1, 7))
+
+    def test_rendering_does_not_modify_grid(self):
+        """
+        Проверка, что вывод и сохранение решения не изменяют сетку лабиринта.
+        """
+        before = self.maze.grid.copy()
+        path = self.maze.solve_maze()
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            self.maze.print_solution()
+        self.assertEqual(output.getvalue().count('.'), len(path))
+        with tempfile.TemporaryDirectory() as directory:
+            file_path = os.path.join(directory, 'solved.txt')
+            self.maze.save_maze_to_file(file_path, way=True)
+            with open(file_path) as file:
+                lines = file.read().split()
+        self.assertEqual(self.maze.grid, before)
+        self.assertTrue(all(lines[y][x] == '.' for y, x in path))
+        self.maze.solution_cache = None
+        self.assertEqual(self.maze.solve_maze(), path)
+
+
+class TestGrid(unittest.TestCase):
+    def test_list_maze_view_matches_grid(self):
+        """
+        Проверка, что list_maze отображает содержимое компактной сетки.
+        """
+        maze = Maze(2, 2)
+        self.assertIsInstance(maze.grid, Grid)
+        self.assertEqual(maze.list_maze, [list('00000'), list('01010'), list('00000'),
+                                          list('01010'), list('00000')])
+
+    def test_list_maze_view_is_writable(self):
+        """
+        Проверка записи в клетку через list_maze.
+        """
+        maze = Maze(2, 2)
+        maze.list_maze[1][2] = '1'
+        self.assertEqual(maze.grid.row(1), b'01110')
+
+    def test_list_maze_setter_accepts_lists(self):
+        """
+        Проверка присваивания списка списков в list_maze.
+        """
+        maze = Maze(1, 1)
+        maze.list_maze = [list('000'), list('010'), list('000')]
+        self.assertEqual(maze.grid, Grid(3, 3, b'000010000'))
+
+
+class TestSolver(unittest.TestCase):
+    def setUp(self):
+        self.maze = Maze(15, 20)
+        self.maze.generate_maze()
+
+    def assert_valid_path(self, path):
+        for (r1, c1), (r2, c2) in zip(path, path[1:]):
+            self.assertEqual(abs(r1 - r2) + abs(c1 - c2), 1, "Соседние клетки пути должны соприкасаться.")
+            self.assertEqual(self.maze.list_maze[r2][c2], '1', "Путь не должен проходить через стены.")
+
+    def test_methods_find_same_length_path(self):
+        """
+        Проверка, что все методы находят путь одинаковой длины в идеальном лабиринте.
+        """
+        lengths = set()
+        for method in ('bfs', 'astar', 'bidirectional'):
+            path = self.maze.solve_maze(method=method)
+            self.assertEqual(path[0], (1, 1))
+            self.assertEqual(path[-1], (29, 39))
+            self.assert_valid_path(path)
+            lengths.add(len(path))
+        self.assertEqual(len(lengths), 1)
+
+    def test_reused_buffers(self):
+        """
+        Проверка, что переиспользование буферов поиска (и переполнение номера поколения)
+        не влияет на результат повторных поисков.
+        """
+        import solver
+        self.maze.solution_cache = None
+        expected = {method: self.maze.solve_maze((0, 0), (14, 19), method) for method in solver.SOLVERS}
+        workspace = solver._workspace(len(self.maze.grid.data))
+        workspace.generation = 0xFFFFFFFF - 1
+        for method, path in expected.items():
+            self.assertEqual(self.maze.solve_maze((3, 4), (3, 4), method), [(7, 9)])
+            self.assertEqual(self.maze.solve_maze((0, 0), (14, 19), method), path)
+        self.assertLess(workspace.generation, 10)
+
+    def test_large_buffers_are_released(self):
+        """
+        Проверка, что буферы поиска в сетке больше WORKSPACE_CACHE_CELLS не остаются в памяти.
+        """
+        import solver
+        self.maze.solution_cache = None
+        solver._local.__dict__.pop('workspace', None)
+        with mock.patch('solver.WORKSPACE_CACHE_CELLS', len(self.maze.grid.data) - 1):
+            path = self.maze.solve_maze((0, 0), (14, 19))
+        self.assertIsNone(getattr(solver._local, 'workspace', None))
+        self.assertEqual(self.maze.solve_maze((0, 0), (14, 19)), path)
+        self.assertEqual(solver._local.workspace.size, len(self.maze.grid.data))
+
+    def test_solve_stats(self):
+        """
+        Проверка статистики решения.
+        """
+        path = self.maze.solve_maze(method='astar')
+        self.assertEqual(self.maze.solve_stats.path, path)
+        self.assertGreaterEqual(self.maze.solve_stats.nodes_expanded, len(path))
+        self.assertGreaterEqual(self.maze.solve_stats.elapsed, 0)
+
+    def test_no_path(self):
+        """
+        Проверка, что при отсутствии пути возвращается пустой список.
+        """
+        maze = Maze(1, 2)
+        for method in ('bfs', 'astar', 'bidirectional'):
+            self.assertEqual(maze.solve_maze(method=method), [])
+            self.assertEqual(maze.list_way, [])
+
+    def test_unknown_method(self):
+        with self.assertRaises(ValueError):
+            self.maze.solve_maze(method='dfs')
+
+
+class TestBenchmarkSuite(unittest.TestCase):
+    def test_suite_records(self):
+        """
+        Проверка, что набор замеров возвращает запись на каждую операцию и размер.
+        """
+        operations = tuple(operation for operation in bench.SUITE_OPERATIONS if PIL or 'image' not in operation)
+        report = bench.run_suite(sizes=(3, 5), operations=operations, repeat=1)
+        self.assertEqual(len(report['results']), 2 * len(operations))
+        for record in report['results']:
+            self.assertIn(record['operation'], operations)
+            self.assertGreaterEqual(record['time_s'], 0)
+            self.assertGreater(record['peak_bytes'], 0)
+            self.assertIn('net_blocks', record)
+
+    def test_compare_results(self):
+        """
+        Проверка поиска регрессий относительно базовой линии.
+        """
+        baseline = {'results': [{'operation': 'solve', 'size': 100, 'time_s': 0.1, 'peak_bytes': 1000},
+                                {'operation': 'generate', 'size': 100, 'time_s': 0.001, 'peak_bytes': 1000}]}
+        current = {'results': [{'operation': 'solve', 'size': 100, 'time_s': 0.3, 'peak_bytes': 1100},
+                               {'operation': 'generate', 'size': 100, 'time_s': 0.01, 'peak_bytes': 1000},
+                               {'operation': 'solve', 'size': 10, 'time_s': 1.0, 'peak_bytes': 1000}]}
+        regressions = bench.compare_results(current, baseline, threshold=1.5)
+        self.assertEqual([(r['operation'], r['size'], r['metric']) for r in regressions],
+                         [('solve', 100, 'time_s')])
+        self.assertAlmostEqual(regressions[0]['ratio'], 3.0)
+        self.assertEqual(bench.compare_results(current, baseline, threshold=5), [])
+
+    def test_unknown_operation(self):
+        with self.assertRaises(ValueError):
+            bench.run_suite(sizes=(3,), operations=('fly',))
+
+    def test_baseline_requires_suite(self):
+        """
+        Проверка, что базовая линия с отдельным замером отклоняется парсером, а не падает с KeyError.
+        """
+        argv = ['bench.py', 'solvers', '--baseline', 'baseline.json']
+        with mock.patch.object(sys, 'argv', argv), contextlib.redirect_stderr(io.StringIO()):
+            with self.assertRaises(SystemExit):
+                bench.main()
+
+
+class TestInstrumentation(unittest.TestCase):
+    def test_profiler_records_operations(self):
+        """
+        Проверка времени, счетчиков и callback профилировщика.
+        """
+        events = []
+        with instrument.Profiler(callback=events.append, memory=True) as profiler:
+            maze = Maze(10, 12)
+            maze.generate_maze(seed=1)
+            maze.solution_cache = None
+            path = maze.solve_maze()
+            with tempfile.TemporaryDirectory() as directory:
+                file_path = os.path.join(directory, 'maze.txt')
+                maze.save_maze_to_file(file_path)
+                Maze(1, 1).load_maze_from_file(file_path)
+                size = os.path.getsize(file_path)
+        report = profiler.report()
+        self.assertEqual(report['generate_maze']['counters'], {'cells_carved': 10 * 12 - 1})
+        self.assertGreaterEqual(report['solve_maze']['counters']['nodes_expanded'], len(path))
+        self.assertEqual(report['save_maze_to_file']['counters'], {'bytes_written': size})
+        self.assertEqual(report['load_maze_from_file']['counters'], {'bytes_read': size})
+        # Вложенная проверка лабиринта учитывается отдельной операцией
+        self.assertEqual(report['maze_check']['calls'], 1)
+        self.assertGreater(report['load_maze_from_file']['peak_bytes'], 0)
+        self.assertEqual([event['operation'] for event in events],
+                         ['generate_maze', 'solve_maze', 'save_maze_to_file', 'maze_check', 'load_maze_from_file'])
+
+    def test_streaming_export_is_profiled(self):
+        """
+        Проверка, что потоковый экспорт из командной строки попадает в отчет --profile.
+        """
+        import main
+        with tempfile.TemporaryDirectory() as directory:
+            file_path = os.path.join(directory, 'maze.txt')
+            output = io.StringIO()
+            argv = ['main.py', '-gm', '3', '4', '-em', file_path, '--profile']
+            with mock.patch.object(sys, 'argv', argv), contextlib.redirect_stdout(output):
+                main.main()
+            size = os.path.getsize(file_path)
+        row = next(line for line in output.getvalue().splitlines() if line.startswith('stream_maze_to_file'))
+        self.assertIn(f'cells_written={7 * 9}, bytes_written={size}', row)
+
+    def test_disabled_profiler_restores_functions(self):
+        """
+        Проверка, что после остановки профилировщика функции снова исходные.
+        """
+        original = Maze.generate_maze
+        with instrument.Profiler():
+            self.assertIsNot(Maze.generate_maze, original)
+            with self.assertRaises(RuntimeError):
+                instrument.Profiler().start()
+        self.assertIs(Maze.generate_maze, original)
+        self.assertIs(maze_module.maze_check, maze_check)
+
+
+class TestServer(unittest.TestCase):
+    def run_with_server(self, scenario, data_dir=None):
+        """Запускает сервис на свободном порту и выполняет сценарий с клиентом."""
+        async def run():
+            service = server.MazeService(workers=1, data_dir=data_dir)
+            try:
+                instance = await server.start(service, port=0)
+                async with instance:
+                    port = instance.sockets[0].getsockname()[1]
+                    client = await server.Client.connect(port=port)
+                    try:
+                        return await scenario(client, port)
+                    finally:
+                        await client.close()
+            finally:
+                service.close()
+        return asyncio.run(run())
+
+    def test_generate_and_solve(self):
+        """
+        Проверка, что сервис решает лабиринт так же, как Maze.solve_maze.
+        """
+        async def scenario(client, port):
+            status, maze = await client.request('/generate', {'height': 8, 'width': 9, 'seed': 3})
+            self.assertEqual(status, 200)
+            first = await client.request('/solve', {'id': maze['id'], 'start': [0, 0], 'end': [7, 8]})
+            second = await client.request('/solve', {'id': maze['id'], 'start': [0, 0], 'end': [7, 8]})
+            missing = await client.request('/solve', {'id': 999})
+            return first, second, missing
+
+        first, second, missing = self.run_with_server(scenario)
+        expected = Maze(8, 9)
+        expected.generate_maze(seed=3)
+        expected.solution_cache = None
+        self.assertEqual(first[0], 200)
+        self.assertEqual([tuple(cell) for cell in first[1]['path']], expected.solve_maze((0, 0), (7, 8)))
+        self.assertTrue(second[1]['cached'])
+        self.assertEqual(missing[0], 404)
+
+    def test_batch(self):
+        """
+        Проверка пакета запросов: ответы по порядку, ошибки не прерывают пакет.
+        """
+        async def scenario(client, port):
+            _, maze = await client.request('/generate', {'height': 5, 'width': 5, 'seed': 1})
+            return await client.request('/batch', {'requests': [
+                {'op': 'solve', 'id': maze['id'], 'method': 'astar'},
+                {'op': 'solve', 'id': maze['id'], 'end': [9, 9]},
+                {'op': 'drop', 'id': 12345},
+                {'op': 'solve', 'id': maze['id'], 'start': [4, 4], 'end': [0, 0]},
+            ]})
+
+        status, response = self.run_with_server(scenario)
+        self.assertEqual(status, 200)
+        results = response['results']
+        self.assertEqual(len(results), 4)
+        self.assertEqual(results[0]['path'][0], [1, 1])
+        self.assertIn('error', results[1])
+        self.assertIn('error', results[2])
+        self.assertEqual(results[3]['path'][-1], [1, 1])
+
+    def test_rejects_non_integer_values(self):
+        """
+        Проверка, что логические значения и строки не принимаются вместо чисел.
+        """
+        async def scenario(client, port):
+            _, maze = await client.request('/generate', {'height': 3, 'width': 3, 'seed': 1})
+            return [(await client.request(route, payload))[0] for route, payload in (
+                ('/solve', {'id': maze['id'], 'start': [True, False]}),
+                ('/generate', {'height': 3, 'width': 3, 'seed': '7'}),
+                ('/generate', {'height': True, 'width': 3}),
+            )]
+
+        self.assertEqual(self.run_with_server(scenario), [400, 400, 400])
+
+    def test_size_limits(self):
+        """
+        Проверка, что слишком большие лабиринт и изображение отклоняются до выделения памяти.
+        """
+        async def scenario(client, port):
+            _, maze = await client.request('/generate', {'height': 3, 'width': 3, 'seed': 1})
+            return [(await client.request(route, payload))[0] for route, payload in (
+                ('/generate', {'height': 100000, 'width': 100000}),
+                ('/export', {'id': maze['id'], 'path': 'maze.png', 'cell_size': 10 ** 6}),
+            )]
+
+        with tempfile.TemporaryDirectory() as directory:
+            self.assertEqual(self.run_with_server(scenario, directory), [400, 400])
+            self.assertEqual(os.listdir(directory), [])
+
+    def test_broken_pool_is_replaced(self):
+        """
+        Проверка, что после аварийного завершения процесса пула сервис создает новый пул.
+        """
+        async def run():
+            service = server.MazeService(workers=1)
+            try:
+                await asyncio.wrap_future(service.processes.submit(os._exit, 1))
+            except server.BrokenProcessPool:
+                pass
+            try:
+                broken = await service.dispatch('POST', '/generate', b'{"height": 3, "width": 3}')
+                restored = await service.dispatch('POST', '/generate', b'{"height": 3, "width": 3}')
+                return broken[0], restored[0]
+            finally:
+                service.close()
+
+        self.assertEqual(asyncio.run(run()), (500, 200))
+
+    def test_images_without_pillow(self):
+        """
+        Проверка, что без Pillow работа с изображениями возвращает 501, а не внутреннюю ошибку.
+        """
+        async def scenario(client, port):
+            _, maze = await client.request('/generate', {'height': 3, 'width': 3, 'seed': 1})
+            with mock.patch.dict(sys.modules, {'maze_image': None}):
+                return [(await client.request(route, payload))[0] for route, payload in (
+                    ('/export', {'id': maze['id'], 'path': 'maze.png'}),
+                    ('/load', {'path': 'maze.png'}),
+                )]
+
+        with tempfile.TemporaryDirectory() as directory:
+            self.assertEqual(self.run_with_server(scenario, directory), [501, 501])
+
+    def test_worker_grid_cache(self):
+        """
+        Проверка, что процесс пула получает сетку один раз, а дальше решает по digest.
+        """
+        maze = Maze(4, 5)
+        maze.generate_maze(seed=2)
+        grid, digest = maze.grid, maze.grid.digest()
+        queries = [((1, 1), (7, 9), 'bfs')]
+        server._init_worker()
+        self.assertIsNone(server._solve_queries(digest, queries))
+        first = server._solve_queries(digest, queries, grid.rows, grid.cols, bytes(grid.data))
+        self.assertEqual(server._solve_queries(digest, queries), first)
+        self.assertEqual(first[0][0], maze.solve_maze((0, 0), (3, 4)))
+        server._init_worker()
+
+    def test_file_access(self):
+        """
+        Проверка, что файлы читаются и пишутся только в каталоге данных, а содержимое
+        некорректного файла не попадает в ответ.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            data_dir = os.path.join(directory, 'data')
+            os.mkdir(data_dir)
+            with open(os.path.join(data_dir, 'secret.txt'), 'w') as file:
+                file.write('db_password=hunter2\n')
+            outside = os.path.join(directory, 'outside.txt')
+
+            async def scenario(client, port):
+                _, maze = await client.request('/generate', {'height': 3, 'width': 4, 'seed': 1})
+                exported = await client.request('/export', {'id': maze['id'], 'path': 'maze.txt'})
+                loaded = await client.request('/load', {'path': 'maze.txt'})
+                escaped = await client.request('/export', {'id': maze['id'], 'path': '../outside.txt'})
+                absolute = await client.request('/load', {'path': outside})
+                secret = await client.request('/load', {'path': 'secret.txt'})
+                return exported, loaded, escaped, absolute, secret
+
+            exported, loaded, escaped, absolute, secret = self.run_with_server(scenario, data_dir)
+            self.assertEqual(exported[0], 200)
+            self.assertEqual(exported[1]['path'], 'maze.txt')
+            self.assertEqual(loaded[1]['height'], 3)
+            self.assertEqual((escaped[0], absolute[0], secret[0]), (400, 400, 400))
+            self.assertFalse(os.path.exists(outside))
+            self.assertNotIn('hunter2', secret[1]['error'])
+
+    def test_requires_json_content_type(self):
+        """
+        Проверка, что POST без Content-Type: application/json отклоняется.
+        """
+        async def run():
+            service = server.MazeService(workers=1)
+            try:
+                body = b'{"height": 2, "width": 2}'
+                return (await service.dispatch('POST', '/generate', body, 'text/plain'),
+                        await service.dispatch('POST', '/generate', body, 'application/json; charset=utf-8'))
+            finally:
+                service.close()
+
+        (rejected, _), (accepted, _) = asyncio.run(run())
+        self.assertEqual((rejected, accepted), (415, 200))
+
+    def test_load_test_report(self):
+        """
+        Проверка отчета нагрузочного теста.
+        """
+        report = self.run_with_server(
+            lambda client, port: server.load_test(port=port, requests=20, concurrency=4, size=(6, 6)))
+        self.assertEqual(report['requests'], 20)
+        self.assertEqual(report['errors'], 0)
+        self.assertLessEqual(report['p50_ms'], report['p99_ms'])
+        self.assertGreater(report['throughput_rps'], 0)
+
+
+class TestStartup(unittest.TestCase):
+    def test_text_cli_does_not_import_heavy_modules(self):
+        """
+        Проверка, что импорт CLI не загружает Pillow, пул процессов и профилировщик.
+        """
+        times = bench.import_times('main')
+        self.assertIn('main', times)
+        for name in ('PIL', 'multiprocessing', 'concurrent.futures', 'cProfile'):
+            self.assertNotIn(name, times)
+
+    def test_cli_without_pillow(self):
+        """
+        Проверка, что текстовые форматы работают без Pillow, а для изображений выводится ошибка.
+        """
+        root = os.path.dirname(os.path.abspath(__file__))
+        # Запись None в sys.modules делает импорт PIL невозможным, как на машине без Pillow
+        runner = ("import runpy, sys; sys.modules['PIL'] = None; sys.argv = ['main.py'] + sys.argv[1:]; "
+                  "runpy.run_path('main.py', run_name='__main__')")
+        with tempfile.TemporaryDirectory() as directory:
+            text_path = os.path.join(directory, 'maze.txt')
+            image_path = os.path.join(directory, 'maze.png')
+            subprocess.run([sys.executable, '-c', runner, '-gm', '4', '4', '-em', text_path],
+                           cwd=root, check=True, capture_output=True)
+            self.assertTrue(os.path.exists(text_path))
+            result = subprocess.run([sys.executable, '-c', runner, '-im', text_path, '-em', image_path],
+                                    cwd=root, check=True, capture_output=True, text=True)
+            self.assertIn('Pillow', result.stdout)
+            self.assertFalse(os.path.exists(image_path))
+
+
+class TestRender(unittest.TestCase):
+    def setUp(self):
+        self.maze = Maze(6, 7)
+        self.maze.generate_maze(seed=5)
+        self.maze.solution_cache = None
+        self.path = self.maze.solve_maze()
+
+    def test_text_frame(self):
+        """
+        Проверка, что текстовый кадр совпадает с построчным выводом.
+        """
+        expected = ''.join(' '.join(row.decode()).replace('0', '#').replace('1', ' ') + '\n'
+                           for row in self.maze.solution_grid().iter_rows())
+        original = self.maze.grid.copy()
+        self.assertEqual(render.render_text(self.maze.grid, self.path), expected)
+        self.assertEqual(self.maze.grid, original)
+
+    def test_half_frame(self):
+        """
+        Проверка полублочного кадра: две строки сетки на строку терминала.
+        """
+        frame = render.render_half(self.maze.grid)
+        lines = frame.splitlines()
+        self.assertEqual(len(lines), (self.maze.grid.rows + 1) // 2)
+        self.assertTrue(all(len(line) == self.maze.grid.cols for line in lines))
+        # Левый и правый столбцы - стены, под последней строкой нечетной сетки пустота
+        self.assertTrue(all(line[0] == line[-1] == '█' for line in lines[:-1]))
+        self.assertEqual(set(lines[-1]), {'▀'})
+        # Путь выделяется цветом, остальной кадр не меняется
+        solved = render.render_half(self.maze.grid, self.path)
+        self.assertIn('\x1b[31m', solved)
+        self.assertEqual(solved.count('\n'), frame.count('\n'))
+
+    def test_single_write(self):
+        """
+        Проверка, что кадр выводится одним вызовом write.
+        """
+        stream = mock.Mock()
+        with mock.patch('sys.stdout', stream):
+            self.maze.print_solution()
+        stream.write.assert_called_once()
+        with self.assertRaises(ValueError):
+            self.maze.print_maze(mode='html')
+
+
+class TestTiles(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self.directory.name, 'maze.mzt')
+        self.maze = Maze(17, 23)
+        self.maze.generate_maze(seed=6, algorithm='backtracker')
+        self.maze.solution_cache = None
+        tiles.write_tiled(self.file_path, self.maze.grid.iter_rows(), tile_size=8)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_round_trip(self):
+        """
+        Проверка, что тайловый файл хранит ту же сетку, а кэш ограничен.
+        """
+        # Кэш вмещает одну строку тайлов (47 столбцов / 8 = 6 тайлов)
+        with tiles.TiledMaze(self.file_path, cache_tiles=6) as store:
+            self.assertEqual(store.to_grid(), self.maze.grid)
+            self.assertEqual(store.get(1, 1), self.maze.grid.get(1, 1))
+            stats = store.stats()
+            self.assertEqual(stats['resident'], 6)
+            self.assertEqual(stats['misses'], store.tiles_down * store.tiles_across + 1)
+            self.assertGreater(stats['hit_rate'], 0.5)
+
+    def test_solve_and_render(self):
+        """
+        Проверка решения и вывода через тайлы в сравнении с лабиринтом в памяти.
+        """
+        path = self.maze.solve_maze((0, 0), (16, 22))
+        with tiles.TiledMaze(self.file_path, cache_tiles=4) as store:
+            result = tiles.solve_tiled(store, (1, 1), (33, 45))
+            self.assertEqual(result.path, path)
+            for mode in render.MODES:
+                stream = io.StringIO()
+                tiles.write_tiled_frame(store, path, mode, stream)
+                expected = render.render_text if mode == 'text' else render.render_half
+                self.assertEqual(stream.getvalue(), expected(self.maze.grid, path))
+            with self.assertRaises(ValueError):
+                tiles.solve_tiled(store, (0, 0), (33, 45))
+
+    @unittest.skipUnless(PIL, "Нужен пакет Pillow.")
+    def test_png_export(self):
+        """
+        Проверка, что PNG по тайлам совпадает с экспортом через Pillow.
+        """
+        from PIL import Image
+        path = self.maze.solve_maze()
+        tiled_png = os.path.join(self.directory.name, 'tiled.png')
+        pillow_png = os.path.join(self.directory.name, 'pillow.png')
+        with tiles.TiledMaze(self.file_path) as store:
+            tiles.save_tiled_png(store, tiled_png, path, cell_size=3)
+        self.maze.save_maze_as_image(pillow_png, 3)
+        with Image.open(tiled_png) as tiled, Image.open(pillow_png) as pillow:
+            self.assertEqual(tiled.convert('RGB').tobytes(), pillow.convert('RGB').tobytes())
+
+    def test_invalid_file(self):
+        """
+        Проверка ошибок для поврежденного тайлового файла.
+        """
+        with open(self.file_path, 'r+b') as file:
+            file.write(b'XXXX')
+        with self.assertRaises(ValueError):
+            tiles.TiledMaze(self.file_path)
+        with self.assertRaises(ValueError):
+            tiles.write_tiled(self.file_path, [b'010', b'01'])
+
+
+class TestParallelGeneration(unittest.TestCase):
+    def test_identical_for_any_worker_count(self):
+        """
+        Проверка, что параллельная генерация не зависит от количества процессов.
+        """
+        for algorithm in ('binary_tree', 'sidewinder'):
+            grids = [parallel.generate_parallel(21, 17, algorithm, seed=4, workers=workers, strip_rows=5)
+                     for workers in (1, 2, 3)]
+            self.assertEqual(grids[0], grids[1], algorithm)
+            self.assertEqual(grids[0], grids[2], algorithm)
+            self.assertTrue(maze_check(grids[0], check_connectivity=True))
+            self.assertNotEqual(grids[0], parallel.generate_parallel(21, 17, algorithm, seed=5, workers=1,
+                                                                     strip_rows=5))
+
+    def test_generate_maze_workers(self):
+        """
+        Проверка параллельного режима Maze.generate_maze.
+        """
+        maze = Maze(12, 9)
+        maze.generate_maze(seed=1, algorithm='sidewinder', workers=2)
+        self.assertEqual(maze.grid, parallel.generate_parallel(12, 9, 'sidewinder', seed=1, workers=1))
+        self.assertEqual(len(maze.solve_maze()), len(maze.solve_maze(method='astar')))
+        with self.assertRaises(ValueError):
+            maze.generate_maze(seed=1, algorithm='backtracker', workers=2)
+
 
 if __name__ == "__main__":
     unittest.main()
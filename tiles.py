@@ -0,0 +1,389 @@
+"""
+Тайловое хранилище больших лабиринтов (.mzt).
+
+Сетка делится на квадратные тайлы tile_size x tile_size клеток, каждый тайл сжимается
+отдельно и хранится отдельным блоком одного файла. При чтении в памяти держится
+ограниченное число тайлов (LRU), поэтому поиск пути, вывод и экспорт в PNG работают
+с лабиринтами, которые целиком в память не помещаются.
+
+Формат файла (little-endian):
+
+    magic         4 байта  b'MZT1'
+    version       u8       версия формата (1)
+    codec         u8       сжатие тайлов: 0 - нет, 1 - zlib
+    reserved      2 байта
+    rows          u64      строк сетки
+    cols          u64      столбцов сетки
+    tile_size     u32      сторона тайла в клетках
+    index_offset  u64      смещение таблицы тайлов
+    тайлы         построчно ('0'/'1', по одному байту на клетку), тайлы по строкам тайлов
+    таблица       (offset u64, length u32) для каждого тайла в том же порядке
+
+Крайние тайлы справа и снизу хранятся без дополнения, по фактическому размеру.
+"""
+import mmap
+import struct
+import sys
+import tempfile
+import time
+import zlib
+from array import array
+from collections import OrderedDict, defaultdict
+from typing import Dict, Iterable, Iterator, List, TextIO, Tuple
+
+from grid import Grid, PASSAGE, WALL
+from render import MODES, render_half, render_text
+from solver import SolveResult
+
+MAGIC = b'MZT1'
+VERSION = 1
+CODECS = {'none': 0, 'zlib': 1}
+
+_HEADER = struct.Struct('<4sBBxxQQIQ')
+_ENTRY = struct.Struct('<QI')
+# Палитра PNG совпадает с палитрой maze_image: стена - черный, проход - белый, путь - розовый
+_PNG_PALETTE = bytes([0, 0, 0, 255, 255, 255, 255, 100, 200])
+_PNG_INDEX = bytes(0 if code == WALL else 1 for code in range(256))
+_PNG_CHUNK_BYTES = 1 << 20
+# Направления поиска: (сдвиг строки, сдвиг столбца); код хода - номер направления + 1
+_MOVES = ((-1, 0), (1, 0), (0, -1), (0, 1))
+_START = 5
+
+
+def write_tiled(file_path: str, rows: Iterable[bytes], tile_size: int = 256, compression: str = 'zlib') -> int:
+    """
+    Записывает строки сетки в тайловый файл за один проход.
+
+    В памяти одновременно находится только одна полоса из tile_size строк,
+    поэтому строки можно брать из потоковой генерации или построчного чтения файла.
+
+    Args:
+        file_path (str): Путь к файлу .mzt.
+        rows (Iterable[bytes]): Строки сетки из '0' и '1' одинаковой длины.
+        tile_size (int): Сторона тайла в клетках.
+        compression (str): 'zlib' или 'none'.
+
+    Returns:
+        int: Размер файла в байтах.
+
+    Raises:
+        ValueError: Если строки разной длины или содержат символы, отличные от '0' и '1'.
+    """
+    if compression not in CODECS:
+        raise ValueError(f"Неизвестный метод сжатия: {compression}. Доступны: {', '.join(CODECS)}.")
+    if tile_size < 1:
+        raise ValueError("Размер тайла должен быть положительным.")
+    entries = array('Q')
+    lengths = array('I')
+    count, cols = 0, None
+    with open(file_path, 'wb') as file:
+        file.write(bytes(_HEADER.size))
+        band = []
+
+        def flush() -> None:
+            for first in range(0, cols, tile_size):
+                block = b''.join(row[first:first + tile_size] for row in band)
+                if block.count(b'0') + block.count(b'1') != len(block):
+                    raise ValueError("Строки лабиринта содержат символы, отличные от '0' и '1'.")
+                if compression == 'zlib':
+                    block = zlib.compress(block, 1)
+                entries.append(file.tell())
+                lengths.append(len(block))
+                file.write(block)
+            band.clear()
+
+        for row in rows:
+            if cols is None:
+                cols = len(row)
+            elif len(row) != cols:
+                raise ValueError("Строки в лабиринте имеют разное количество символов.")
+            band.append(row)
+            count += 1
+            if len(band) == tile_size:
+                flush()
+        if band:
+            flush()
+
+        index_offset = file.tell()
+        for offset, length in zip(entries, lengths):
+            file.write(_ENTRY.pack(offset, length))
+        file.seek(0)
+        file.write(_HEADER.pack(MAGIC, VERSION, CODECS[compression], count, cols or 0, tile_size, index_offset))
+        return index_offset + _ENTRY.size * len(entries)
+
+
+def text_rows(file_path: str) -> Iterator[bytes]:
+    """Построчно читает текстовый файл лабиринта, пропуская пустые строки и окончания строк."""
+    with open(file_path, 'rb') as file:
+        for line in file:
+            line = line.strip()
+            if line:
+                yield line
+
+
+class TiledMaze:
+    """
+    Чтение тайлового файла с ограниченным LRU-кэшем распакованных тайлов.
+
+    rows, cols: размеры сетки
+    tile_size: сторона тайла
+    hits, misses: попадания и промахи кэша тайлов
+    """
+
+    def __init__(self, file_path: str, cache_tiles: int = 64) -> None:
+        """
+        :param file_path: путь к файлу .mzt
+        :param cache_tiles: сколько распакованных тайлов держать в памяти
+            (для построчного чтения нужно не меньше числа тайлов в строке тайлов)
+        :raises ValueError: если файл не является корректным файлом .mzt
+        """
+        self.cache_tiles = max(1, cache_tiles)
+        self.hits = 0
+        self.misses = 0
+        self._tiles: 'OrderedDict[Tuple[int, int], bytes]' = OrderedDict()
+        self._file = open(file_path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError("Неверный формат тайлового файла: файл пуст.") from None
+        try:
+            self._read_header()
+        except (ValueError, struct.error) as e:
+            self.close()
+            message = str(e) if isinstance(e, ValueError) else "Неверный формат тайлового файла: файл обрезан."
+            raise ValueError(message) from None
+
+    def _read_header(self) -> None:
+        """Читает заголовок и таблицу тайлов."""
+        magic, version, codec, rows, cols, tile_size, index_offset = _HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise ValueError("Неверный формат тайлового файла: это не файл .mzt.")
+        if version != VERSION:
+            raise ValueError(f"Неподдерживаемая версия тайлового файла: {version}.")
+        if codec not in CODECS.values():
+            raise ValueError(f"Неизвестный метод сжатия в тайловом файле: {codec}.")
+        if not tile_size:
+            raise ValueError("Неверный формат тайлового файла: нулевой размер тайла.")
+        self.rows, self.cols, self.tile_size, self.codec = rows, cols, tile_size, codec
+        self.tiles_down = -(-rows // tile_size)
+        self.tiles_across = -(-cols // tile_size)
+        count = self.tiles_down * self.tiles_across
+        self._offsets = array('Q')
+        self._lengths = array('I')
+        for offset, length in _ENTRY.iter_unpack(self._map[index_offset:index_offset + _ENTRY.size * count]):
+            self._offsets.append(offset)
+            self._lengths.append(length)
+        if len(self._offsets) != count:
+            raise ValueError("Неверный формат тайлового файла: файл обрезан.")
+
+    def close(self) -> None:
+        """Закрывает файл и освобождает кэш."""
+        self._tiles.clear()
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self) -> 'TiledMaze':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def tile_width(self, tile_col: int) -> int:
+        """Ширина тайла в столбце тайлов tile_col (крайний справа может быть уже)."""
+        return min(self.tile_size, self.cols - tile_col * self.tile_size)
+
+    def tile(self, tile_row: int, tile_col: int) -> bytes:
+        """Распакованный тайл (строки тайла подряд) через LRU-кэш."""
+        key = (tile_row, tile_col)
+        tile = self._tiles.get(key)
+        if tile is not None:
+            self.hits += 1
+            self._tiles.move_to_end(key)
+            return tile
+        self.misses += 1
+        number = tile_row * self.tiles_across + tile_col
+        offset = self._offsets[number]
+        tile = self._map[offset:offset + self._lengths[number]]
+        if self.codec == CODECS['zlib']:
+            tile = zlib.decompress(tile)
+        self._tiles[key] = tile
+        if len(self._tiles) > self.cache_tiles:
+            self._tiles.popitem(last=False)
+        return tile
+
+    def get(self, row: int, col: int) -> int:
+        """Код клетки (строка, столбец), как Grid.get."""
+        tile_row, inner_row = divmod(row, self.tile_size)
+        tile_col, inner_col = divmod(col, self.tile_size)
+        return self.tile(tile_row, tile_col)[inner_row * self.tile_width(tile_col) + inner_col]
+
+    def row(self, row: int) -> bytes:
+        """Строка сетки, собранная из тайлов одной строки тайлов."""
+        tile_row, inner_row = divmod(row, self.tile_size)
+        parts = []
+        for tile_col in range(self.tiles_across):
+            width = self.tile_width(tile_col)
+            parts.append(self.tile(tile_row, tile_col)[inner_row * width:(inner_row + 1) * width])
+        return b''.join(parts)
+
+    def iter_rows(self, start: int = 0, stop: int = None) -> Iterator[bytes]:
+        """Строки сетки с start по stop (не включая)."""
+        for row in range(start, self.rows if stop is None else min(stop, self.rows)):
+            yield self.row(row)
+
+    def to_grid(self) -> Grid:
+        """Вся сетка в памяти (для лабиринтов, которые в нее помещаются)."""
+        return Grid(self.rows, self.cols, b''.join(self.iter_rows()))
+
+    def stats(self) -> Dict[str, float]:
+        """Попадания, промахи и доля попаданий кэша тайлов."""
+        total = self.hits + self.misses
+        return {'hits': self.hits, 'misses': self.misses, 'hit_rate': self.hits / total if total else 0.0,
+                'resident': len(self._tiles), 'capacity': self.cache_tiles}
+
+
+def solve_tiled(store: TiledMaze, start: Tuple[int, int], end: Tuple[int, int]) -> SolveResult:
+    """
+    Поиск в ширину по тайловому лабиринту.
+
+    Клетки читаются через кэш тайлов, а направление хода в каждую посещенную клетку
+    (1 байт на клетку) хранится в отображенном в память временном файле, поэтому
+    память процесса ограничена кэшем тайлов и очередью поиска.
+
+    Args:
+        store (TiledMaze): Тайловый лабиринт.
+        start (Tuple[int, int]): Начальная клетка в координатах сетки.
+        end (Tuple[int, int]): Конечная клетка в координатах сетки.
+
+    Returns:
+        SolveResult: Путь в координатах сетки, количество раскрытых клеток и время.
+
+    Raises:
+        ValueError: Если начальная или конечная клетка вне сетки или в стене.
+    """
+    started = time.perf_counter()
+    rows, cols = store.rows, store.cols
+    for row, col in (start, end):
+        if not (0 <= row < rows and 0 <= col < cols):
+            raise ValueError("Недопустимая стартовая или конечная позиция.")
+        if store.get(row, col) != PASSAGE:
+            raise ValueError("Стартовая или конечная позиция находится в стене.")
+
+    expanded = 0
+    path = []
+    with tempfile.TemporaryFile() as scratch:
+        scratch.truncate(rows * cols)
+        with mmap.mmap(scratch.fileno(), rows * cols) as moves:
+            moves[start[0] * cols + start[1]] = _START
+            frontier = [start]
+            found = False
+            while frontier and not found:
+                layer = []
+                for row, col in frontier:
+                    expanded += 1
+                    if (row, col) == end:
+                        found = True
+                        break
+                    for code, (d_row, d_col) in enumerate(_MOVES, 1):
+                        n_row, n_col = row + d_row, col + d_col
+                        if not (0 <= n_row < rows and 0 <= n_col < cols):
+                            continue
+                        index = n_row * cols + n_col
+                        if moves[index] or store.get(n_row, n_col) != PASSAGE:
+                            continue
+                        moves[index] = code
+                        layer.append((n_row, n_col))
+                frontier = layer
+
+            if found:
+                row, col = end
+                while True:
+                    path.append((row, col))
+                    code = moves[row * cols + col]
+                    if code == _START:
+                        break
+                    d_row, d_col = _MOVES[code - 1]
+                    row, col = row - d_row, col - d_col
+                path.reverse()
+    return SolveResult(path, expanded, time.perf_counter() - started)
+
+
+def _path_by_row(path: Iterable[Tuple[int, int]]) -> Dict[int, List[int]]:
+    """Клетки пути, сгруппированные по строкам."""
+    by_row = defaultdict(list)
+    for row, col in path:
+        by_row[row].append(col)
+    return by_row
+
+
+def write_tiled_frame(store: TiledMaze, path: Iterable[Tuple[int, int]] = (), mode: str = 'text',
+                      stream: TextIO = None) -> None:
+    """
+    Выводит тайловый лабиринт полосами строк (по одному write на полосу)
+    тем же способом, что и render.write_frame.
+
+    Raises:
+        ValueError: Если режим неизвестен.
+    """
+    if mode not in MODES:
+        raise ValueError(f"Неизвестный режим вывода: {mode}. Доступны: {', '.join(MODES)}.")
+    stream = stream or sys.stdout
+    render = render_text if mode == 'text' else render_half
+    by_row = _path_by_row(path)
+    # Полублочный режим объединяет пары строк, поэтому полоса четной высоты
+    band = store.tile_size + store.tile_size % 2
+    for first in range(0, store.rows, band):
+        data = b''.join(store.iter_rows(first, first + band))
+        grid = Grid(len(data) // store.cols, store.cols, data)
+        cells = [(row - first, col) for row in range(first, first + grid.rows) for col in by_row.get(row, ())]
+        stream.write(render(grid, cells))
+
+
+def _png_chunk(kind: bytes, data: bytes) -> bytes:
+    """Блок PNG: длина, тип, данные и CRC."""
+    return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data))
+
+
+def save_tiled_png(store: TiledMaze, output_path: str, path: Iterable[Tuple[int, int]] = (),
+                   cell_size: int = 1, compress_level: int = 6) -> int:
+    """
+    Экспортирует тайловый лабиринт в PNG с палитрой, читая тайлы полосами строк.
+
+    PNG записывается вручную потоковым сжатием zlib, поэтому в памяти находятся
+    только кэш тайлов и одна строка изображения.
+
+    Returns:
+        int: Размер файла в байтах.
+    """
+    width, height = store.cols * cell_size, store.rows * cell_size
+    by_row = _path_by_row(path)
+    compressor = zlib.compressobj(compress_level)
+    with open(output_path, 'wb') as file:
+        written = file.write(b'\x89PNG\r\n\x1a\n')
+        written += file.write(_png_chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 3, 0, 0, 0)))
+        written += file.write(_png_chunk(b'PLTE', _PNG_PALETTE))
+        pending = []
+        pending_size = 0
+        for row_number, row in enumerate(store.iter_rows()):
+            indices = bytearray(row.translate(_PNG_INDEX))
+            for col in by_row.get(row_number, ()):
+                if 0 <= col < len(row) and row[col] == PASSAGE:
+                    indices[col] = 2
+            if cell_size > 1:
+                scaled = bytearray(width)
+                for offset in range(cell_size):
+                    scaled[offset::cell_size] = indices
+                indices = scaled
+            # Байт фильтра 0 перед каждой строкой изображения
+            chunk = compressor.compress((b'\x00' + indices) * cell_size)
+            if chunk:
+                pending.append(chunk)
+                pending_size += len(chunk)
+            if pending_size >= _PNG_CHUNK_BYTES:
+                written += file.write(_png_chunk(b'IDAT', b''.join(pending)))
+                pending, pending_size = [], 0
+        pending.append(compressor.flush())
+        written += file.write(_png_chunk(b'IDAT', b''.join(pending)))
+        written += file.write(_png_chunk(b'IEND', b''))
+    return written